@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Columnar Benchmark
+Times library statistics, filters and reports with the NumPy columnar backend against the pure-Python one
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from typing import Callable, List
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from Lists_and_Tuples import MusicPlaylistManager
+from song_record import SongRecord
+
+FILE_TYPES = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
+
+def create_library(count: int, seed: int = 3) -> List[SongRecord]:
+    """Return count songs in path order, with a few prolific artists and a long tail of small ones."""
+    rng = random.Random(seed)
+    artists = [f"Artist {number:05d}" for number in range(max(10, count // 50))]
+    cumulative_weights = list(accumulate(1.0 / (rank + 1) for rank in range(len(artists))))
+    chosen = rng.choices(artists, cum_weights=cumulative_weights, k=count)
+    return [SongRecord(f"Song {number}", artist, rng.choice(FILE_TYPES),
+                       f"/music/{artist}/{number:07d} {artist} - Song {number}.mp3",
+                       rng.randint(2 * 1024 * 1024, 12 * 1024 * 1024), duration=rng.uniform(120, 420))
+            for number, artist in enumerate(chosen)]
+
+def load(songs: List[SongRecord], columnar: bool) -> MusicPlaylistManager:
+    """Create a manager on an empty directory and add the synthetic songs as a scan would."""
+    with tempfile.TemporaryDirectory() as directory:
+        manager = MusicPlaylistManager(directory, read_tags=False, columnar=columnar)
+    for song in songs:
+        manager._add_song(song, 0.0)
+    return manager
+
+def median_ms(operation: Callable[[], object], runs: int = 5) -> float:
+    """Median wall time of operation in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    """Print per-operation timings for both backends at each library size."""
+    counts = [int(argument) for argument in sys.argv[1:]] or [100_000, 1_000_000]
+    for count in counts:
+        songs = create_library(count)
+        probe = songs[len(songs) // 2]
+        print(f"\n📁 {count:,} synthetic songs, {count // 50:,} artists")
+
+        managers = {}
+        results = {}
+        for columnar in (False, True):
+            started = time.perf_counter()
+            manager = load(songs, columnar)
+            if columnar and not manager.columnar:
+                print("  NumPy is not installed; only the pure-Python backend can be timed.")
+                break
+            load_ms = (time.perf_counter() - started) * 1000
+            if columnar:
+                # The table is built on the first query; count that as part of loading
+                started = time.perf_counter()
+                manager.get_library_statistics()
+                load_ms += (time.perf_counter() - started) * 1000
+            managers[columnar] = manager
+
+            def statistics_after_change():
+                # One song leaving and coming back, as the live watcher would apply it
+                manager._add_song(probe, 0.0)
+                return manager.get_library_statistics()
+
+            results[columnar] = {
+                'Load (song upkeep)': load_ms,
+                'Statistics after a change': median_ms(statistics_after_change),
+                'Filter by artist': median_ms(lambda: manager.filter_songs_by_artist(probe['artist'])),
+                'Filter by file type': median_ms(lambda: manager.filter_songs_by_file_type('.flac')),
+                'Artist report (group-by)': median_ms(manager.generate_artist_report, runs=3),
+                'File type report (group-by)': median_ms(manager.generate_file_type_report, runs=3),
+            }
+
+        if len(managers) == 2:
+            python_manager, numpy_manager = managers[False], managers[True]
+            if (python_manager.get_library_statistics() != numpy_manager.get_library_statistics() or
+                    python_manager.filter_songs_by_file_type('.flac') !=
+                    numpy_manager.filter_songs_by_file_type('.flac')):
+                raise RuntimeError("Columnar backend disagrees with the pure-Python backend")
+
+        print(f"  {'Operation':<30} {'Python':>12} {'NumPy':>12} {'Speedup':>9}")
+        for operation, python_ms in results[False].items():
+            if True in results:
+                numpy_ms = results[True][operation]
+                print(f"  {operation:<30} {python_ms:>9.2f} ms {numpy_ms:>9.2f} ms "
+                      f"{python_ms / max(numpy_ms, 1e-6):>8.2f}x")
+            else:
+                print(f"  {operation:<30} {python_ms:>9.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+History Benchmark
+Sustains a steady play-event rate against the history log and reports caller latency, durability lag and load time
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from history_log import HistoryLog
+
+DEFAULT_RATE = 10_000
+DEFAULT_SECONDS = 5.0
+
+# Events are appended in small bursts; pacing every single event would mostly measure time.sleep
+BURST_SIZE = 100
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Value below which the given fraction of samples fall."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def main():
+    """Append events at a fixed rate (10k events/sec for 5 s by default) and time each stage."""
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RATE
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SECONDS
+    total = int(rate * seconds)
+    print(f"\n📜 {total:,} play events at {rate:,} events/sec")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Compaction is left to close() so the timings below separate the two stages
+        log = HistoryLog(directory, compact_interval=3600)
+        latencies_us = []
+        started = time.perf_counter()
+        for burst_start in range(0, total, BURST_SIZE):
+            # Stay on schedule: wait until this burst is due
+            due = started + burst_start / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            for number in range(burst_start, min(burst_start + BURST_SIZE, total)):
+                song = {'title': f"Song {number}", 'artist': f"Artist {number % 500}",
+                        'file_path': f"/music/Artist {number % 500}/Song {number}.mp3"}
+                append_started = time.perf_counter()
+                log.record_play(song)
+                latencies_us.append((time.perf_counter() - append_started) * 1_000_000)
+        appended = time.perf_counter() - started
+
+        flush_started = time.perf_counter()
+        log.flush()
+        # How far durability trailed the last append once the producer stopped
+        flush_lag_ms = (time.perf_counter() - flush_started) * 1000
+        achieved_rate = log.events_written / (time.perf_counter() - started)
+
+        compact_started = time.perf_counter()
+        log.close()
+        compact_ms = (time.perf_counter() - compact_started) * 1000
+
+        load_started = time.perf_counter()
+        events = HistoryLog.load(directory)
+        load_ms = (time.perf_counter() - load_started) * 1000
+        load_recent_started = time.perf_counter()
+        HistoryLog.load(directory, limit=1000)
+        load_recent_ms = (time.perf_counter() - load_recent_started) * 1000
+
+    if len(events) != total:
+        raise RuntimeError(f"Expected {total} events after reload, found {len(events)}")
+
+    print(f"  Appended in                {appended:>10.2f} s")
+    print(f"  append() median / p99      {statistics.median(latencies_us):>7.1f} µs / "
+          f"{percentile(latencies_us, 0.99):.1f} µs")
+    print(f"  Durable throughput         {achieved_rate:>10,.0f} events/sec")
+    print(f"  Final flush lag            {flush_lag_ms:>10.1f} ms")
+    print(f"  Compaction on close        {compact_ms:>10.1f} ms")
+    print(f"  Load all events            {load_ms:>10.1f} ms")
+    print(f"  Load newest 1000           {load_recent_ms:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,6 @@ Combines all music player features into one simple interface
 
 import os
 import sys
-import pygame
 
 # Add src directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -14,15 +13,34 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from src.Lists_and_Tuples import MusicPlaylistManager
 from src.linked_list_playlist import PlaylistManager
 from src.stacks_queues_music import MusicPlayerStacksQueues, SongQueue, PrioritySongQueue, ListeningHistoryStack
+from src.audio_backend import create_audio_backend
+from src.library_watcher import LibraryWatcher
+
+# On-disk library index so restarts only rescan directories that changed
+LIBRARY_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'library_index.db')
+
+# Append-only play history log kept across sessions
+HISTORY_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history')
+
+# Saved playlists (JSON, or the compact .plb format)
+PLAYLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'playlists')
+
+# Song rows shown per page in the library reports
+REPORT_PAGE_SIZE = 50
 
 class MainMusicPlayer:
     """Main music player that combines all features."""
     
-    def __init__(self):
+    def __init__(self, audio_backend=None, columnar=False):
         self.music_manager = None
         self.playlist_manager = None
         self.stacks_queues_player = None
+        self.library_watcher = None
         self.current_mode = "main"
+        # Audio backend name ('pygame' or 'null'); None uses $MUSIC_PLAYER_AUDIO or pygame
+        self.audio_backend = audio_backend
+        # Keep statistics, filters and reports on the NumPy columnar table (--columnar)
+        self.columnar = columnar
         
     def initialize_music_library(self):
         """Initialize the music library."""
@@ -35,7 +53,8 @@ class MainMusicPlayer:
             music_dir = r"D:\projects\Music_Stream\music"
         
         try:
-            self.music_manager = MusicPlaylistManager(music_dir)
+            self.music_manager = MusicPlaylistManager(music_dir, index_path=LIBRARY_INDEX_PATH,
+                                                      columnar=self.columnar)
             song_library = self.music_manager.get_song_library()
             
             if not song_library:
@@ -45,8 +64,13 @@ class MainMusicPlayer:
             print(f"✅ Found {len(song_library)} songs in library!")
             
             # Initialize other components
-            self.playlist_manager = PlaylistManager()
-            self.stacks_queues_player = MusicPlayerStacksQueues(self.music_manager)
+            self.playlist_manager = PlaylistManager(PLAYLIST_DIR, self.music_manager)
+            self.stacks_queues_player = MusicPlayerStacksQueues(self.music_manager, HISTORY_LOG_DIR,
+                                                                backend=create_audio_backend(self.audio_backend))
+            
+            # Pick up songs added to or removed from the music directory while the player runs
+            self.library_watcher = LibraryWatcher(self.music_manager)
+            self.library_watcher.start()
             
             return True
             
@@ -70,6 +94,7 @@ class MainMusicPlayer:
     def show_library_menu(self):
         """Display the music library management menu."""
         while True:
+            self.apply_library_changes()
             print("\n" + "=" * 50)
             print("📚 MUSIC LIBRARY MANAGEMENT")
             print("=" * 50)
@@ -78,28 +103,29 @@ class MainMusicPlayer:
             print("3. 📁 Display by File Type")
             print("4. 🔍 Search Songs")
             print("5. 📊 Library Statistics")
-            print("6. ⬅️  Back to Main Menu")
+            print("6. 👯 Find Duplicate Files")
+            print("7. ⬅️  Back to Main Menu")
             print("-" * 50)
             
-            choice = input("Enter your choice (1-6): ").strip()
+            choice = input("Enter your choice (1-7): ").strip()
             
             if choice == '1':
-                self.music_manager.display_song_library()
+                self.show_paged_report(self.music_manager.display_song_library)
             
             elif choice == '2':
-                self.music_manager.display_artist_report()
+                self.show_paged_report(self.music_manager.display_artist_report)
             
             elif choice == '3':
-                self.music_manager.display_file_type_report()
+                self.show_paged_report(self.music_manager.display_file_type_report)
             
             elif choice == '4':
                 query = input("Enter search term: ").strip()
                 if query:
-                    results = self.music_manager.search_songs(query)
+                    results = self.music_manager.search_songs_ranked(query)
                     if results:
-                        print(f"\nFound {len(results)} songs:")
-                        for i, song in enumerate(results, 1):
-                            print(f"{i}. {song['title']} - {song['artist']}")
+                        print(f"\nBest {len(results)} matches:")
+                        for i, (song, score) in enumerate(results, 1):
+                            print(f"{i}. {song['title']} - {song['artist']} ({score:.0%} match)")
                     else:
                         print("No songs found.")
             
@@ -107,11 +133,25 @@ class MainMusicPlayer:
                 self.music_manager.display_statistics()
             
             elif choice == '6':
+                self.music_manager.display_duplicates()
+            
+            elif choice == '7':
                 break
             
             else:
                 print("Invalid choice. Please try again.")
     
+    def show_paged_report(self, display_page):
+        """Show a library report one page at a time, so large libraries start printing at once."""
+        offset = 0
+        while True:
+            shown = display_page(offset, REPORT_PAGE_SIZE)
+            offset += shown
+            if shown < REPORT_PAGE_SIZE:
+                break
+            if input("Press Enter for the next page, or 'q' to stop: ").strip().lower() == 'q':
+                break
+    
     def show_playlist_management_menu(self):
         """Display the playlist management menu."""
         while True:
@@ -286,19 +326,9 @@ class MainMusicPlayer:
                 # Ensure we're at a valid song
                 if not current_playlist.get_current_song():
                     current_playlist.go_to_first_song()
-                while True:
-                    song = current_playlist.get_current_song()
-                    if song:
-                        self.stacks_queues_player.play_song(song)
-                        print(f"🎵 Playing: {song['title']} - {song['artist']}")
-                        # Wait for song to finish (simulated here; pygame can handle this differently)
-                        input("Press Enter to play next song, or Ctrl+C to stop...")
-                        current_playlist.next_song()
-                        if not current_playlist.get_current_song():
-                            current_playlist.go_to_first_song()
-                    else:
-                        print("Reached end of playlist.")
-                        break
+                # Playback continues on a background thread, so the menu stays usable
+                self.stacks_queues_player.play_playlist_in_background(current_playlist)
+                print("▶️ Playing in the background. Going back to the main menu stops playback.")
             
             elif choice == '17':
                 self.stacks_queues_player.stop_song()
@@ -467,6 +497,10 @@ class MainMusicPlayer:
             print(f"➡️  Play Next Queue: {self.stacks_queues_player.play_next_queue.get_size()} songs")
             print(f"🎉 Party Queue: {self.stacks_queues_player.party_queue.get_size()} songs")
             print(f"📜 Listening History: {self.stacks_queues_player.listening_history.get_size()} songs")
+            cache_stats = self.stacks_queues_player.prefetch_cache.get_statistics()
+            print(f"💾 Prefetch Cache: {cache_stats['cached_tracks']} tracks, "
+                  f"{cache_stats['cached_bytes'] / (1024 * 1024):.1f} MB, "
+                  f"{cache_stats['hits']} hits / {cache_stats['misses']} misses")
             
             if self.stacks_queues_player.currently_playing:
                 current = self.stacks_queues_player.currently_playing
@@ -474,6 +508,23 @@ class MainMusicPlayer:
         
         print("=" * 80)
     
+    def apply_library_changes(self):
+        """Apply changes the library watcher collected since the last menu was shown."""
+        if self.library_watcher is None:
+            return
+        added, removed = self.library_watcher.apply_pending()
+        if added or removed:
+            print(f"\n🔄 Library updated: {added} added/updated, {removed} removed")
+    
+    def shutdown(self):
+        """Flush persistent state before exiting."""
+        if self.library_watcher:
+            self.library_watcher.stop()
+        if self.playlist_manager:
+            self.playlist_manager.save_all_playlists()
+        if self.stacks_queues_player:
+            self.stacks_queues_player.close()
+    
     def run(self):
         """Main run loop."""
         if not self.initialize_music_library():
@@ -481,6 +532,7 @@ class MainMusicPlayer:
             return
         
         while True:
+            self.apply_library_changes()
             self.show_main_menu()
             choice = input("Enter your choice (1-6): ").strip()
             
@@ -509,8 +561,11 @@ class MainMusicPlayer:
 
 def main():
     """Main function."""
+    # --no-audio skips the audio system entirely (library and playlist work only)
+    # --columnar (or MUSIC_PLAYER_COLUMNAR=1) uses the NumPy backend, which loads very large libraries faster
+    columnar = '--columnar' in sys.argv[1:] or os.environ.get('MUSIC_PLAYER_COLUMNAR') == '1'
+    player = MainMusicPlayer(audio_backend='null' if '--no-audio' in sys.argv[1:] else None, columnar=columnar)
     try:
-        player = MainMusicPlayer()
         player.run()
     except KeyboardInterrupt:
         print("\n\n🎵 Music player interrupted. Goodbye! 🎵")
@@ -518,6 +573,8 @@ def main():
         print(f"\n❌ Unexpected error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        player.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
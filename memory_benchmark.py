@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark
+Measures per-song memory of SongRecord against the six-key song dictionaries it replaced
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from song_record import SongRecord
+
+FILE_TYPES = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
+
+def create_paths(count: int, seed: int = 6) -> List[Tuple[str, int]]:
+    """Return (file path, size) pairs named "Artist - Title" like a scanned library."""
+    rng = random.Random(seed)
+    artists = [f"Artist {number:05d}" for number in range(max(10, count // 50))]
+    return [(f"/music/{artist}/{artist} - Song {number}{rng.choice(FILE_TYPES)}",
+             rng.randint(2 * 1024 * 1024, 12 * 1024 * 1024))
+            for number, artist in ((number, rng.choice(artists)) for number in range(count))]
+
+def parse(file_path: str) -> Tuple[str, str, str, str]:
+    """Split a path into (filename, artist, title, file type) the way the library scan does."""
+    filename, file_type = os.path.splitext(os.path.basename(file_path))
+    artist, title = filename.split(' - ', 1)
+    return filename, artist, title, file_type
+
+def as_dict(file_path: str, file_size: int) -> Dict:
+    """The song dictionary the library stored before SongRecord."""
+    filename, artist, title, file_type = parse(file_path)
+    return {'filename': filename, 'title': title, 'artist': artist, 'file_type': file_type,
+            'file_path': file_path, 'file_size': file_size}
+
+def as_record(file_path: str, file_size: int) -> SongRecord:
+    """The SongRecord the library stores now (untagged, so the tag fields stay None)."""
+    _, artist, title, file_type = parse(file_path)
+    return SongRecord(title, artist, file_type, file_path, file_size)
+
+def measure(make_song: Callable, paths: List[Tuple[str, int]]) -> Tuple[float, float]:
+    """Return (bytes per song, build seconds) for a library of songs made by make_song.
+
+    The paths themselves are allocated before tracing starts: both layouts keep
+    the same path strings, so only what each layout adds on top is counted.
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    songs = [make_song(file_path, file_size) for file_path, file_size in paths]
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del songs
+    return allocated / len(paths), elapsed
+
+def main():
+    """Print per-song memory for both layouts (1M tracks by default)."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    paths = create_paths(count)
+    print(f"\n📁 {count:,} synthetic tracks, {max(10, count // 50):,} artists")
+
+    results = {'Six-key dict': measure(as_dict, paths), 'SongRecord': measure(as_record, paths)}
+    print(f"  {'Layout':<14} {'Bytes/song':>11} {'Total':>11} {'Build':>10}")
+    for layout, (per_song, seconds) in results.items():
+        print(f"  {layout:<14} {per_song:>11,.0f} {per_song * count / (1024 * 1024):>8,.0f} MB {seconds:>8.2f} s")
+    dict_bytes, record_bytes = results['Six-key dict'][0], results['SongRecord'][0]
+    print(f"\n  SongRecord uses {record_bytes / dict_bytes:.0%} of the dictionary layout's memory")
+
+if __name__ == "__main__":
+    main()
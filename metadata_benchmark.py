@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Metadata Benchmark
+Measures tag reading throughput (files/sec) on synthetic MP3, FLAC, Ogg, M4A and WAV files
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from metadata_pipeline import MetadataPipeline, DEFAULT_METADATA_WORKERS
+from tag_reader import read_tags
+
+# Audio payload per synthetic file; large enough that readers must seek rather than read everything
+AUDIO_BYTES = 256 * 1024
+
+def _id3_frame(frame_id: str, text: str) -> bytes:
+    """Build an ID3v2.3 UTF-16 text frame."""
+    data = b'\x01' + text.encode('utf-16')
+    return frame_id.encode('latin-1') + struct.pack('>IH', len(data), 0) + data
+
+def _syncsafe(value: int) -> bytes:
+    """Encode a 28-bit ID3 synchsafe integer."""
+    return bytes(((value >> shift) & 0x7f) for shift in (21, 14, 7, 0))
+
+def make_mp3(tags: Dict) -> bytes:
+    """ID3v2.3 tag, then constant 128 kbps MPEG-1 Layer III frames."""
+    frames = b''.join((_id3_frame('TIT2', tags['title']), _id3_frame('TPE1', tags['artist']),
+                       _id3_frame('TALB', tags['album']), _id3_frame('TRCK', f"{tags['track_number']}/12"),
+                       b'APIC' + struct.pack('>IH', 4096, 0) + bytes(4096)))
+    header = b'ID3\x03\x00\x00' + _syncsafe(len(frames))
+    frame = b'\xff\xfb\x90\x64' + bytes(413)
+    return header + frames + frame * (AUDIO_BYTES // len(frame))
+
+def _vorbis_comment(tags: Dict) -> bytes:
+    """Build a Vorbis comment block."""
+    comments = [f"TITLE={tags['title']}", f"ARTIST={tags['artist']}", f"ALBUM={tags['album']}",
+                f"TRACKNUMBER={tags['track_number']}"]
+    vendor = b'benchmark'
+    data = struct.pack('<I', len(vendor)) + vendor + struct.pack('<I', len(comments))
+    for comment in comments:
+        encoded = comment.encode('utf-8')
+        data += struct.pack('<I', len(encoded)) + encoded
+    return data
+
+def make_flac(tags: Dict) -> bytes:
+    """fLaC marker, STREAMINFO for 3 minutes at 44.1 kHz, VORBIS_COMMENT, padding, audio."""
+    sample_rate, total_samples = 44100, 44100 * 180
+    streaminfo = bytearray(34)
+    streaminfo[10:14] = ((sample_rate << 12) | (1 << 9) | (15 << 4) | (total_samples >> 32)).to_bytes(4, 'big')
+    streaminfo[14:18] = (total_samples & 0xffffffff).to_bytes(4, 'big')
+    comment = _vorbis_comment(tags)
+    return b''.join((b'fLaC', b'\x00' + len(streaminfo).to_bytes(3, 'big'), bytes(streaminfo),
+                     b'\x04' + len(comment).to_bytes(3, 'big'), comment,
+                     b'\x81' + (1024).to_bytes(3, 'big'), bytes(1024), bytes(AUDIO_BYTES)))
+
+def _ogg_page(packet: bytes, granule: int, sequence: int, header_type: int = 0) -> bytes:
+    """Wrap a single packet in one Ogg page (CRC left at zero; readers here do not check it)."""
+    lacing = bytes([255] * (len(packet) // 255) + [len(packet) % 255])
+    return (b'OggS' + struct.pack('<BBqIII', 0, header_type, granule, 1, sequence, 0) +
+            bytes([len(lacing)]) + lacing + packet)
+
+def make_ogg(tags: Dict) -> bytes:
+    """Vorbis identification and comment pages, filler audio pages, and a final granule of 3 minutes."""
+    identification = b'\x01vorbis' + struct.pack('<IBIiii', 0, 2, 44100, 0, 160000, 0) + b'\xb8\x01'
+    comment = b'\x03vorbis' + _vorbis_comment(tags) + b'\x01'
+    pages = [_ogg_page(identification, 0, 0, 2), _ogg_page(comment, 0, 1)]
+    for sequence in range(2, 2 + AUDIO_BYTES // 4096):
+        pages.append(_ogg_page(bytes(4000), 44100 * sequence, sequence))
+    pages.append(_ogg_page(bytes(100), 44100 * 180, len(pages), 4))
+    return b''.join(pages)
+
+def _atom(atom_type: bytes, payload: bytes) -> bytes:
+    """Build an MP4 atom."""
+    return struct.pack('>I', 8 + len(payload)) + atom_type + payload
+
+def make_m4a(tags: Dict) -> bytes:
+    """ftyp, a large mdat, then moov with mvhd (3 minutes) and iTunes-style ilst tags."""
+    def text_item(atom_type: bytes, text: str) -> bytes:
+        return _atom(atom_type, _atom(b'data', struct.pack('>II', 1, 0) + text.encode('utf-8')))
+
+    mvhd = _atom(b'mvhd', struct.pack('>IIIII', 0, 0, 0, 1000, 180000) + bytes(80))
+    ilst = _atom(b'ilst', b''.join((
+        text_item(b'\xa9nam', tags['title']), text_item(b'\xa9ART', tags['artist']),
+        text_item(b'\xa9alb', tags['album']),
+        _atom(b'trkn', _atom(b'data', struct.pack('>IIHHHH', 0, 0, 0, tags['track_number'], 12, 0))))))
+    meta = _atom(b'meta', bytes(4) + _atom(b'hdlr', bytes(25)) + ilst)
+    moov = _atom(b'moov', mvhd + _atom(b'udta', meta))
+    return _atom(b'ftyp', b'M4A \x00\x00\x00\x00') + _atom(b'mdat', bytes(AUDIO_BYTES)) + moov
+
+def make_wav(tags: Dict) -> bytes:
+    """RIFF/WAVE with 16-bit stereo 44.1 kHz fmt, LIST/INFO tags and a data chunk."""
+    def info(chunk_id: bytes, text: str) -> bytes:
+        data = text.encode('utf-8') + b'\x00'
+        return chunk_id + struct.pack('<I', len(data)) + data + (b'\x00' if len(data) & 1 else b'')
+
+    fmt = b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 2, 44100, 176400, 4, 16)
+    info_list = b'INFO' + info(b'INAM', tags['title']) + info(b'IART', tags['artist']) + \
+        info(b'IPRD', tags['album']) + info(b'ITRK', str(tags['track_number']))
+    body = b'WAVE' + fmt + b'LIST' + struct.pack('<I', len(info_list)) + info_list + \
+        b'data' + struct.pack('<I', AUDIO_BYTES) + bytes(AUDIO_BYTES)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+GENERATORS: Dict[str, Callable[[Dict], bytes]] = {
+    '.mp3': make_mp3, '.flac': make_flac, '.ogg': make_ogg, '.m4a': make_m4a, '.wav': make_wav
+}
+
+def create_library(directory: str, count: int) -> List[Tuple[str, os.stat_result]]:
+    """Write count synthetic files, cycling through the formats, and return (path, stat) pairs."""
+    files = []
+    extensions = list(GENERATORS)
+    for i in range(count):
+        extension = extensions[i % len(extensions)]
+        tags = {'title': f"Song {i}", 'artist': f"Artist {i % 50}", 'album': f"Album {i % 200}",
+                'track_number': i % 12 + 1}
+        path = os.path.join(directory, f"file_{i:06d}{extension}")
+        with open(path, 'wb') as audio_file:
+            audio_file.write(GENERATORS[extension](tags))
+        files.append((path, os.stat(path)))
+    return files
+
+def check_formats(directory: str) -> None:
+    """Make sure every synthetic format reads back complete tags before timing anything."""
+    for path, _ in create_library(directory, len(GENERATORS)):
+        tags = read_tags(path)
+        missing = [field for field in ('title', 'artist', 'album', 'track_number', 'duration', 'bitrate')
+                   if field not in tags]
+        if missing:
+            raise RuntimeError(f"{os.path.basename(path)} is missing {', '.join(missing)}: {tags}")
+
+def main():
+    """Print tag reading throughput in-process, on the process pool, and from the cache."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as directory:
+        check_formats(directory)
+        files = create_library(directory, count)
+        print(f"📁 {count:,} synthetic files ({', '.join(GENERATORS)})")
+
+        runs = [
+            ("In-process", MetadataPipeline(max_workers=1)),
+            (f"Process pool ({DEFAULT_METADATA_WORKERS} workers)",
+             MetadataPipeline(max_workers=DEFAULT_METADATA_WORKERS, min_parallel_files=0)),
+        ]
+        for label, pipeline in runs:
+            start = time.perf_counter()
+            pipeline.read(files)
+            elapsed = time.perf_counter() - start
+            note = "" if pipeline.used_processes or pipeline.max_workers == 1 else " (fell back to in-process)"
+            print(f"  {label:<28} {count / elapsed:>10,.0f} files/sec{note}")
+
+        cached = runs[-1][1]
+        start = time.perf_counter()
+        cached.read(files)
+        print(f"  {'Cached (unchanged files)':<28} {count / (time.perf_counter() - start):>10,.0f} files/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Queue Benchmark
+Times the deque-backed SongQueue against the list append/pop(0) queue it replaced
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from src.stacks_queues_music import SongQueue
+
+SIZES = (1_000, 10_000, 50_000)
+
+class ListSongQueue:
+    """The original queue: a list drained with pop(0), which shifts every remaining song."""
+
+    def __init__(self):
+        self.queue = []
+
+    def enqueue(self, song):
+        self.queue.append(song)
+
+    def dequeue(self):
+        if self.queue:
+            return self.queue.pop(0)
+        return None
+
+def fill_and_drain(queue, songs: List[Dict]) -> None:
+    """Enqueue every song one at a time, then dequeue them all."""
+    for song in songs:
+        queue.enqueue(song)
+    while queue.dequeue() is not None:
+        pass
+
+def fill_and_drain_batched(queue: SongQueue, songs: List[Dict]) -> None:
+    """Enqueue the songs as one batch and dequeue them as one batch."""
+    queue.enqueue_many(songs)
+    queue.dequeue_many(len(songs))
+
+def ops_per_second(run: Callable[[], None], operations: int, runs: int = 5) -> float:
+    """Median throughput of run in queue operations per second."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    return operations / statistics.median(samples)
+
+def main():
+    """Print enqueue + dequeue throughput for each queue at each size."""
+    sizes = [int(argument) for argument in sys.argv[1:]] or SIZES
+    print(f"  {'Songs':>8} {'list pop(0)':>14} {'deque':>14} {'deque batch':>14} {'Speedup':>9}")
+    for size in sizes:
+        songs = [{'title': f"Song {number}", 'artist': "Artist"} for number in range(size)]
+        operations = 2 * size
+        list_rate = ops_per_second(lambda: fill_and_drain(ListSongQueue(), songs), operations)
+        deque_rate = ops_per_second(lambda: fill_and_drain(SongQueue(), songs), operations)
+        batch_rate = ops_per_second(lambda: fill_and_drain_batched(SongQueue(), songs), operations)
+        print(f"  {size:>8,} {list_rate / 1e6:>9.2f} M/s {deque_rate / 1e6:>9.2f} M/s "
+              f"{batch_rate / 1e6:>9.2f} M/s {deque_rate / list_rate:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
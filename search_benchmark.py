@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+Times fuzzy, ranked song search on a synthetic library (1M tracks by default)
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from itertools import accumulate
+from typing import List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from search_index import FuzzyIndex
+
+# Per-query latency the search should stay under
+TARGET_MILLISECONDS = 20.0
+
+SYLLABLES = ('ka', 'lo', 'mi', 'ra', 'zu', 'ne', 'to', 'shi', 'an', 'el', 'or', 'ti', 'be', 'qu', 'ly', 'son',
+             'ver', 'dan', 'mar', 'ston', 'gle', 'nia', 'ro', 'vi')
+
+# Real names mixed into the synthetic data, with the misspelled queries that should find them
+QUERIES = ('ozy osborne', 'ozzy', 'crazy trian', 'ramnoes', 'punishmnet crime', 'osb',
+           'love', 'night river', 'zzzzqx')
+
+def _word(rng: random.Random) -> str:
+    """Make a pronounceable word from two to four syllables."""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+def create_library(count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """Return count (title, artist) pairs with a skewed word distribution, like real titles."""
+    rng = random.Random(seed)
+    vocabulary = [_word(rng) for _ in range(30000)] + ['love', 'night', 'river', 'train', 'crime', 'the']
+    artists = [' '.join(_word(rng).capitalize() for _ in range(rng.randint(1, 3))) for _ in range(20000)]
+    artists += ['Ozzy Osbourne', 'Ramones, The']
+    # A few words are very common (Zipf-like), most are rare
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    rng.shuffle(weights)
+    cumulative_weights = list(accumulate(weights))
+
+    songs = []
+    for _ in range(count):
+        title = ' '.join(word.capitalize() for word in rng.choices(vocabulary, cum_weights=cumulative_weights, k=rng.randint(1, 4)))
+        songs.append((title, rng.choice(artists)))
+    songs += [('Crazy Train', 'Ozzy Osbourne'), ('Dee', 'Ozzy Osbourne'),
+              ('Punishment Fits The Crime', 'Ramones, The')]
+    return songs
+
+def main():
+    """Build the index and print per-query latency."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    songs = create_library(count)
+
+    start = time.perf_counter()
+    index = FuzzyIndex()
+    for key, (title, artist) in enumerate(songs):
+        index.add(key, title, artist)
+    print(f"📁 Indexed {len(songs):,} synthetic tracks in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for query in QUERIES:
+        samples = []
+        for _ in range(5):
+            started = time.perf_counter()
+            results = index.search(query)
+            samples.append((time.perf_counter() - started) * 1000)
+        elapsed = statistics.median(samples)
+        timings.append(elapsed)
+        best = f"{songs[results[0][0]][0]} - {songs[results[0][0]][1]} ({results[0][1]:.2f})" if results else "-"
+        print(f"  {query!r:<22} {elapsed:7.2f} ms  {len(results):>3} results  top: {best}")
+
+    worst = max(timings)
+    status = "✅ within" if worst <= TARGET_MILLISECONDS else "❌ over"
+    print(f"{status} the {TARGET_MILLISECONDS:.0f} ms target (slowest query {worst:.2f} ms)")
+
+if __name__ == "__main__":
+    main()
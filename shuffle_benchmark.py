@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Shuffle Benchmark
+Times the Fisher-Yates playlist shuffle against the original recursive divide-and-conquer shuffle
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from itertools import permutations
+from typing import Callable, List
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from recursive_playlist_shuffle import recursive_shuffle_playlist
+
+SIZES = (10, 1_000, 100_000)
+
+def original_recursive_shuffle(playlist: List, depth: int = 0) -> List:
+    """The shuffle this module used to ship: split, recurse, then merge with coin flips."""
+    if depth > 50:
+        return random.sample(playlist, len(playlist))
+    if len(playlist) <= 1:
+        return playlist
+    if len(playlist) == 2:
+        return playlist if random.random() < 0.5 else playlist[::-1]
+    mid = len(playlist) // 2
+    return _original_merge(original_recursive_shuffle(playlist[:mid], depth + 1),
+                           original_recursive_shuffle(playlist[mid:], depth + 1), depth + 1)
+
+def _original_merge(left: List, right: List, depth: int) -> List:
+    """Original merge: recursive slicing for the first 50 steps, then a loop of 50/50 coin flips."""
+    if depth > 50:
+        result = []
+        left_idx = right_idx = 0
+        while left_idx < len(left) and right_idx < len(right):
+            if random.random() < 0.5:
+                result.append(left[left_idx])
+                left_idx += 1
+            else:
+                result.append(right[right_idx])
+                right_idx += 1
+        result.extend(left[left_idx:])
+        result.extend(right[right_idx:])
+        return result
+    if not left:
+        return right
+    if not right:
+        return left
+    if random.random() < 0.5:
+        return [left[0]] + _original_merge(left[1:], right, depth + 1)
+    return [right[0]] + _original_merge(left, right, depth + 1)
+
+def median_ms(shuffle: Callable[[List], List], size: int) -> float:
+    """Median time of one shuffle of `size` songs, in milliseconds."""
+    songs = [{'title': f"Song {number}", 'artist': "Artist"} for number in range(size)]
+    runs = max(3, min(1000, 100_000 // size))
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        shuffle(songs)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def chi_square(shuffle: Callable[[List], List], trials: int = 48_000) -> float:
+    """Chi-square statistic of the 24 orders of 4 songs (23 degrees of freedom; uniform stays below ~50)."""
+    orders = list(permutations(range(4)))
+    counts = Counter(tuple(shuffle(list(range(4)))) for _ in range(trials))
+    expected = trials / len(orders)
+    return sum((counts[order] - expected) ** 2 / expected for order in orders)
+
+def main():
+    """Print timings at 10, 1k and 100k songs and the uniformity of both shuffles."""
+    random.seed(1)
+    print(f"  {'Songs':>8} {'Original':>12} {'Fisher-Yates':>14} {'Speedup':>9}")
+    for size in SIZES:
+        original_ms = median_ms(original_recursive_shuffle, size)
+        new_ms = median_ms(recursive_shuffle_playlist, size)
+        print(f"  {size:>8,} {original_ms:>9.3f} ms {new_ms:>11.3f} ms {original_ms / new_ms:>8.1f}x")
+
+    print(f"\n  Chi-square over 24 orders (p = 0.001 critical value 49.7):")
+    print(f"    Original      {chi_square(original_recursive_shuffle):>12,.1f}")
+    print(f"    Fisher-Yates  {chi_square(recursive_shuffle_playlist):>12,.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,447 @@
+import importlib.util
 import os
 import re
+import sqlite3
+import stat
+import time
+from bisect import bisect_left, insort
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterable, Iterator, Tuple, Optional, TextIO
+
+from library_scanner import LibraryScanner, DEFAULT_SCAN_WORKERS, MISSING_PATH_ERRORS
+from library_index import LibraryIndex
+from search_index import SubstringIndex, FuzzyIndex, DEFAULT_RESULT_LIMIT
+from library_statistics import LibraryStatistics
+from metadata_pipeline import MetadataPipeline, DEFAULT_METADATA_WORKERS
+from report_writer import ReportWriter, paginate
+from duplicate_finder import DuplicateFinder, DEFAULT_HASH_WORKERS
+from song_record import SongRecord
+
+# Supported audio file extensions
+AUDIO_EXTENSIONS = {'.mp3', '.flac', '.wav', '.m4a', '.ogg'}
 
 class MusicPlaylistManager:
-    def __init__(self, music_directory: str):
+    def __init__(self, music_directory: str, scan_workers: int = DEFAULT_SCAN_WORKERS,
+                 index_path: Optional[str] = None, read_tags: bool = True,
+                 metadata_workers: int = DEFAULT_METADATA_WORKERS, columnar: bool = False):
         """Initialize the Music Playlist Manager with a music directory."""
         self.music_directory = Path(music_directory)
-        self.song_library = []
+        self.scan_workers = scan_workers
+        self.index_path = index_path
+        
+        # Tags are read from new or changed files; the filename is the fallback for anything missing
+        self.metadata_pipeline = MetadataPipeline(metadata_workers) if read_tags else None
         self.artists = set()
         self.file_types = set()
         
+        # By default, group indexes keyed by lowercased artist and by file type (each mapping file path to
+        # song) and running statistics are kept up to date song by song. With columnar=True and NumPy
+        # installed, statistics, filters and reports run on a columnar table built on first use instead
+        self.columnar = columnar and importlib.util.find_spec('numpy') is not None
+        if columnar and not self.columnar:
+            print("Warning: NumPy is not installed; using the pure-Python library statistics.")
+        self._columnar_library = None
+        self._artist_song_counts: Dict[str, int] = {}
+        self._file_type_song_counts: Dict[str, int] = {}
+        self._songs_by_artist: Dict[str, Dict[str, Dict]] = {}
+        self._songs_by_file_type: Dict[str, Dict[str, Dict]] = {}
+        self._statistics = LibraryStatistics()
+        
+        # Songs keyed by file path in library order, plus what the index needs to detect changes
+        self._songs_by_path: Dict[str, Dict] = {}
+        self._file_mtimes: Dict[str, float] = {}
+        self._directory_mtimes: Dict[str, float] = {}
+        # File paths of the songs in each directory, so a changed directory is diffed without visiting every song
+        self._paths_by_directory: Dict[str, Dict[str, None]] = {}
+        self._library_cache: Optional[List[Dict]] = None
+        self._sorted_artists: Optional[List[str]] = None
+        self._last_duplicate_statistics: Dict = {}
+        self._search_index: Optional[SubstringIndex] = None
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+        
         # Load the music library on startup
         self.load_music_library()
+    
+    @property
+    def song_library(self) -> List[Dict]:
+        """All songs in library order, rebuilt lazily after the library changes."""
+        if self._library_cache is None:
+            self._library_cache = list(self._songs_by_path.values())
+        return self._library_cache
+        
+    def load_music_library(self, scan_workers: Optional[int] = None) -> None:
+        """Load the library from the on-disk index if possible, otherwise scan the music directory."""
+        self._reset_library()
         
-    def load_music_library(self) -> None:
-        """Load all music files from the music directory into the library."""
         if not self.music_directory.exists():
             print(f"Error: Music directory '{self.music_directory}' does not exist.")
             return
-            
-        # Supported audio file extensions
-        audio_extensions = {'.mp3', '.flac', '.wav', '.m4a', '.ogg'}
         
         print("Loading music library...")
         
-        for file_path in self.music_directory.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
-                song_info = self._extract_song_info(file_path)
-                if song_info:
-                    self.song_library.append(song_info)
-                    self.artists.add(song_info['artist'])
-                    self.file_types.add(song_info['file_type'])
+        workers = scan_workers if scan_workers is not None else self.scan_workers
+        scanner = LibraryScanner(AUDIO_EXTENSIONS, max_workers=workers)
+        index = LibraryIndex(self.index_path) if self.index_path else None
+        
+        try:
+            if index and index.is_valid_for(self.music_directory):
+                self._load_from_index(index, scanner)
+            else:
+                self._scan_full_library(scanner)
+                if index:
+                    index.rebuild(self.music_directory, self._iter_songs_with_mtimes(),
+                                  self._directory_mtimes)
+        except sqlite3.Error as e:
+            print(f"Warning: library index unavailable ({e}), scanning music directory.")
+            self._reset_library()
+            self._scan_full_library(scanner)
+        finally:
+            if index:
+                index.close()
+    
+    def _reset_library(self) -> None:
+        """Forget every loaded song."""
+        self._songs_by_path = {}
+        self._file_mtimes = {}
+        self._directory_mtimes = {}
+        self._paths_by_directory = {}
+        self._library_cache = None
+        self._sorted_artists = None
+        self._search_index = None
+        self._fuzzy_index = None
+        self._columnar_library = None
+        self._artist_song_counts = {}
+        self._file_type_song_counts = {}
+        self._songs_by_artist = {}
+        self._songs_by_file_type = {}
+        self._statistics = LibraryStatistics()
+        self.artists = set()
+        self.file_types = set()
+    
+    def _scan_full_library(self, scanner: LibraryScanner) -> None:
+        """Recursively scan the whole music directory."""
+        files = list(scanner.scan(self.music_directory))
+        for song_info, stat_result in self._read_songs(files):
+            self._add_song(song_info, stat_result.st_mtime)
+        self._directory_mtimes = dict(scanner.directory_mtimes)
                     
-        print(f"Loaded {len(self.song_library)} songs from the music library.")
+        print(f"Loaded {len(self._songs_by_path)} songs from the music library "
+              f"({scanner.get_files_per_second():,.0f} files/sec, {scanner.max_workers} workers).")
+        if self.metadata_pipeline is not None and files:
+            print(f"Read tags at {self.metadata_pipeline.get_files_per_second():,.0f} files/sec.")
+    
+    def _load_from_index(self, index: LibraryIndex, scanner: LibraryScanner) -> None:
+        """Load the saved index, then rescan only directories whose mtime changed."""
+        start = time.perf_counter()
+        
+        for song_info, mtime in index.load_songs():
+            self._add_song(song_info, mtime)
+        self._directory_mtimes = index.load_directories()
+        
+        upserted, removed_paths, changed_directories, removed_directories = \
+            self._rescan_changed_directories(scanner)
+        
+        if upserted or removed_paths or changed_directories or removed_directories:
+            index.apply_changes(((song, self._file_mtimes[song['file_path']]) for song in upserted),
+                                removed_paths, changed_directories, removed_directories)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Loaded {len(self._songs_by_path)} songs from the library index in {elapsed_ms:.0f} ms "
+              f"({len(upserted)} added/updated, {len(removed_paths)} removed).")
+    
+    def _rescan_changed_directories(self, scanner: LibraryScanner, directories: Optional[Iterable[str]] = None,
+                                    keep_path_order: bool = True):
+        """Bring the loaded index up to date with the directories that changed on disk.
+        
+        Only the given directories are checked (every known directory by default).
+        With keep_path_order the library is re-sorted into full-scan order, which
+        costs O(N log N); otherwise new songs are appended to the end.
+        """
+        upserted = []
+        removed_paths = []
+        changed_directories: Dict[str, float] = {}
+        removed_directories = []
+        # New or modified files; their tags are read in one batch once every directory is diffed
+        pending: List[Tuple[str, os.stat_result]] = []
+        
+        if directories is None:
+            directories = self._directory_mtimes
+        else:
+            directories = [directory for directory in directories if directory in self._directory_mtimes]
+        current_mtimes = scanner.stat_directories(directories)
+        stale = [path for path, mtime in current_mtimes.items()
+                 if mtime is None or mtime != self._directory_mtimes[path]]
+        if not stale:
+            return upserted, removed_paths, changed_directories, removed_directories
+        
+        for directory in stale:
+            files, subdirs, mtime = ([], [], None)
+            if current_mtimes[directory] is not None:
+                try:
+                    files, subdirs, mtime = scanner.scan_directory(directory)
+                except OSError:
+                    # It exists but cannot be read right now: keep its songs and look again next time
+                    continue
+            
+            if mtime is None:
+                # Directory is gone: drop it and everything indexed in it
+                removed_directories.append(directory)
+                del self._directory_mtimes[directory]
+            else:
+                changed_directories[directory] = mtime
+                self._directory_mtimes[directory] = mtime
+            
+            seen = set()
+            for file_path, stat_result in files:
+                seen.add(file_path)
+                known = self._songs_by_path.get(file_path)
+                if (known is None or known['file_size'] != stat_result.st_size or
+                        self._file_mtimes.get(file_path) != stat_result.st_mtime):
+                    pending.append((file_path, stat_result))
+            
+            for file_path in list(self._paths_by_directory.get(directory, ())):
+                if file_path not in seen:
+                    self._remove_song(file_path)
+                    removed_paths.append(file_path)
+            
+            # Directories created since the last run are scanned in full
+            for subdir in subdirs:
+                if subdir in self._directory_mtimes or subdir in changed_directories:
+                    continue
+                pending.extend(scanner.scan(subdir))
+                changed_directories.update(scanner.directory_mtimes)
+                self._directory_mtimes.update(scanner.directory_mtimes)
+        
+        for song_info, stat_result in self._read_songs(pending):
+            self._add_song(song_info, stat_result.st_mtime)
+            upserted.append(song_info)
+        
+        # Keep the same path order a full scan would produce
+        if upserted and keep_path_order:
+            self._songs_by_path = dict(sorted(self._songs_by_path.items()))
+            self._library_cache = None
+            self._rebuild_groups()
+        
+        return upserted, removed_paths, changed_directories, removed_directories
+    
+    def apply_path_changes(self, paths: Iterable[str]) -> Tuple[int, int]:
+        """Apply added, modified, removed or renamed paths reported by a filesystem watcher.
+        
+        Work is proportional to the number of paths: files are stat'ed and (re)read
+        or dropped one by one, a new directory is scanned, and a removed directory
+        drops the songs under it. Songs added this way are appended to the end of
+        song_library until the next load. Returns (added_or_updated, removed).
+        """
+        paths = set(paths)
+        # Keyed by path: a file inside a new directory can arrive both from the directory scan and on its own
+        pending: Dict[str, os.stat_result] = {}
+        upserted = []
+        removed_paths = []
+        changed_directories: Dict[str, float] = {}
+        removed_directories = []
+        
+        for path in sorted(paths):
+            try:
+                stat_result = os.stat(path)
+            except OSError as error:
+                if error.errno not in MISSING_PATH_ERRORS:
+                    # Unreadable for now rather than gone: leave the library as it is for this path
+                    continue
+                stat_result = None
+            
+            if stat_result is not None and stat.S_ISDIR(stat_result.st_mode):
+                if path not in self._directory_mtimes and path not in changed_directories:
+                    scanner = LibraryScanner(AUDIO_EXTENSIONS, max_workers=self.scan_workers)
+                    pending.update(scanner.scan(path))
+                    changed_directories.update(scanner.directory_mtimes)
+            elif stat_result is None and path in self._directory_mtimes:
+                # A directory was deleted or moved away: forget it, its subdirectories and their songs
+                prefix = path + os.sep
+                removed_directories.extend(directory for directory in self._directory_mtimes
+                                           if directory == path or directory.startswith(prefix))
+                for file_path in [file_path for file_path in self._songs_by_path if file_path.startswith(prefix)]:
+                    self._remove_song(file_path)
+                    removed_paths.append(file_path)
+            elif stat_result is None or Path(path).suffix.lower() not in AUDIO_EXTENSIONS:
+                if self._remove_song(path) is not None:
+                    removed_paths.append(path)
+            elif path not in pending:
+                known = self._songs_by_path.get(path)
+                if (known is None or known['file_size'] != stat_result.st_size or
+                        self._file_mtimes.get(path) != stat_result.st_mtime):
+                    pending[path] = stat_result
+        
+        for song_info, stat_result in self._read_songs(list(pending.items())):
+            self._add_song(song_info, stat_result.st_mtime)
+            upserted.append(song_info)
+        
+        for directory in removed_directories:
+            self._directory_mtimes.pop(directory, None)
+        # Record the new mtime of every directory that changed, so the next startup skips it
+        for directory in {os.path.dirname(path) for path in paths}:
+            if directory in self._directory_mtimes:
+                try:
+                    changed_directories[directory] = os.stat(directory).st_mtime
+                except OSError:
+                    pass
+        self._directory_mtimes.update(changed_directories)
+        
+        self._save_index_changes(upserted, removed_paths, changed_directories, removed_directories)
+        return len(upserted), len(removed_paths)
+    
+    def refresh_changed_directories(self, directories: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+        """Rescan the directories whose mtime changed; returns (added_or_updated, removed).
+        
+        Pass the directories a watcher saw change to check only those; by default
+        every known directory is stat'ed. Work is proportional to the directories
+        and songs involved: like apply_path_changes, new songs are appended to the
+        end of song_library until the next load.
+        """
+        scanner = LibraryScanner(AUDIO_EXTENSIONS, max_workers=self.scan_workers)
+        upserted, removed_paths, changed_directories, removed_directories = \
+            self._rescan_changed_directories(scanner, directories, keep_path_order=False)
+        self._save_index_changes(upserted, removed_paths, changed_directories, removed_directories)
+        return len(upserted), len(removed_paths)
+    
+    def get_directory_mtimes(self) -> Dict[str, float]:
+        """Return a snapshot of every known directory and the mtime it was last scanned at."""
+        return dict(self._directory_mtimes)
+    
+    def _save_index_changes(self, upserted: List[Dict], removed_paths: List[str],
+                            changed_directories: Dict[str, float], removed_directories: List[str]) -> None:
+        """Write live library changes to the on-disk index, if there is one."""
+        if not self.index_path or not (upserted or removed_paths or changed_directories or removed_directories):
+            return
+        index = LibraryIndex(self.index_path)
+        try:
+            index.apply_changes(((song, self._file_mtimes[song['file_path']]) for song in upserted),
+                                removed_paths, changed_directories, removed_directories)
+        except sqlite3.Error as e:
+            print(f"Warning: could not update the library index ({e}).")
+        finally:
+            index.close()
+    
+    def _add_song(self, song_info: Dict, mtime: float) -> None:
+        """Add a song to the library, replacing any song with the same file path."""
+        file_path = song_info['file_path']
+        if file_path in self._songs_by_path:
+            self._remove_song(file_path)
+        
+        self._songs_by_path[file_path] = song_info
+        self._file_mtimes[file_path] = mtime
+        self._paths_by_directory.setdefault(os.path.dirname(file_path), {})[file_path] = None
+        self._library_cache = None
+        if self._search_index is not None:
+            self._search_index.add(file_path, song_info['title'], song_info['artist'])
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(file_path, song_info['title'], song_info['artist'])
+        self._add_to_groups(song_info)
+    
+    def _remove_song(self, file_path: str) -> Optional[Dict]:
+        """Remove a song from the library by file path."""
+        song_info = self._songs_by_path.pop(file_path, None)
+        self._file_mtimes.pop(file_path, None)
+        if song_info is not None:
+            directory = os.path.dirname(file_path)
+            paths = self._paths_by_directory[directory]
+            del paths[file_path]
+            if not paths:
+                del self._paths_by_directory[directory]
+            self._library_cache = None
+            if self._search_index is not None:
+                self._search_index.remove(file_path)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.remove(file_path)
+            self._remove_from_groups(song_info)
+        return song_info
+    
+    def _add_to_groups(self, song_info: Dict) -> None:
+        """Add a song to the artist and file type group indexes and the running statistics."""
+        artist = song_info['artist']
+        file_type = song_info['file_type']
+        if self.columnar:
+            if self._columnar_library is not None:
+                self._columnar_library.add(song_info)
+            self._artist_song_counts[artist] = self._artist_song_counts.get(artist, 0) + 1
+            self._file_type_song_counts[file_type] = self._file_type_song_counts.get(file_type, 0) + 1
+        else:
+            self._songs_by_artist.setdefault(artist.lower(), {})[song_info['file_path']] = song_info
+            self._songs_by_file_type.setdefault(file_type, {})[song_info['file_path']] = song_info
+            self._statistics.add_song(song_info)
+        
+        if artist not in self.artists:
+            self.artists.add(artist)
+            if self._sorted_artists is not None:
+                insort(self._sorted_artists, artist)
+        self.file_types.add(file_type)
+    
+    def _remove_from_groups(self, song_info: Dict) -> None:
+        """Remove a song from the artist and file type group indexes and the running statistics."""
+        artist = song_info['artist']
+        file_type = song_info['file_type']
+        if self.columnar:
+            if self._columnar_library is not None:
+                self._columnar_library.remove(song_info['file_path'])
+            artist_gone = self._decrement(self._artist_song_counts, artist)
+            file_type_gone = self._decrement(self._file_type_song_counts, file_type)
+        else:
+            for groups, key in ((self._songs_by_artist, artist.lower()), (self._songs_by_file_type, file_type)):
+                group = groups[key]
+                del group[song_info['file_path']]
+                if not group:
+                    del groups[key]
+            self._statistics.remove_song(song_info)
+            artist_gone = artist not in self._statistics.artist_counts
+            file_type_gone = file_type not in self._songs_by_file_type
+        
+        if artist_gone:
+            self.artists.discard(artist)
+            if self._sorted_artists is not None:
+                del self._sorted_artists[bisect_left(self._sorted_artists, artist)]
+        if file_type_gone:
+            self.file_types.discard(file_type)
+    
+    @staticmethod
+    def _decrement(counts: Dict[str, int], key: str) -> bool:
+        """Lower a song count by one; returns True when it reached zero and was removed."""
+        counts[key] -= 1
+        if counts[key]:
+            return False
+        del counts[key]
+        return True
+    
+    def _rebuild_groups(self) -> None:
+        """Rebuild the group indexes so each group follows library order."""
+        if self.columnar:
+            # Rows are stored in library order, so the table is rebuilt on its next use
+            self._columnar_library = None
+            return
+        self._songs_by_artist = {}
+        self._songs_by_file_type = {}
+        for file_path, song in self._songs_by_path.items():
+            self._songs_by_artist.setdefault(song['artist'].lower(), {})[file_path] = song
+            self._songs_by_file_type.setdefault(song['file_type'], {})[file_path] = song
+    
+    def _iter_songs_with_mtimes(self):
+        """Yield (song_info, mtime) pairs for writing the index."""
+        for file_path, song_info in self._songs_by_path.items():
+            yield song_info, self._file_mtimes[file_path]
+        
+    def _read_songs(self, files: List[Tuple[str, os.stat_result]]):
+        """Yield (song_info, stat_result) for scanned files, reading their tags in one batch."""
+        if self.metadata_pipeline is not None:
+            tags_list = self.metadata_pipeline.read(files)
+        else:
+            tags_list = [None] * len(files)
+        for (file_path, stat_result), tags in zip(files, tags_list):
+            yield self._extract_song_info(Path(file_path), stat_result, tags), stat_result
+        
+    def _extract_song_info(self, file_path: Path, stat_result: Optional[os.stat_result] = None,
+                           tags: Optional[Dict] = None) -> SongRecord:
+        """Build a song from its tags, falling back to the filename format 'Artist Name - Song Name'."""
+        if stat_result is None:
+            stat_result = file_path.stat()
         
-    def _extract_song_info(self, file_path: Path) -> Dict:
-        """Extract song information from filename with format 'Artist Name - Song Name'."""
         filename = file_path.stem
         file_type = file_path.suffix.lower()
         
@@ -54,40 +459,83 @@ class MusicPlaylistManager:
             artist = "Unknown Artist"
             title = filename
             
-        return {
-            'filename': filename,
-            'title': title,
-            'artist': artist,
-            'file_type': file_type,
-            'file_path': str(file_path),
-            'file_size': file_path.stat().st_size
-        }
+        if not tags:
+            return SongRecord(title, artist, file_type, str(file_path), stat_result.st_size)
+        return SongRecord(tags.get('title') or title, tags.get('artist') or artist, file_type,
+                          str(file_path), stat_result.st_size, tags.get('album'), tags.get('track_number'),
+                          tags.get('duration'), tags.get('bitrate'))
             
     def get_song_library(self) -> List[Dict]:
         """Return the complete song library."""
         return self.song_library
+    
+    def get_song_by_path(self, file_path: str) -> Optional[Dict]:
+        """Look up a song by its file path."""
+        return self._songs_by_path.get(file_path)
         
     def filter_songs_by_artist(self, artist: str) -> List[Dict]:
-        """Filter songs by a specific artist."""
-        return [song for song in self.song_library if song['artist'].lower() == artist.lower()]
+        """Filter songs by a specific artist (case-insensitive)."""
+        if self.columnar:
+            return self._get_columnar_library().filter_by_artist(artist)
+        return list(self._songs_by_artist.get(artist.lower(), {}).values())
         
     def filter_songs_by_file_type(self, file_type: str) -> List[Dict]:
         """Filter songs by file type."""
-        return [song for song in self.song_library if song['file_type'] == file_type.lower()]
+        if self.columnar:
+            return self._get_columnar_library().filter_by_file_type(file_type.lower())
+        return list(self._songs_by_file_type.get(file_type.lower(), {}).values())
+    
+    def count_songs_by_artist(self, artist: str) -> int:
+        """Count the songs by a specific artist (case-insensitive)."""
+        if self.columnar:
+            return self._get_columnar_library().count_by_artist(artist)
+        return len(self._songs_by_artist.get(artist.lower(), ()))
+    
+    def _get_columnar_library(self):
+        """Return the columnar table, building it on first use; NumPy is only imported then."""
+        if self._columnar_library is None:
+            from columnar_library import ColumnarLibrary
+            self._columnar_library = ColumnarLibrary(self._songs_by_path.values())
+        return self._columnar_library
     
     def search_songs(self, query: str) -> List[Dict]:
-        """Search songs by title or artist."""
-        query_lower = query.lower()
-        results = []
-        for song in self.song_library:
-            if (query_lower in song['title'].lower() or 
-                query_lower in song['artist'].lower()):
-                results.append(song)
-        return results
+        """Search songs by title or artist (case-insensitive substring match), sorted by file path."""
+        # Sorted explicitly: watcher updates append songs without re-sorting the library
+        matches = sorted(self._get_search_index().candidates(query))
+        return [self._songs_by_path[file_path] for file_path in matches]
+        
+    def search_songs_ranked(self, query: str, limit: int = DEFAULT_RESULT_LIMIT) -> List[Tuple[Dict, float]]:
+        """Typo-tolerant search over title and artist words; returns (song, score) pairs, best first."""
+        return [(self._songs_by_path[file_path], score)
+                for file_path, score in self._get_fuzzy_index().search(query, limit)]
+    
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        """Return the fuzzy search index, building it on the first ranked search."""
+        if self._fuzzy_index is None:
+            fuzzy_index = FuzzyIndex()
+            for file_path, song in self._songs_by_path.items():
+                fuzzy_index.add(file_path, song['title'], song['artist'])
+            self._fuzzy_index = fuzzy_index
+        return self._fuzzy_index
+        
+    def _get_search_index(self) -> SubstringIndex:
+        """Return the search index, building it on the first search so startup stays fast."""
+        if self._search_index is None:
+            search_index = SubstringIndex()
+            for file_path, song in self._songs_by_path.items():
+                search_index.add(file_path, song['title'], song['artist'])
+            self._search_index = search_index
+        return self._search_index
         
     def get_artists_list(self) -> List[str]:
         """Get a list of all artists in the library."""
-        return sorted(list(self.artists))
+        return list(self._get_sorted_artists())
+    
+    def _get_sorted_artists(self) -> List[str]:
+        """Return the artists in name order, sorted again only after the artist set changed."""
+        if self._sorted_artists is None:
+            self._sorted_artists = sorted(self.artists)
+        return self._sorted_artists
         
     def get_file_types_list(self) -> List[str]:
         """Get a list of all file types in the library."""
@@ -95,6 +543,8 @@ class MusicPlaylistManager:
         
     def generate_artist_report(self) -> Dict[str, List[Dict]]:
         """Generate a report organized by artist."""
+        if self.columnar:
+            return self._get_columnar_library().group_by_artist()
         report = {}
         for artist in self.artists:
             report[artist] = self.filter_songs_by_artist(artist)
@@ -102,78 +552,153 @@ class MusicPlaylistManager:
         
     def generate_file_type_report(self) -> Dict[str, List[Dict]]:
         """Generate a report organized by file type."""
+        if self.columnar:
+            return self._get_columnar_library().group_by_file_type()
         report = {}
         for file_type in self.file_types:
             report[file_type] = self.filter_songs_by_file_type(file_type)
         return report
         
+    def get_library_totals(self) -> Dict:
+        """Get song, size, duration, artist and file type totals in O(1), without the per-artist counts."""
+        if self.columnar:
+            return self._get_columnar_library().get_totals()
+        return self._statistics.get_totals()
+    
     def get_library_statistics(self) -> Dict:
-        """Get comprehensive statistics about the music library."""
-        total_songs = len(self.song_library)
-        total_size = sum(song['file_size'] for song in self.song_library)
-        
-        # Count by artist
-        artist_counts = {}
-        for song in self.song_library:
-            artist = song['artist']
-            artist_counts[artist] = artist_counts.get(artist, 0) + 1
-            
-        # Count by file type
-        file_type_counts = {}
-        for song in self.song_library:
-            file_type = song['file_type']
-            file_type_counts[file_type] = file_type_counts.get(file_type, 0) + 1
+        """Get comprehensive statistics about the music library, including every artist's song count."""
+        if self.columnar:
+            return self._get_columnar_library().get_statistics()
+        return self._statistics.get_statistics()
+        
+    def iter_library_rows(self) -> Iterator[Tuple[int, Dict]]:
+        """Yield (number, song) for the whole library in library order, without building a list."""
+        return enumerate(self._songs_by_path.values(), 1)
+    
+    def iter_artist_report_rows(self) -> Iterator[Tuple[str, int, Dict]]:
+        """Yield (artist, song_count, song) with artists by name and each artist's songs by title.
+        
+        Only the artist currently being yielded is sorted, so the first rows arrive
+        without touching the rest of the library.
+        """
+        for artist in self._get_sorted_artists():
+            if self.columnar:
+                songs = self._get_columnar_library().songs_by_artist(artist)
+            else:
+                songs = [song for song in self._songs_by_artist.get(artist.lower(), {}).values()
+                         if song['artist'] == artist]
+            songs.sort(key=lambda x: x['title'])
+            for song in songs:
+                yield artist, len(songs), song
+    
+    def iter_file_type_report_rows(self) -> Iterator[Tuple[str, int, Dict]]:
+        """Yield (file_type, song_count, song) with file types by name and songs by artist.
+        
+        Songs are streamed from the artist groups in artist order instead of sorting
+        each file type's (possibly huge) song list up front.
+        """
+        if self.columnar:
+            columnar_library = self._get_columnar_library()
+            for file_type in sorted(self.file_types):
+                songs = columnar_library.songs_by_file_type_in_artist_order(file_type)
+                for song in songs:
+                    yield file_type, len(songs), song
+            return
+        
+        for file_type in sorted(self.file_types):
+            song_count = len(self._songs_by_file_type[file_type])
+            for artist in self._get_sorted_artists():
+                for song in self._songs_by_artist.get(artist.lower(), {}).values():
+                    if song['artist'] == artist and song['file_type'] == file_type:
+                        yield file_type, song_count, song
+    
+    def display_song_library(self, offset: int = 0, limit: Optional[int] = None,
+                             stream: Optional[TextIO] = None) -> int:
+        """Display songs in a formatted table; returns how many song rows were written."""
+        rows = 0
+        with ReportWriter(stream) as writer:
+            if offset == 0:
+                writer.write_lines(("", "="*90, "MUSIC LIBRARY", "="*90))
+            writer.write_line(f"{'#':<3} {'Title':<40} {'Artist':<25} {'Type':<6} {'Size (MB)':<10}")
+            writer.write_line("-"*90)
             
-        return {
-            'total_songs': total_songs,
-            'total_size_bytes': total_size,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
-            'unique_artists': len(self.artists),
-            'artist_counts': dict(sorted(artist_counts.items(), key=lambda x: x[1], reverse=True)),
-            'file_type_counts': file_type_counts
-        }
-        
-    def display_song_library(self) -> None:
-        """Display the complete song library in a formatted way."""
-        print("\n" + "="*90)
-        print("MUSIC LIBRARY")
-        print("="*90)
-        print(f"{'#':<3} {'Title':<40} {'Artist':<25} {'Type':<6} {'Size (MB)':<10}")
-        print("-"*90)
-        
-        for i, song in enumerate(self.song_library, 1):
-            size_mb = round(song['file_size'] / (1024 * 1024), 2)
-            print(f"{i:<3} {song['title'][:39]:<40} {song['artist'][:24]:<25} "
-                  f"{song['file_type']:<6} {size_mb:<10}")
+            for i, song in paginate(self.iter_library_rows(), offset, limit):
+                size_mb = round(song['file_size'] / (1024 * 1024), 2)
+                writer.write_line(f"{i:<3} {song['title'][:39]:<40} {song['artist'][:24]:<25} "
+                                  f"{song['file_type']:<6} {size_mb:<10}")
+                rows += 1
+        return rows
             
-    def display_artist_report(self) -> None:
-        """Display a report organized by artist."""
-        print("\n" + "="*80)
-        print("ARTIST REPORT")
-        print("="*80)
-        
-        artist_report = self.generate_artist_report()
-        for artist, songs in sorted(artist_report.items()):
-            print(f"\n{artist.upper()} ({len(songs)} songs):")
-            for song in sorted(songs, key=lambda x: x['title']):
-                print(f"  • {song['title']} ({song['file_type']})")
+    def display_artist_report(self, offset: int = 0, limit: Optional[int] = None,
+                              stream: Optional[TextIO] = None) -> int:
+        """Display a report organized by artist; offset and limit count song rows."""
+        with ReportWriter(stream) as writer:
+            if offset == 0:
+                writer.write_lines(("", "="*80, "ARTIST REPORT", "="*80))
+            return self._write_grouped_rows(writer, self.iter_artist_report_rows(), offset, limit, "songs",
+                                            lambda song: f"  • {song['title']} ({song['file_type']})")
                 
-    def display_file_type_report(self) -> None:
-        """Display a report organized by file type."""
-        print("\n" + "="*80)
-        print("FILE TYPE REPORT")
-        print("="*80)
+    def display_file_type_report(self, offset: int = 0, limit: Optional[int] = None,
+                                 stream: Optional[TextIO] = None) -> int:
+        """Display a report organized by file type; offset and limit count song rows."""
+        with ReportWriter(stream) as writer:
+            if offset == 0:
+                writer.write_lines(("", "="*80, "FILE TYPE REPORT", "="*80))
+            return self._write_grouped_rows(writer, self.iter_file_type_report_rows(), offset, limit, "files",
+                                            lambda song: f"  • {song['title']} - {song['artist']}")
+    
+    @staticmethod
+    def _write_grouped_rows(writer: ReportWriter, rows, offset: int, limit: Optional[int], unit: str,
+                            format_song) -> int:
+        """Write one page of (group, count, song) rows with a heading whenever the group changes."""
+        # Read the row just before the page to tell whether the page starts part-way through a group
+        start = max(offset - 1, 0)
+        page = paginate(rows, start, None if limit is None else limit + offset - start)
+        previous_group = next(page, (None,))[0] if offset > 0 else None
         
-        file_type_report = self.generate_file_type_report()
-        for file_type, songs in sorted(file_type_report.items()):
-            print(f"\n{file_type.upper()} ({len(songs)} files):")
-            for song in sorted(songs, key=lambda x: x['artist']):
-                print(f"  • {song['title']} - {song['artist']}")
+        written = 0
+        current_group = None
+        for group, count, song in page:
+            if group != current_group:
+                continued = ", continued" if written == 0 and group == previous_group else ""
+                writer.write_line("")
+                writer.write_line(f"{group.upper()} ({count} {unit}{continued}):")
+                current_group = group
+            writer.write_line(format_song(song))
+            written += 1
+        return written
                 
+    def find_duplicates(self, max_workers: int = DEFAULT_HASH_WORKERS) -> List[List[Dict]]:
+        """Find songs whose files have identical contents, grouped, largest files first."""
+        finder = DuplicateFinder(max_workers)
+        groups = finder.find((file_path, song['file_size']) for file_path, song in self._songs_by_path.items())
+        self._last_duplicate_statistics = finder.get_statistics()
+        return [[self._songs_by_path[file_path] for file_path in group] for group in groups]
+    
+    def display_duplicates(self, stream: Optional[TextIO] = None) -> int:
+        """Display groups of duplicate files and the space they waste; returns the number of groups."""
+        groups = self.find_duplicates()
+        stats = self._last_duplicate_statistics
+        wasted = sum(group[0]['file_size'] * (len(group) - 1) for group in groups)
+        
+        with ReportWriter(stream) as writer:
+            writer.write_lines(("", "="*80, "DUPLICATE FILES", "="*80))
+            for number, group in enumerate(groups, 1):
+                size_mb = round(group[0]['file_size'] / (1024 * 1024), 2)
+                writer.write_line(f"\nGroup {number}: {len(group)} copies, {size_mb} MB each")
+                for song in group:
+                    writer.write_line(f"  • {song['file_path']}")
+            if not groups:
+                writer.write_line("No duplicate files found.")
+            writer.write_line(f"\n{len(groups)} groups, {wasted / (1024 * 1024):.1f} MB in extra copies. "
+                              f"Read {stats['bytes_hashed'] / (1024 * 1024):.1f} MB of "
+                              f"{stats['bytes_considered'] / (1024 * 1024):.1f} MB "
+                              f"({stats['io_saved_percent']:.1f}% I/O saved) in {stats['elapsed_seconds']:.2f}s.")
+        return len(groups)
+    
     def display_statistics(self) -> None:
         """Display comprehensive library statistics."""
-        stats = self.get_library_statistics()
+        stats = self.get_library_totals()
         
         print("\n" + "="*80)
         print("LIBRARY STATISTICS")
@@ -181,9 +706,13 @@ class MusicPlaylistManager:
         print(f"Total Songs: {stats['total_songs']:,}")
         print(f"Total Size: {stats['total_size_gb']:.2f} GB ({stats['total_size_mb']:.1f} MB)")
         print(f"Unique Artists: {stats['unique_artists']}")
+        if stats['total_duration_seconds']:
+            hours, remainder = divmod(stats['total_duration_seconds'], 3600)
+            print(f"Total Play Time: {hours}h {remainder // 60:02d}m (songs with duration tags)")
         
         print(f"\nTop Artists by Song Count:")
-        for artist, count in list(stats['artist_counts'].items())[:10]:
+        top_artists = (self._get_columnar_library() if self.columnar else self._statistics).top_artists(10)
+        for artist, count in top_artists:
             print(f"  {artist}: {count} songs")
             
         print(f"\nFile Types:")
@@ -197,11 +726,9 @@ def main():
     if not music_dir:
         music_dir = r"D:\projects\Music_Stream\music"  # Default path
         
+    # The music library is loaded on startup
     manager = MusicPlaylistManager(music_dir)
     
-    # Load the music library
-    manager.load_music_library()
-    
     if not manager.song_library:
         print("No music files found in the specified directory.")
         return
@@ -233,7 +760,7 @@ def main():
     if artists and len(artists) > 0:
         print(f"\nAll Artists ({len(artists)} total):")
         for artist in artists[:15]:  # Show first 15 artists
-            songs_count = len(manager.filter_songs_by_artist(artist))
+            songs_count = manager.count_songs_by_artist(artist)
             print(f"  • {artist} ({songs_count} songs)")
         
         if len(artists) > 15:
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Audio Backends
+Thin wrappers around the audio output so playback can run with or without a sound device
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Backend names accepted by create_audio_backend() and the MUSIC_PLAYER_AUDIO environment variable
+AUDIO_BACKENDS = ('pygame', 'null')
+
+class AudioBackendError(Exception):
+    """Raised when a backend cannot load or play a track."""
+
+def create_audio_backend(name: Optional[str] = None):
+    """Create a backend by name, defaulting to $MUSIC_PLAYER_AUDIO or 'pygame'."""
+    name = (name or os.environ.get('MUSIC_PLAYER_AUDIO') or 'pygame').lower()
+    if name == 'pygame':
+        return PygameMixerBackend()
+    if name == 'null':
+        return NullAudioBackend()
+    raise ValueError(f"Unknown audio backend: {name} (expected one of {', '.join(AUDIO_BACKENDS)})")
+
+class PygameMixerBackend:
+    """Play audio through pygame.mixer.music.
+
+    pygame is imported and the mixer initialised on the first load(), so
+    creating the backend costs nothing for sessions that never play a song.
+    The next track is queued with mixer.music.queue(), so SDL_mixer starts it
+    the moment the current one ends. Every mixer call runs on the playback
+    engine's thread; only pygame's display and event system are avoided (SDL
+    wants those on the main thread on some platforms), so the mixer's
+    end-of-track event is not used. Instead a queued track is known to have
+    started when get_pos() falls back, as SDL_mixer restarts the position for
+    it, and the last track to have ended when get_busy() turns false.
+    """
+
+    supports_queue = True
+
+    def __init__(self):
+        self._pygame = None
+        self._was_busy = False
+        self._has_queued = False
+        self._last_position = 0
+        self._lock = threading.Lock()
+
+    def _ensure_mixer(self):
+        """Import pygame and start the mixer if that has not happened yet."""
+        if self._pygame is not None:
+            return self._pygame
+
+        try:
+            import pygame
+        except ImportError as e:
+            raise AudioBackendError(f"pygame is not available: {e}") from e
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            raise AudioBackendError(str(e)) from e
+
+        self._pygame = pygame
+        return pygame
+
+    def load(self, source) -> None:
+        """Load a track from a path or file-like object, dropping any queued track."""
+        with self._lock:
+            self._load(source)
+
+    def _load(self, source) -> None:
+        pygame = self._ensure_mixer()
+        try:
+            if isinstance(source, str):
+                pygame.mixer.music.load(source)
+            else:
+                pygame.mixer.music.load(source, _namehint(source))
+        except pygame.error as e:
+            raise AudioBackendError(str(e)) from e
+        self._has_queued = False
+
+    def play(self) -> None:
+        """Start playing the loaded track."""
+        with self._lock:
+            self._play()
+
+    def _play(self) -> None:
+        pygame = self._ensure_mixer()
+        try:
+            pygame.mixer.music.play()
+        except pygame.error as e:
+            raise AudioBackendError(str(e)) from e
+        self._was_busy = True
+        self._last_position = 0
+
+    def queue(self, source) -> None:
+        """Queue a track to start as soon as the current one ends.
+
+        SDL_mixer ignores a queued track when nothing is playing, so if the
+        current track has already ended the new one starts right away.
+        """
+        with self._lock:
+            pygame = self._ensure_mixer()
+            if not pygame.mixer.music.get_busy():
+                self._load(source)
+                self._play()
+                return
+            try:
+                if isinstance(source, str):
+                    pygame.mixer.music.queue(source)
+                else:
+                    pygame.mixer.music.queue(source, _namehint(source))
+            except pygame.error as e:
+                raise AudioBackendError(str(e)) from e
+            self._has_queued = True
+
+    def stop(self) -> None:
+        """Stop playback and drop any queued track."""
+        with self._lock:
+            pygame = self._pygame
+            if pygame is None:
+                return
+            pygame.mixer.music.stop()
+            self._was_busy = False
+            self._has_queued = False
+
+    def is_busy(self) -> bool:
+        """Check whether a track is playing."""
+        return self._pygame is not None and self._pygame.mixer.music.get_busy()
+
+    def poll_track_ends(self) -> int:
+        """Return how many tracks finished since the last poll."""
+        with self._lock:
+            pygame = self._pygame
+            if pygame is None:
+                return 0
+            busy = pygame.mixer.music.get_busy()
+            position = pygame.mixer.music.get_pos()
+            ended = 0
+            if busy:
+                if self._has_queued and position < self._last_position:
+                    # The queued track took over without a gap
+                    ended = 1
+                    self._has_queued = False
+            elif self._was_busy:
+                # A queued track still marked here was shorter than a poll and has ended too
+                ended = 2 if self._has_queued else 1
+                self._has_queued = False
+            self._was_busy = busy
+            self._last_position = position if busy else 0
+            return ended
+
+class NullAudioBackend:
+    """Backend that accepts every call and plays nothing.
+
+    For headless servers and sessions that only manage the library or
+    playlists. A "playing" track never ends, so background playback stays on
+    the first song until it is stopped or skipped.
+    """
+
+    supports_queue = False
+
+    def load(self, source) -> None:
+        pass
+
+    def play(self) -> None:
+        pass
+
+    def queue(self, source) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def is_busy(self) -> bool:
+        return False
+
+    def poll_track_ends(self) -> int:
+        return 0
+
+def _namehint(source) -> str:
+    """File extension of an in-memory track, so SDL_mixer knows which decoder to use."""
+    return os.path.splitext(getattr(source, 'name', '') or '')[1].lstrip('.').lower()
+
+class StubMixerBackend:
+    """Headless stand-in for the mixer: every track "plays" for a fixed time.
+
+    Useful for exercising the playback engine on machines without an audio
+    device. Calls are recorded in `events` as (action, source) tuples.
+    """
+
+    def __init__(self, track_seconds: float = 0.05, supports_queue: bool = True):
+        self.track_seconds = track_seconds
+        self.supports_queue = supports_queue
+        self.events: List[Tuple[str, object]] = []
+        self._loaded = None
+        self._queued: Optional[object] = None
+        self._ends_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, source) -> None:
+        with self._lock:
+            self._loaded = source
+            self._queued = None
+            self.events.append(('load', source))
+
+    def play(self) -> None:
+        with self._lock:
+            if self._loaded is None:
+                raise AudioBackendError("No track loaded")
+            self._ends_at = time.monotonic() + self.track_seconds
+            self.events.append(('play', self._loaded))
+
+    def queue(self, source) -> None:
+        with self._lock:
+            self._queued = source
+            self.events.append(('queue', source))
+
+    def stop(self) -> None:
+        with self._lock:
+            self._ends_at = None
+            self._queued = None
+            self.events.append(('stop', None))
+
+    def is_busy(self) -> bool:
+        with self._lock:
+            return self._ends_at is not None and time.monotonic() < self._ends_at
+
+    def poll_track_ends(self) -> int:
+        with self._lock:
+            if self._ends_at is None or time.monotonic() < self._ends_at:
+                return 0
+            if self._queued is not None:
+                # Gapless hand-over to the queued track
+                self._loaded, self._queued = self._queued, None
+                self._ends_at += self.track_seconds
+                self.events.append(('play', self._loaded))
+            else:
+                self._ends_at = None
+            return 1
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Columnar Library
+NumPy column store for library statistics, filters and group-bys: sizes as int64, artists and file types as codes
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from library_statistics import library_totals
+
+# Rows allocated up front; capacity doubles whenever the columns fill up
+INITIAL_CAPACITY = 1024
+
+# Removed rows are only compacted away once there are more of them than this (and than live rows)
+MIN_COMPACT_ROWS = 1024
+
+# Code 0 marks a removed row in every categorical column, so real values start at 1
+REMOVED = 0
+
+# NumPy's stable argsort is a radix sort for 16-bit integers, several times faster than for int32
+RADIX_SORT_LIMIT = 1 << 16
+
+class _Categories:
+    """Maps each distinct string to a small integer code and counts the live rows using it."""
+
+    def __init__(self):
+        self.names: List[str] = ['']
+        self.codes: Dict[str, int] = {}
+        self.live: List[int] = [0]
+
+    def code(self, name: str) -> int:
+        """Return the code for name, assigning the next one if it is new."""
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+            self.live.append(0)
+        return code
+
+class ColumnarLibrary:
+    """Songs stored column by column so aggregates run as vectorized NumPy operations.
+
+    file_size is an int64 column, duration a float64 column, and artist,
+    lowercased artist and file type are int32 codes into small category tables.
+    Statistics come from sum() and bincount(), filters from boolean masks and
+    group-bys from one stable argsort per column. Rows are appended in library
+    order and removal only clears a row's codes, so every result keeps library
+    order; cleared rows are compacted away once they outnumber the live ones.
+    """
+
+    def __init__(self, songs: Iterable[Dict] = ()):
+        self.artists = _Categories()
+        self.artist_keys = _Categories()
+        self.file_types = _Categories()
+        # Lowercased-artist code of each artist code, so that column is derived instead of looked up per song
+        self._key_of_artist: List[int] = [REMOVED]
+        self._rows_by_path: Dict[str, int] = {}
+        self._row_count = 0
+        self._removed_rows = 0
+        # Running totals so get_totals() never touches the columns
+        self._total_size = 0
+        self._total_duration = 0.0
+        self._live_artists = 0
+        self._allocate(INITIAL_CAPACITY)
+        self._reset_caches()
+        self._artist_ranks = None
+        self.add_many(songs)
+
+    def __len__(self) -> int:
+        return len(self._rows_by_path)
+
+    def add(self, song: Dict) -> None:
+        """Append one song; a song with the same file path must be removed first."""
+        self.add_many((song,))
+
+    def add_many(self, songs: Iterable[Dict]) -> None:
+        """Append songs in library order, filling the columns in bulk."""
+        songs = list(songs)
+        if not songs:
+            return
+        count = len(songs)
+        start = self._row_count
+        end = start + count
+        if end > len(self._sizes):
+            self._allocate(max(2 * len(self._sizes), end))
+
+        known_artists = len(self.artists.names)
+        artist_codes = np.fromiter(map(self.artists.code, (song['artist'] for song in songs)), np.int32, count)
+        type_codes = np.fromiter(map(self.file_types.code, (song['file_type'] for song in songs)), np.int32, count)
+        if len(self.artists.names) != known_artists:
+            self._key_of_artist.extend(self.artist_keys.code(name.lower())
+                                       for name in self.artists.names[known_artists:])
+            self._artist_ranks = None
+        key_codes = np.asarray(self._key_of_artist, dtype=np.int32)[artist_codes]
+
+        self._artist_codes[start:end] = artist_codes
+        self._key_codes[start:end] = key_codes
+        self._type_codes[start:end] = type_codes
+        self._sizes[start:end] = np.fromiter((song['file_size'] for song in songs), np.int64, count)
+        self._durations[start:end] = np.fromiter((song.get('duration') or 0.0 for song in songs), np.float64, count)
+        self._total_size += int(self._sizes[start:end].sum())
+        self._total_duration += float(self._durations[start:end].sum())
+        self._songs[start:end] = np.fromiter(songs, dtype=object, count=count)
+
+        for categories, codes in ((self.artists, artist_codes), (self.artist_keys, key_codes),
+                                  (self.file_types, type_codes)):
+            added = np.bincount(codes, minlength=len(categories.live))
+            live = categories.live
+            for code in np.flatnonzero(added).tolist():
+                if categories is self.artists and not live[code]:
+                    self._live_artists += 1
+                live[code] += int(added[code])
+        self._rows_by_path.update(zip((song['file_path'] for song in songs), range(start, end)))
+
+        self._row_count = end
+        self._reset_caches()
+
+    def remove(self, file_path: str) -> bool:
+        """Remove the song stored under file_path; returns False if there is none."""
+        row = self._rows_by_path.pop(file_path, None)
+        if row is None:
+            return False
+        for categories, column in ((self.artists, self._artist_codes), (self.artist_keys, self._key_codes),
+                                   (self.file_types, self._type_codes)):
+            categories.live[column[row]] -= 1
+            if categories is self.artists and not categories.live[column[row]]:
+                self._live_artists -= 1
+            column[row] = REMOVED
+        self._total_size -= int(self._sizes[row])
+        self._total_duration -= float(self._durations[row])
+        self._sizes[row] = 0
+        self._durations[row] = 0.0
+        self._songs[row] = None
+        self._removed_rows += 1
+        if self._removed_rows > max(MIN_COMPACT_ROWS, len(self._rows_by_path)):
+            self._compact()
+        self._reset_caches()
+        return True
+
+    def count_by_artist(self, artist: str) -> int:
+        """Songs by an artist, ignoring case."""
+        code = self.artist_keys.codes.get(artist.lower())
+        return self.artist_keys.live[code] if code is not None else 0
+
+    def filter_by_artist(self, artist: str) -> List[Dict]:
+        """Songs by an artist (case-insensitive) in library order."""
+        code = self.artist_keys.codes.get(artist.lower())
+        if code is None or not self.artist_keys.live[code]:
+            return []
+        return self._select(self._key_codes[:self._row_count] == code)
+
+    def filter_by_file_type(self, file_type: str) -> List[Dict]:
+        """Songs of a file type in library order."""
+        code = self.file_types.codes.get(file_type)
+        if code is None or not self.file_types.live[code]:
+            return []
+        return self._select(self._type_codes[:self._row_count] == code)
+
+    def group_by_artist(self) -> Dict[str, List[Dict]]:
+        """Map every artist to the songs of any artist with the same lowercased name, in library order."""
+        order, bounds = self._grouping('artist_key')
+        songs = self._songs[order]
+        key_codes = self.artist_keys.codes
+        return {name: songs[bounds[key]:bounds[key + 1]].tolist()
+                for name, key in ((name, key_codes[name.lower()]) for name in self._live_names(self.artists))}
+
+    def group_by_file_type(self) -> Dict[str, List[Dict]]:
+        """Map every file type to its songs in library order."""
+        order, bounds = self._grouping('file_type')
+        songs = self._songs[order]
+        return {name: songs[bounds[code]:bounds[code + 1]].tolist()
+                for name, code in self.file_types.codes.items() if self.file_types.live[code]}
+
+    def songs_by_artist(self, artist: str) -> List[Dict]:
+        """Songs by exactly this artist, in library order."""
+        code = self.artists.codes.get(artist)
+        if code is None or not self.artists.live[code]:
+            return []
+        order, bounds = self._grouping('artist')
+        return self._songs[order[bounds[code]:bounds[code + 1]]].tolist()
+
+    def songs_by_file_type_in_artist_order(self, file_type: str) -> List[Dict]:
+        """Songs of a file type ordered by artist name, then library order."""
+        code = self.file_types.codes.get(file_type)
+        if code is None or not self.file_types.live[code]:
+            return []
+        order, bounds = self._grouping('file_type')
+        rows = order[bounds[code]:bounds[code + 1]]
+        ranks = self._get_artist_ranks()[self._artist_codes[rows]]
+        return self._songs[rows[_stable_order(ranks, len(self.artists.names))]].tolist()
+
+    def top_artists(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return the (artist, song_count) pairs with the most songs."""
+        return list(islice(self._get_snapshot()['artist_counts'].items(), limit))
+
+    def get_totals(self) -> Dict:
+        """Return the same totals as LibraryStatistics.get_totals, from running counters."""
+        file_types = self.file_types
+        return library_totals(len(self._rows_by_path), self._total_size, self._total_duration, self._live_artists,
+                              {name: file_types.live[code] for name, code in file_types.codes.items()
+                               if file_types.live[code]})
+
+    def get_statistics(self) -> Dict:
+        """Return a copy of the same statistics dictionary as LibraryStatistics, computed from the columns."""
+        snapshot = self._get_snapshot()
+        return dict(snapshot, artist_counts=dict(snapshot['artist_counts']),
+                    file_type_counts=dict(snapshot['file_type_counts']))
+
+    def _get_snapshot(self) -> Dict:
+        """Return the cached statistics dictionary, recomputed after the library changed."""
+        if self._snapshot is None:
+            rows = self._row_count
+            total_size = int(self._sizes[:rows].sum())
+            total_duration = float(self._durations[:rows].sum())
+
+            artist_counts = np.bincount(self._artist_codes[:rows], minlength=len(self.artists.names))
+            artist_counts[REMOVED] = 0
+            present = np.flatnonzero(artist_counts)
+            counts = artist_counts[present]
+            # Most songs first, then artist name
+            ranking = present[np.lexsort((self._get_artist_ranks()[present], -counts))]
+            names = self.artists.names
+
+            type_counts = np.bincount(self._type_codes[:rows], minlength=len(self.file_types.names))
+            self._snapshot = {
+                'total_songs': len(self._rows_by_path),
+                'total_size_bytes': total_size,
+                'total_size_mb': round(total_size / (1024 * 1024), 2),
+                'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
+                'total_duration_seconds': round(max(total_duration, 0.0)),
+                'unique_artists': len(present),
+                'artist_counts': dict(zip([names[code] for code in ranking.tolist()],
+                                          artist_counts[ranking].tolist())),
+                'file_type_counts': {name: int(type_counts[code])
+                                     for name, code in self.file_types.codes.items() if type_counts[code]}
+            }
+        return self._snapshot
+
+    def _select(self, mask) -> List[Dict]:
+        """Return the songs of the rows selected by a boolean mask."""
+        return self._songs[:self._row_count][mask].tolist()
+
+    def _grouping(self, column: str):
+        """Return (row order, group bounds) for a code column; group `code` is order[bounds[code]:bounds[code + 1]].
+
+        A stable argsort keeps library order within each group. The result is
+        cached until the library changes.
+        """
+        grouping = self._groupings.get(column)
+        if grouping is None:
+            codes, categories = {
+                'artist': (self._artist_codes, self.artists),
+                'artist_key': (self._key_codes, self.artist_keys),
+                'file_type': (self._type_codes, self.file_types),
+            }[column]
+            codes = codes[:self._row_count]
+            bounds = np.zeros(len(categories.names) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(codes, minlength=len(categories.names)), out=bounds[1:])
+            grouping = self._groupings[column] = (_stable_order(codes, len(categories.names)), bounds.tolist())
+        return grouping
+
+    def _get_artist_ranks(self):
+        """Return each artist code's position in name order, recomputed only after new artists appear."""
+        if self._artist_ranks is None:
+            names = self.artists.names
+            ranks = np.empty(len(names), dtype=np.int64)
+            ranks[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names))
+            self._artist_ranks = ranks
+        return self._artist_ranks
+
+    @staticmethod
+    def _live_names(categories: _Categories) -> List[str]:
+        """Names that still have at least one song."""
+        return [name for name, code in categories.codes.items() if categories.live[code]]
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow every column to capacity rows, keeping the rows already stored."""
+        rows = self._row_count
+        columns = {
+            '_artist_codes': np.int32, '_key_codes': np.int32, '_type_codes': np.int32,
+            '_sizes': np.int64, '_durations': np.float64, '_songs': object,
+        }
+        for name, dtype in columns.items():
+            column = np.zeros(capacity, dtype=dtype) if dtype is not object else np.empty(capacity, dtype=object)
+            if rows:
+                column[:rows] = getattr(self, name)[:rows]
+            setattr(self, name, column)
+
+    def _compact(self) -> None:
+        """Drop removed rows, keeping the remaining rows in order."""
+        keep = np.flatnonzero(self._artist_codes[:self._row_count] != REMOVED)
+        for name in ('_artist_codes', '_key_codes', '_type_codes', '_sizes', '_durations', '_songs'):
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+            column[len(keep):self._row_count] = None if column.dtype == object else 0
+        self._row_count = len(keep)
+        self._removed_rows = 0
+        self._rows_by_path = {song['file_path']: row for row, song in enumerate(self._songs[:self._row_count])}
+
+    def _reset_caches(self) -> None:
+        """Forget the statistics snapshot and groupings after a change."""
+        self._snapshot = None
+        self._groupings: Dict[str, Tuple] = {}
+
+def _stable_order(values, distinct: int):
+    """Stable argsort of non-negative integers below distinct, narrowed to 16 bits when they fit."""
+    if distinct <= RADIX_SORT_LIMIT:
+        values = values.astype(np.uint16)
+    return np.argsort(values, kind='stable')
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Duplicate Finder
+Finds byte-identical files by size bucketing, then partial hashes, then full hashes of memory-mapped files
+"""
+
+import hashlib
+import mmap
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bytes hashed from each end of a file before a full hash is considered
+PARTIAL_HASH_BYTES = 64 * 1024
+
+# Full hashes are fed to hashlib in blocks this large; hashlib releases the GIL for big updates
+FULL_HASH_BLOCK_BYTES = 1024 * 1024
+
+DEFAULT_HASH_WORKERS = 4
+
+def _digest(file_path: str, partial: bool) -> Optional[bytes]:
+    """Hash the first and last PARTIAL_HASH_BYTES (partial) or the whole file; None if unreadable."""
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, 'rb') as audio_file:
+            try:
+                mapped = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files (truncated since the scan) cannot be mapped
+                return hasher.digest()
+            with mapped, memoryview(mapped) as view:
+                size = len(view)
+                if partial:
+                    hasher.update(view[:PARTIAL_HASH_BYTES])
+                    hasher.update(view[max(PARTIAL_HASH_BYTES, size - PARTIAL_HASH_BYTES):])
+                else:
+                    for start in range(0, size, FULL_HASH_BLOCK_BYTES):
+                        hasher.update(view[start:start + FULL_HASH_BLOCK_BYTES])
+    except OSError:
+        return None
+    return hasher.digest()
+
+class DuplicateFinder:
+    """Groups files with identical contents while reading as little as possible.
+
+    Files are first bucketed by size, so a file with a unique size is never
+    opened. Within a size bucket only the first and last PARTIAL_HASH_BYTES are
+    hashed; files whose partial hashes collide are confirmed with a full hash,
+    unless the partial hash already covered the whole file. Reads are memory
+    mapped and spread over a thread pool.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_HASH_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self.files_considered = 0
+        self.bytes_considered = 0
+        self.partial_hashes = 0
+        self.full_hashes = 0
+        self.bytes_hashed = 0
+        self.elapsed_seconds = 0.0
+
+    def find(self, files: Iterable[Tuple[str, int]]) -> List[List[str]]:
+        """Return groups of duplicate paths from (file_path, file_size) pairs, largest files first."""
+        start = time.perf_counter()
+        by_size: Dict[int, List[str]] = {}
+        for file_path, file_size in files:
+            by_size.setdefault(file_size, []).append(file_path)
+            self.files_considered += 1
+            self.bytes_considered += file_size
+
+        # Empty files waste no space and would all match each other, so they are left out
+        candidates = [(size, paths) for size, paths in by_size.items() if len(paths) > 1 and size > 0]
+        groups: List[Tuple[int, List[str]]] = []
+        if candidates:
+            executor = self._create_executor()
+            try:
+                partial_groups = self._group_by_hash(executor, candidates, partial=True)
+
+                # A partial hash of a small file already covered every byte
+                needs_full = []
+                for size, paths in partial_groups:
+                    if size <= 2 * PARTIAL_HASH_BYTES:
+                        groups.append((size, paths))
+                    else:
+                        needs_full.append((size, paths))
+                groups.extend(self._group_by_hash(executor, needs_full, partial=False))
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+        self.elapsed_seconds += time.perf_counter() - start
+        groups.sort(key=lambda group: (-group[0], group[1]))
+        return [sorted(paths) for _, paths in groups]
+
+    def get_statistics(self) -> Dict:
+        """Return how much was read compared with hashing every file in full."""
+        bytes_saved = self.bytes_considered - self.bytes_hashed
+        return {
+            'files_considered': self.files_considered,
+            'partial_hashes': self.partial_hashes,
+            'full_hashes': self.full_hashes,
+            'bytes_considered': self.bytes_considered,
+            'bytes_hashed': self.bytes_hashed,
+            'bytes_saved': bytes_saved,
+            'io_saved_percent': 100.0 * bytes_saved / self.bytes_considered if self.bytes_considered else 0.0,
+            'elapsed_seconds': self.elapsed_seconds
+        }
+
+    def _create_executor(self):
+        """Start the hashing threads; concurrent.futures is slow to import, so only when needed."""
+        if self.max_workers == 1:
+            return None
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dedupe")
+
+    def _group_by_hash(self, executor, buckets: List[Tuple[int, List[str]]],
+                       partial: bool) -> List[Tuple[int, List[str]]]:
+        """Split each size bucket by hash and keep the sub-groups with more than one file."""
+        jobs = [(size, path) for size, paths in buckets for path in paths]
+        paths = [path for _, path in jobs]
+        if executor is None:
+            digests = [_digest(path, partial) for path in paths]
+        else:
+            digests = list(executor.map(_digest, paths, [partial] * len(paths)))
+
+        by_digest: Dict[Tuple[int, bytes], List[str]] = {}
+        for (size, path), digest in zip(jobs, digests):
+            if digest is None:
+                continue
+            if partial:
+                self.partial_hashes += 1
+                self.bytes_hashed += min(size, 2 * PARTIAL_HASH_BYTES)
+            else:
+                self.full_hashes += 1
+                self.bytes_hashed += size
+            by_digest.setdefault((size, digest), []).append(path)
+        return [(size, group) for (size, _), group in by_digest.items() if len(group) > 1]
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+History Log
+Append-only JSON-lines log of play events with batched fsync and per-day compaction
+"""
+
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+ACTIVE_LOG_NAME = 'active.jsonl'
+COMPACTING_LOG_NAME = 'compacting.jsonl'
+SEGMENT_SUFFIX = '.jsonl'
+# Merged day segments are written under this suffix and renamed into place once complete
+TEMPORARY_SUFFIX = '.tmp'
+
+class _FlushRequest:
+    """Marker put on the queue to wait until everything before it is on disk."""
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.done = threading.Event()
+        # First write or compaction error since the previous request, if any
+        self.error: Optional[Exception] = None
+
+_STOP = object()
+
+class HistoryLog:
+    """Persist play events without blocking the caller.
+
+    append() only puts the event on a queue. A background writer thread drains
+    the queue in batches, writes them to active.jsonl and fsyncs once per batch.
+    Every compact_interval seconds (and on close) the active log is folded into
+    per-day segment files named YYYY-MM-DD.jsonl. Segments are never appended
+    to: each one is rewritten to a temporary file and swapped in with
+    os.replace, so a crash can neither tear a segment nor duplicate events.
+    A failed write (a full disk, say) drops that batch, counts it in
+    events_dropped and is kept in last_error; the writer carries on, and a
+    failed compaction is retried at the next one.
+    """
+
+    def __init__(self, log_directory: str, batch_size: int = 1024, flush_interval: float = 0.5,
+                 compact_interval: float = 300.0):
+        self.log_directory = str(log_directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.events_written = 0
+        self.events_dropped = 0
+        self.last_error: Optional[Exception] = None
+        self._error_since_request: Optional[Exception] = None
+
+        os.makedirs(self.log_directory, exist_ok=True)
+        self._active_path = os.path.join(self.log_directory, ACTIVE_LOG_NAME)
+        self._compacting_path = os.path.join(self.log_directory, COMPACTING_LOG_NAME)
+
+        # A compaction interrupted by a crash is redone or finished before anything new is written
+        if os.path.exists(self._compacting_path):
+            self._compact_file(self._compacting_path)
+        else:
+            self._install_segments()
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        _drop_torn_tail(self._active_path)
+        self._active_file = open(self._active_path, 'ab')
+        self._last_compaction = time.monotonic()
+        self._writer = threading.Thread(target=self._run_writer, name="history-log-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, event: Dict) -> None:
+        """Queue an event for writing; never waits on disk."""
+        self._queue.put(event)
+
+    def record_play(self, song: Dict, timestamp: Optional[float] = None) -> None:
+        """Queue a play event for a song."""
+        self.append({
+            'timestamp': timestamp if timestamp is not None else time.time(),
+            'title': song['title'],
+            'artist': song['artist'],
+            'file_path': song.get('file_path')
+        })
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event queued so far has been handled.
+
+        Returns False on timeout, or if a write failed since the last flush (see last_error).
+        """
+        return self._wait_for(_FlushRequest(), timeout)
+
+    def compact(self, timeout: Optional[float] = None) -> bool:
+        """Ask the writer thread to fold the active log into day segments and wait for it."""
+        return self._wait_for(_FlushRequest(compact=True), timeout)
+
+    def _wait_for(self, request: _FlushRequest, timeout: Optional[float]) -> bool:
+        """Queue a request and wait for the writer to handle it; False on timeout or error."""
+        if not self._writer.is_alive():
+            return False
+        self._queue.put(request)
+        return request.done.wait(timeout) and request.error is None
+
+    def close(self) -> None:
+        """Write everything still queued, compact, and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    @classmethod
+    def load(cls, log_directory: str, limit: Optional[int] = None) -> List[Dict]:
+        """Load logged events in chronological order, optionally only the newest `limit`."""
+        if not os.path.isdir(log_directory):
+            return []
+
+        segment_names = sorted(name for name in os.listdir(log_directory)
+                               if name.endswith(SEGMENT_SUFFIX)
+                               and name not in (ACTIVE_LOG_NAME, COMPACTING_LOG_NAME))
+        # Newest data last: day segments, then an unfinished compaction, then the active log
+        paths = [os.path.join(log_directory, name) for name in segment_names]
+        paths += [os.path.join(log_directory, COMPACTING_LOG_NAME),
+                  os.path.join(log_directory, ACTIVE_LOG_NAME)]
+
+        # Read newest files first so a limited load can stop early
+        chunks = []
+        loaded = 0
+        for path in reversed(paths):
+            events = cls._read_events(path)
+            chunks.append(events)
+            loaded += len(events)
+            if limit is not None and loaded >= limit:
+                break
+
+        events = [event for chunk in reversed(chunks) for event in chunk]
+        events.sort(key=lambda event: event.get('timestamp', 0))
+        if limit is not None:
+            events = events[-limit:] if limit else []
+        return events
+
+    @staticmethod
+    def _read_events(path: str) -> List[Dict]:
+        """Parse one JSON-lines file through a memory map."""
+        try:
+            with open(path, 'rb') as log_file:
+                if os.fstat(log_file.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # Ignore a trailing partial line left by an interrupted write
+                    end = mapped.rfind(b'\n') + 1
+                    data = mapped[:end]
+        except OSError:
+            return []
+
+        if not data:
+            return []
+        try:
+            # One json.loads call for the whole file is much faster than one per line
+            events = json.loads(b'[' + data.rstrip(b'\n').replace(b'\n', b',') + b']')
+        except ValueError:
+            # Some line is malformed (e.g. torn by a crash before the next append); skip just that line
+            events = []
+            for line in data.splitlines():
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+        return [event for event in events if isinstance(event, dict)]
+
+    def _run_writer(self) -> None:
+        """Drain the queue in batches until asked to stop."""
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            batch = []
+            requests = []
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, _FlushRequest):
+                    requests.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except (OSError, TypeError, ValueError) as error:
+                    # A full disk, or an event json cannot encode; either way the writer keeps going
+                    self.events_dropped += len(batch)
+                    self._record_error(error)
+
+            compact_due = time.monotonic() - self._last_compaction >= self.compact_interval
+            if stopping or compact_due or any(request.compact for request in requests):
+                try:
+                    self._rotate_and_compact()
+                except OSError as error:
+                    self._record_error(error)
+
+            # Waiters are always released, with whatever went wrong since the previous request
+            for request in requests:
+                request.error = self._error_since_request
+                request.done.set()
+            if requests:
+                self._error_since_request = None
+
+        if not self._active_file.closed:
+            self._active_file.close()
+
+    def _record_error(self, error: Exception) -> None:
+        """Remember a write or compaction failure for flush() and last_error."""
+        self.last_error = error
+        if self._error_since_request is None:
+            self._error_since_request = error
+
+    def _write_batch(self, batch: List[Dict]) -> None:
+        """Append a batch of events and fsync once; on failure the log is cut back to where it was."""
+        self._reopen_active_file()
+        data = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in batch)
+        offset = self._active_file.tell()
+        try:
+            self._active_file.write(data.encode('utf-8'))
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+        except OSError:
+            # Drop any partial write so the next batch does not start in the middle of a line
+            try:
+                self._active_file.close()
+            except OSError:
+                pass
+            try:
+                os.truncate(self._active_path, offset)
+            except OSError:
+                pass
+            raise
+        self.events_written += len(batch)
+
+    def _reopen_active_file(self) -> None:
+        """Open the active log again after a failure left it closed."""
+        if self._active_file.closed:
+            _drop_torn_tail(self._active_path)
+            self._active_file = open(self._active_path, 'ab')
+
+    def _rotate_and_compact(self) -> None:
+        """Swap in a fresh active log and fold the old one into day segments."""
+        self._last_compaction = time.monotonic()
+        # A compaction that failed earlier is finished first, so its log is never overwritten
+        if os.path.exists(self._compacting_path):
+            self._compact_file(self._compacting_path)
+        self._reopen_active_file()
+        if self._active_file.tell() == 0:
+            return
+
+        self._active_file.close()
+        os.replace(self._active_path, self._compacting_path)
+        self._active_file = open(self._active_path, 'ab')
+        self._compact_file(self._compacting_path)
+
+    def _compact_file(self, path: str) -> None:
+        """Merge the events of a log file into their day segments, then delete it.
+
+        Each merged segment (old lines plus new events) is written in full to a
+        temporary file first. Deleting the log file is the commit point: a crash
+        before it leaves every segment untouched and the next start redoes the
+        compaction; a crash after it leaves complete temporary files that the
+        next start renames into place.
+        """
+        # Leftovers from a compaction that never reached its commit point may be incomplete
+        for temporary_path in self._temporary_segments():
+            os.remove(temporary_path)
+
+        events_by_day: Dict[str, List[Dict]] = {}
+        for event in self._read_events(path):
+            day = time.strftime('%Y-%m-%d', time.localtime(event.get('timestamp', 0)))
+            events_by_day.setdefault(day, []).append(event)
+
+        for day, events in events_by_day.items():
+            segment_path = os.path.join(self.log_directory, day + SEGMENT_SUFFIX)
+            data = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+            with open(segment_path + TEMPORARY_SUFFIX, 'wb') as segment:
+                segment.write(_complete_lines(segment_path))
+                segment.write(data.encode('utf-8'))
+                segment.flush()
+                os.fsync(segment.fileno())
+        _fsync_directory(self.log_directory)
+
+        os.remove(path)
+        _fsync_directory(self.log_directory)
+        self._install_segments()
+
+    def _install_segments(self) -> None:
+        """Move the merged segments of a committed compaction into place."""
+        temporary_paths = self._temporary_segments()
+        for temporary_path in temporary_paths:
+            os.replace(temporary_path, temporary_path[:-len(TEMPORARY_SUFFIX)])
+        if temporary_paths:
+            _fsync_directory(self.log_directory)
+
+    def _temporary_segments(self) -> List[str]:
+        """Paths of merged segments still waiting under their temporary name."""
+        return [os.path.join(self.log_directory, name) for name in os.listdir(self.log_directory)
+                if name.endswith(SEGMENT_SUFFIX + TEMPORARY_SUFFIX)]
+
+def _complete_lines(path: str) -> bytes:
+    """Return a log file's contents up to its last newline (nothing if it does not exist)."""
+    try:
+        with open(path, 'rb') as log_file:
+            data = log_file.read()
+    except FileNotFoundError:
+        return b''
+    return data[:data.rfind(b'\n') + 1]
+
+def _drop_torn_tail(path: str) -> None:
+    """Cut off a partial last line left by a crash, so the next append starts on a fresh line."""
+    try:
+        with open(path, 'r+b') as log_file:
+            if os.fstat(log_file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[-1:] == b'\n':
+                    return
+                end = mapped.rfind(b'\n') + 1
+            log_file.truncate(end)
+    except FileNotFoundError:
+        pass
+
+def _fsync_directory(path: str) -> None:
+    """Make renames and deletions in a directory durable (not supported on Windows)."""
+    try:
+        directory_fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_fd)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Persistent Library Index
+SQLite snapshot of the song library used for fast, incremental startup
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from song_record import SongRecord
+
+# Bump when the table layout changes so stale index files are rebuilt
+INDEX_SCHEMA_VERSION = 2
+
+class LibraryIndex:
+    """On-disk index of songs keyed by file path, plus the mtime of every scanned directory."""
+
+    def __init__(self, index_path: str):
+        self.index_path = str(index_path)
+        self.connection: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        """Open (or create) the index database, dropping tables left by an older schema."""
+        if self.connection is not None:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.index_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._drop_outdated_tables()
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS songs (
+                file_path TEXT PRIMARY KEY,
+                directory TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                file_type TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                album TEXT,
+                track_number INTEGER,
+                duration REAL,
+                bitrate INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL
+            );
+        """)
+
+    def _drop_outdated_tables(self) -> None:
+        """Drop every table if the index was written with a different schema version."""
+        try:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            return  # new database
+        if row is None or row[0] != str(INDEX_SCHEMA_VERSION):
+            self.connection.executescript(
+                "DROP TABLE IF EXISTS songs; DROP TABLE IF EXISTS directories; DROP TABLE IF EXISTS meta;")
+
+    def close(self) -> None:
+        """Close the index database."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def is_valid_for(self, music_directory: str) -> bool:
+        """Check whether the index was built for this music directory and schema."""
+        self.open()
+        rows = dict(self.connection.execute("SELECT key, value FROM meta"))
+        return (rows.get('root') == os.path.abspath(music_directory) and
+                rows.get('schema_version') == str(INDEX_SCHEMA_VERSION))
+
+    def load_songs(self) -> List[Tuple[SongRecord, float]]:
+        """Load every indexed song as (song_info, mtime), ordered by file path."""
+        self.open()
+        cursor = self.connection.execute(
+            "SELECT title, artist, file_type, file_path, file_size, mtime, album, track_number, duration, bitrate "
+            "FROM songs ORDER BY file_path")
+        return [(SongRecord(title, artist, file_type, file_path, file_size, album, track_number, duration, bitrate),
+                 mtime)
+                for title, artist, file_type, file_path, file_size, mtime, album, track_number, duration, bitrate
+                in cursor]
+
+    def load_directories(self) -> Dict[str, float]:
+        """Load the recorded mtime of every scanned directory."""
+        self.open()
+        return dict(self.connection.execute("SELECT path, mtime FROM directories"))
+
+    def rebuild(self, music_directory: str, songs: Iterable[Tuple[Dict, float]],
+                directory_mtimes: Dict[str, float]) -> None:
+        """Replace the whole index with a fresh snapshot."""
+        self.open()
+        with self.connection:
+            self.connection.execute("DELETE FROM songs")
+            self.connection.execute("DELETE FROM directories")
+            self.connection.execute("DELETE FROM meta")
+            self.connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [('root', os.path.abspath(music_directory)), ('schema_version', str(INDEX_SCHEMA_VERSION))])
+            self.connection.executemany(
+                "INSERT INTO songs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._song_row(song, mtime) for song, mtime in songs))
+            self.connection.executemany(
+                "INSERT INTO directories (path, mtime) VALUES (?, ?)",
+                directory_mtimes.items())
+
+    def apply_changes(self, upserted: Iterable[Tuple[Dict, float]], removed_paths: Iterable[str],
+                      directory_mtimes: Dict[str, float], removed_directories: Iterable[str]) -> None:
+        """Write only the entries that changed since the index was loaded."""
+        self.open()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO songs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._song_row(song, mtime) for song, mtime in upserted))
+            self.connection.executemany(
+                "DELETE FROM songs WHERE file_path = ?",
+                ((path,) for path in removed_paths))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO directories (path, mtime) VALUES (?, ?)",
+                directory_mtimes.items())
+            self.connection.executemany(
+                "DELETE FROM directories WHERE path = ?",
+                ((path,) for path in removed_directories))
+
+    @staticmethod
+    def _song_row(song: Dict, mtime: float) -> Tuple:
+        """Convert a song dictionary into a songs table row."""
+        return (song['file_path'], os.path.dirname(song['file_path']), song['filename'],
+                song['title'], song['artist'], song['file_type'], song['file_size'], mtime,
+                song.get('album'), song.get('track_number'), song.get('duration'), song.get('bitrate'))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Library Scanner
+Recursive directory walker built on os.scandir with a bounded thread pool
+"""
+
+import errno
+import os
+import stat
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Default number of threads used to walk directories in parallel
+DEFAULT_SCAN_WORKERS = 8
+
+# Errors meaning a path is really gone; anything else (permissions, a flaky network share) may be temporary
+MISSING_PATH_ERRORS = (errno.ENOENT, errno.ENOTDIR)
+
+class LibraryScanner:
+    """Walk a music directory tree and collect audio files with their stat results."""
+
+    def __init__(self, extensions: Set[str], max_workers: int = DEFAULT_SCAN_WORKERS):
+        self.extensions = extensions
+        self.max_workers = max(1, max_workers)
+        self.directory_mtimes: Dict[str, float] = {}
+        self.files_scanned = 0
+        self.directories_scanned = 0
+        self.elapsed_seconds = 0.0
+
+    def scan(self, root: str) -> List[Tuple[str, os.stat_result]]:
+        """Recursively scan root and return (file_path, stat_result) pairs sorted by path."""
+        self.directory_mtimes = {}
+        self.files_scanned = 0
+        self.directories_scanned = 0
+        start = time.perf_counter()
+
+        if self.max_workers == 1:
+            found = self._scan_serial(str(root))
+        else:
+            found = self._scan_parallel(str(root))
+
+        # Sort so the result does not depend on thread scheduling
+        found.sort(key=lambda item: item[0])
+        self.files_scanned = len(found)
+        self.elapsed_seconds = time.perf_counter() - start
+        return found
+
+    def scan_directory(self, path: str) -> Tuple[List[Tuple[str, os.stat_result]], List[str], Optional[float]]:
+        """Scan a single directory without recursing; mtime is None if it no longer exists.
+        
+        Raises OSError if the directory exists but cannot be read right now.
+        """
+        try:
+            return self._list_directory(str(path))
+        except OSError as error:
+            if error.errno in MISSING_PATH_ERRORS:
+                return [], [], None
+            raise
+
+    def stat_directories(self, paths: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Return the current mtime of each directory (None if it no longer exists).
+        
+        Directories that exist but cannot be stat'ed right now are left out.
+        """
+        paths = list(paths)
+        if self.max_workers == 1 or len(paths) < 2:
+            return self._stat_chunk(paths)
+
+        # One task per chunk keeps thread hand-off cheap next to a single stat call
+        chunk_size = -(-len(paths) // self.max_workers)
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        mtimes: Dict[str, Optional[float]] = {}
+        # Imported here: concurrent.futures pulls in logging and is only needed for large libraries
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk_mtimes in executor.map(self._stat_chunk, chunks):
+                mtimes.update(chunk_mtimes)
+        return mtimes
+
+    def get_files_per_second(self) -> float:
+        """Return the throughput of the last scan."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.files_scanned / self.elapsed_seconds
+
+    def _scan_serial(self, root: str) -> List[Tuple[str, os.stat_result]]:
+        """Walk the tree on the calling thread."""
+        found = []
+        pending = [root]
+        while pending:
+            path = pending.pop()
+            files, subdirs, mtime = self._scan_directory(path)
+            self._record_directory(path, mtime)
+            found.extend(files)
+            pending.extend(subdirs)
+        return found
+
+    def _scan_parallel(self, root: str) -> List[Tuple[str, os.stat_result]]:
+        """Walk the tree by submitting one task per directory to a thread pool."""
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        found = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {executor.submit(self._scan_directory, root): root}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    files, subdirs, mtime = future.result()
+                    self._record_directory(path, mtime)
+                    found.extend(files)
+                    for subdir in subdirs:
+                        running[executor.submit(self._scan_directory, subdir)] = subdir
+        return found
+
+    def _record_directory(self, path: str, mtime) -> None:
+        """Remember the mtime of a scanned directory."""
+        if mtime is not None:
+            self.directory_mtimes[path] = mtime
+            self.directories_scanned += 1
+
+    @classmethod
+    def _stat_chunk(cls, paths: List[str]) -> Dict[str, Optional[float]]:
+        """Stat a batch of directories on one worker thread, leaving out unreadable ones."""
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = cls._directory_mtime(path)
+            except OSError:
+                # Not known to be gone, so no verdict either way until it can be read again
+                continue
+        return mtimes
+
+    @staticmethod
+    def _directory_mtime(path: str) -> Optional[float]:
+        """Stat a directory, returning None if it is gone or not a directory (other errors are raised)."""
+        try:
+            stat_result = os.stat(path)
+        except OSError as error:
+            if error.errno in MISSING_PATH_ERRORS:
+                return None
+            raise
+        return stat_result.st_mtime if stat.S_ISDIR(stat_result.st_mode) else None
+
+    def _scan_directory(self, path: str):
+        """List one directory while walking a tree; an unreadable directory is skipped (mtime None)."""
+        try:
+            return self._list_directory(path)
+        except OSError:
+            return [], [], None
+
+    def _list_directory(self, path: str):
+        """List one directory, reusing the stat results cached on each DirEntry."""
+        files = []
+        subdirs = []
+        mtime = os.stat(path).st_mtime
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        extension = os.path.splitext(entry.name)[1].lower()
+                        if extension in self.extensions:
+                            files.append((entry.path, entry.stat()))
+                except OSError:
+                    # Entry vanished or is unreadable; skip it
+                    continue
+
+        return files, subdirs, mtime
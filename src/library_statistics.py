@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Library Statistics
+Running totals for the music library, updated as songs are added or removed
+"""
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+class LibraryStatistics:
+    """Incrementally maintained song counts, sizes and artist ranking.
+
+    Artists are kept in buckets by song count, so adding or removing a song
+    moves one artist between two buckets in O(1). The ranking (most songs
+    first, then artist name) is only put together when it is asked for; there
+    are at most about sqrt(2 * total_songs) distinct counts to order.
+    """
+
+    def __init__(self):
+        self.total_songs = 0
+        self.total_size = 0
+        self.total_duration = 0.0
+        self.artist_counts: Dict[str, int] = {}
+        self.file_type_counts: Dict[str, int] = {}
+
+        # Artists grouped by their song count
+        self._artists_by_count: Dict[int, Set[str]] = {}
+        self._snapshot: Optional[Dict] = None
+
+    def add_song(self, song: Dict) -> None:
+        """Account for a song added to the library."""
+        self.total_songs += 1
+        self.total_size += song['file_size']
+        self.total_duration += song.get('duration') or 0.0
+        self._change_artist_count(song['artist'], 1)
+        file_type = song['file_type']
+        self.file_type_counts[file_type] = self.file_type_counts.get(file_type, 0) + 1
+        self._snapshot = None
+
+    def remove_song(self, song: Dict) -> None:
+        """Account for a song removed from the library."""
+        self.total_songs -= 1
+        self.total_size -= song['file_size']
+        self.total_duration -= song.get('duration') or 0.0
+        self._change_artist_count(song['artist'], -1)
+        file_type = song['file_type']
+        self.file_type_counts[file_type] -= 1
+        if not self.file_type_counts[file_type]:
+            del self.file_type_counts[file_type]
+        self._snapshot = None
+
+    def top_artists(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return the (artist, song_count) pairs with the most songs."""
+        ranking = []
+        for count in sorted(self._artists_by_count, reverse=True):
+            if len(ranking) >= limit:
+                break
+            # Only the first names of a large bucket (typically the one-song artists) are needed
+            ranking.extend((artist, count)
+                           for artist in heapq.nsmallest(limit - len(ranking), self._artists_by_count[count]))
+        return ranking
+
+    def get_totals(self) -> Dict:
+        """Return the song, size, duration, artist and file type totals in O(1), without the artist ranking."""
+        return library_totals(self.total_songs, self.total_size, self.total_duration,
+                              len(self.artist_counts), self.file_type_counts)
+
+    def get_statistics(self) -> Dict:
+        """Return a copy of the full statistics dictionary, including every artist's count in ranking order.
+
+        The ranking is rebuilt (O(A log A) for A artists) on the first call after
+        the library changed, and every call copies it; use get_totals() and
+        top_artists() when they are enough.
+        """
+        if self._snapshot is None:
+            self._snapshot = self.get_totals()
+            self._snapshot['artist_counts'] = {artist: count
+                                               for count in sorted(self._artists_by_count, reverse=True)
+                                               for artist in sorted(self._artists_by_count[count])}
+        # Callers may modify what they get back without corrupting the cached snapshot
+        snapshot = self._snapshot
+        return dict(snapshot, artist_counts=dict(snapshot['artist_counts']),
+                    file_type_counts=dict(snapshot['file_type_counts']))
+
+    def _change_artist_count(self, artist: str, delta: int) -> None:
+        """Update an artist's song count and move it to the matching bucket."""
+        old_count = self.artist_counts.get(artist, 0)
+        new_count = old_count + delta
+
+        if old_count:
+            bucket = self._artists_by_count[old_count]
+            bucket.discard(artist)
+            if not bucket:
+                del self._artists_by_count[old_count]
+
+        if new_count:
+            self.artist_counts[artist] = new_count
+            self._artists_by_count.setdefault(new_count, set()).add(artist)
+        else:
+            self.artist_counts.pop(artist, None)
+
+def library_totals(total_songs: int, total_size: int, total_duration: float, unique_artists: int,
+                   file_type_counts: Dict[str, int]) -> Dict:
+    """Build the totals part of the statistics dictionary (there are only a handful of file types)."""
+    return {
+        'total_songs': total_songs,
+        'total_size_bytes': total_size,
+        'total_size_mb': round(total_size / (1024 * 1024), 2),
+        'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
+        'total_duration_seconds': round(max(total_duration, 0.0)),
+        'unique_artists': unique_artists,
+        'file_type_counts': dict(file_type_counts)
+    }
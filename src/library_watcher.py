@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Library Watcher
+Keeps the song library in sync with the music directory using inotify, or directory-mtime polling
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+WATCH_BACKENDS = ('auto', 'inotify', 'polling')
+
+# Quiet time after the last event before a burst of changes is handed over
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# IN_MODIFY is left out on purpose: IN_CLOSE_WRITE reports a finished write once instead of per chunk
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+class Inotify:
+    """Minimal inotify binding through ctypes: one watch per directory, events as (path, mask)."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        # ctypes is only needed for this backend, so it is imported on first use. CDLL(None) gives
+        # the symbols already loaded into the process, libc included, without the slow ctypes.util lookup
+        import ctypes
+
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._get_errno = ctypes.get_errno
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = self._get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._paths_by_wd: Dict[int, str] = {}
+
+    def add_watch(self, path: str) -> bool:
+        """Watch a directory; returns False if it cannot be watched (gone, or the watch limit was hit)."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._paths_by_wd[wd] = path
+        return True
+
+    def read_events(self, timeout: float) -> List[Tuple[str, int]]:
+        """Wait up to timeout seconds and return the (path, mask) of every pending event."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            directory = self._paths_by_wd.get(wd)
+            if mask & IN_IGNORED:
+                self._paths_by_wd.pop(wd, None)
+            elif mask & IN_Q_OVERFLOW:
+                events.append(('', mask))
+            elif directory is not None:
+                events.append((os.path.join(directory, os.fsdecode(name)) if name else directory, mask))
+        return events
+
+    def close(self) -> None:
+        """Release the inotify descriptor and every watch."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class LibraryWatcher:
+    """Watches the music directory on a background thread and collects changed paths.
+
+    Changes are debounced: paths gather until no event arrived for `debounce`
+    seconds, so copying an album in becomes a single update. The library itself
+    is only modified by apply_pending(), which the caller runs on its own thread
+    (the menu loop), so nothing mutates songs while a report is iterating them.
+    inotify reports exact paths, so updates cost O(changed paths); the polling
+    fallback only learns which directories changed and rescans those. After an
+    inotify queue overflow every known directory is stat'ed and the changed ones
+    are rescanned.
+    """
+
+    def __init__(self, music_manager, backend: str = 'auto', debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 on_change: Optional[Callable[[int, int], None]] = None):
+        if backend not in WATCH_BACKENDS:
+            raise ValueError(f"Unknown watch backend {backend!r}; choose from {', '.join(WATCH_BACKENDS)}")
+        self.music_manager = music_manager
+        self.requested_backend = backend
+        self.backend: Optional[str] = None
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[Inotify] = None
+
+        # Collected by the watcher thread; handed over once the burst has settled
+        self._dirty_paths: Set[str] = set()
+        self._dirty_directories: Set[str] = set()
+        self._dirty_rescan = False
+        self._last_event = 0.0
+        self._ready_paths: Set[str] = set()
+        self._ready_directories: Set[str] = set()
+        self._ready_rescan = False
+
+    def start(self) -> str:
+        """Start watching and return the backend in use ('inotify' or 'polling')."""
+        if self._thread is not None:
+            return self.backend
+        self._stop_event.clear()
+
+        if self.requested_backend in ('auto', 'inotify'):
+            try:
+                self._inotify = Inotify()
+                self._watch_tree(self._known_directories())
+                self.backend = 'inotify'
+            except (OSError, AttributeError):
+                if self.requested_backend == 'inotify':
+                    raise
+                self._inotify = None
+        if self._inotify is None:
+            self.backend = 'polling'
+
+        target = self._run_inotify if self._inotify is not None else self._run_polling
+        self._thread = threading.Thread(target=target, name="library-watcher", daemon=True)
+        self._thread.start()
+        return self.backend
+
+    def stop(self) -> None:
+        """Stop the watcher thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def is_running(self) -> bool:
+        """Check whether the watcher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def has_pending(self) -> bool:
+        """Check whether settled changes are waiting for apply_pending()."""
+        return self._ready_event.is_set()
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> bool:
+        """Block until settled changes are waiting; returns False on timeout."""
+        return self._ready_event.wait(timeout)
+
+    def apply_pending(self) -> Tuple[int, int]:
+        """Apply settled changes to the library; returns (added_or_updated, removed)."""
+        if not self._ready_event.is_set():
+            return 0, 0
+        with self._lock:
+            paths, directories, rescan = self._ready_paths, self._ready_directories, self._ready_rescan
+            self._ready_paths, self._ready_directories, self._ready_rescan = set(), set(), False
+            self._ready_event.clear()
+
+            # Held while the library changes so the polling thread never reads a half-updated state
+            added, removed = (0, 0)
+            if rescan or directories:
+                # Polling names the changed directories; after an overflow all of them are checked
+                added, removed = self.music_manager.refresh_changed_directories(None if rescan else directories)
+            if paths:
+                path_added, path_removed = self.music_manager.apply_path_changes(paths)
+                added += path_added
+                removed += path_removed
+
+        if (added or removed) and self.on_change is not None:
+            self.on_change(added, removed)
+        return added, removed
+
+    def _known_directories(self) -> List[str]:
+        """Directories the library was loaded from (the music directory itself when empty)."""
+        with self._lock:
+            directories = list(self.music_manager.get_directory_mtimes())
+        return directories or [str(self.music_manager.music_directory)]
+
+    def _watch_tree(self, roots: List[str]) -> None:
+        """Add a watch to each directory in roots and to every directory below them."""
+        stack = list(roots)
+        while stack:
+            directory = stack.pop()
+            if not self._inotify.add_watch(directory):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    stack.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+            except OSError:
+                pass
+
+    def _mark_dirty(self, paths: List[str], rescan: bool = False, directories: Iterable[str] = ()) -> None:
+        """Record changed paths, or directories to rescan, from the watcher thread."""
+        with self._lock:
+            self._dirty_paths.update(paths)
+            self._dirty_directories.update(directories)
+            self._dirty_rescan = self._dirty_rescan or rescan
+            self._last_event = time.monotonic()
+
+    def _hand_over_if_settled(self) -> None:
+        """Move collected changes to the ready set once no event arrived for the debounce period."""
+        with self._lock:
+            if not (self._dirty_paths or self._dirty_directories or self._dirty_rescan):
+                return
+            if time.monotonic() - self._last_event < self.debounce:
+                return
+            self._ready_paths |= self._dirty_paths
+            self._ready_directories |= self._dirty_directories
+            self._ready_rescan = self._ready_rescan or self._dirty_rescan
+            self._dirty_paths = set()
+            self._dirty_directories = set()
+            self._dirty_rescan = False
+            self._ready_event.set()
+
+    def _run_inotify(self) -> None:
+        """Watcher thread for the inotify backend."""
+        wait = min(self.debounce, 0.1) or 0.1
+        while not self._stop_event.is_set():
+            changed = []
+            new_directories = []
+            rescan = False
+            for path, mask in self._inotify.read_events(wait):
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost; fall back to comparing directory mtimes
+                    rescan = True
+                    continue
+                changed.append(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    new_directories.append(path)
+            if new_directories:
+                # Files created before the watch existed are found when the directory itself is scanned
+                self._watch_tree(new_directories)
+            if changed or rescan:
+                self._mark_dirty(changed, rescan)
+            self._hand_over_if_settled()
+
+    def _run_polling(self) -> None:
+        """Watcher thread for the polling backend: compare directory mtimes every poll_interval."""
+        previous: Dict[str, Optional[float]] = {}
+        while not self._stop_event.wait(self.poll_interval):
+            with self._lock:
+                known = self.music_manager.get_directory_mtimes()
+            current = {directory: _directory_mtime(directory) for directory in known}
+            if current != previous:
+                previous = current
+                changed = [directory for directory, mtime in current.items() if mtime != known[directory]]
+                if changed:
+                    self._mark_dirty([], directories=changed)
+            self._hand_over_if_settled()
+
+def _directory_mtime(path: str) -> Optional[float]:
+    """Return a directory's mtime, or None if it no longer exists."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
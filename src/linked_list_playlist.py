@@ -4,28 +4,99 @@ Linked List Playlist Implementation
 Week 4: Linked Lists where nodes are songs
 """
 
-from typing import Optional, List, Dict
+import functools
+import os
+import random
+import threading
+from typing import Callable, Optional, List, Dict, Iterable
 from Lists_and_Tuples import MusicPlaylistManager
+from search_index import SubstringIndex
+from order_statistic_tree import OrderStatisticTree
+from song_record import SongRecord
+from playlist_store import (PLAYLIST_FORMATS, list_playlist_files, playlist_filename,
+                            read_playlist_file, write_playlist_file)
 
 class SongNode:
     """Node class representing a song in the linked list playlist."""
     
+    __slots__ = ('song_data', 'next', 'previous',
+                 'tree_left', 'tree_right', 'tree_parent', 'tree_priority', 'tree_count')
+    
     def __init__(self, song_data: Dict):
         self.song_data = song_data
         self.next: Optional[SongNode] = None
         self.previous: Optional[SongNode] = None
+        
+        # Fields managed by the playlist's OrderStatisticTree
+        self.tree_left: Optional[SongNode] = None
+        self.tree_right: Optional[SongNode] = None
+        self.tree_parent: Optional[SongNode] = None
+        self.tree_priority = 0.0
+        self.tree_count = 1
     
     def __str__(self) -> str:
         return f"{self.song_data['title']} - {self.song_data['artist']}"
 
+# Observers receive (event, message) for every playlist change, e.g. ('song_added', 'Added: ...')
+PlaylistObserver = Callable[[str, str], None]
+
+def print_playlist_event(event: str, message: str) -> None:
+    """Default observer: echo playlist events to the terminal."""
+    print(message)
+
+def _synchronized(method):
+    """Run a playlist method while holding the playlist's lock."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked
+
 class LinkedListPlaylist:
     """Doubly linked list implementation for a music playlist."""
     
-    def __init__(self):
+    def __init__(self, observers: Optional[Iterable[PlaylistObserver]] = None):
+        # Pass observers=[] for a silent playlist
+        self.observers: List[PlaylistObserver] = (
+            [print_playlist_event] if observers is None else list(observers))
         self.head: Optional[SongNode] = None
         self.tail: Optional[SongNode] = None
         self.current_node: Optional[SongNode] = None
         self.size = 0
+        # Held by every public method that reads or changes the chain; the background playback
+        # engine walks the playlist while the menu edits it
+        self.lock = threading.RLock()
+        # Built on the first search so bulk-loaded playlists don't pay for it up front
+        self._search_index: Optional[SubstringIndex] = None
+        
+        # Lookup maps from normalized title / file path to the nodes holding that song
+        self._nodes_by_title: Dict[str, Dict[SongNode, None]] = {}
+        self._nodes_by_path: Dict[str, Dict[SongNode, None]] = {}
+        
+        # Positions of the nodes, for O(log n) indexed access
+        self._positions = OrderStatisticTree()
+    
+    @classmethod
+    def from_iterable(cls, songs: Iterable[Dict],
+                      observers: Optional[Iterable[PlaylistObserver]] = None) -> 'LinkedListPlaylist':
+        """Build a playlist from songs in one pass, without per-song events."""
+        playlist = cls(observers)
+        playlist._append_songs(songs)
+        return playlist
+    
+    def add_observer(self, observer: PlaylistObserver) -> None:
+        """Register a callback for playlist events."""
+        self.observers.append(observer)
+    
+    def remove_observer(self, observer: PlaylistObserver) -> None:
+        """Unregister a playlist event callback."""
+        if observer in self.observers:
+            self.observers.remove(observer)
+    
+    def _emit(self, event: str, message: str) -> None:
+        """Send an event to every observer."""
+        for observer in self.observers:
+            observer(event, message)
     
     def is_empty(self) -> bool:
         """Check if the playlist is empty."""
@@ -35,6 +106,7 @@ class LinkedListPlaylist:
         """Get the number of songs in the playlist."""
         return self.size
     
+    @_synchronized
     def add_song_at_end(self, song_data: Dict) -> None:
         """Add a song at the end of the playlist."""
         new_node = SongNode(song_data)
@@ -51,8 +123,10 @@ class LinkedListPlaylist:
             self.tail = new_node
         
         self.size += 1
-        print(f"Added: {new_node}")
+        self._index_node(new_node, self.size - 1)
+        self._emit('song_added', f"Added: {new_node}")
     
+    @_synchronized
     def add_song_at_beginning(self, song_data: Dict) -> None:
         """Add a song at the beginning of the playlist."""
         new_node = SongNode(song_data)
@@ -69,158 +143,233 @@ class LinkedListPlaylist:
             self.head = new_node
         
         self.size += 1
-        print(f"Added at beginning: {new_node}")
+        self._index_node(new_node, 0)
+        self._emit('song_added', f"Added at beginning: {new_node}")
     
+    @_synchronized
     def insert_song_after(self, target_song_title: str, song_data: Dict) -> bool:
         """Insert a song after a specific song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty. Cannot insert after specific song.")
+            self._emit('warning', "Playlist is empty. Cannot insert after specific song.")
             return False
         
-        current = self.head
-        while current:
-            if current.song_data['title'].lower() == target_song_title.lower():
-                new_node = SongNode(song_data)
-                
-                # Insert after current node
-                new_node.next = current.next
-                new_node.previous = current
-                
-                if current.next:
-                    current.next.previous = new_node
-                else:
-                    # Inserting at end
-                    self.tail = new_node
-                
-                current.next = new_node
-                self.size += 1
-                print(f"Inserted after '{target_song_title}': {new_node}")
-                return True
-            
-            current = current.next
+        current = self.find_node_by_title(target_song_title)
+        if current is None:
+            self._emit('warning', f"Song '{target_song_title}' not found in playlist.")
+            return False
         
-        print(f"Song '{target_song_title}' not found in playlist.")
-        return False
+        new_node = self._link_after(current, song_data)
+        self._emit('song_inserted', f"Inserted after '{target_song_title}': {new_node}")
+        return True
     
+    @_synchronized
     def insert_song_before(self, target_song_title: str, song_data: Dict) -> bool:
         """Insert a song before a specific song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty. Cannot insert before specific song.")
+            self._emit('warning', "Playlist is empty. Cannot insert before specific song.")
             return False
         
-        current = self.head
-        while current:
-            if current.song_data['title'].lower() == target_song_title.lower():
-                new_node = SongNode(song_data)
-                
-                # Insert before current node
-                new_node.next = current
-                new_node.previous = current.previous
-                
-                if current.previous:
-                    current.previous.next = new_node
-                else:
-                    # Inserting at beginning
-                    self.head = new_node
-                
-                current.previous = new_node
-                self.size += 1
-                print(f"Inserted before '{target_song_title}': {new_node}")
-                return True
-            
-            current = current.next
+        current = self.find_node_by_title(target_song_title)
+        if current is None:
+            self._emit('warning', f"Song '{target_song_title}' not found in playlist.")
+            return False
         
-        print(f"Song '{target_song_title}' not found in playlist.")
-        return False
+        new_node = self._link_before(current, song_data)
+        self._emit('song_inserted', f"Inserted before '{target_song_title}': {new_node}")
+        return True
     
+    @_synchronized
     def remove_song(self, song_title: str) -> bool:
         """Remove a song from the playlist by title."""
         if self.is_empty():
-            print("Playlist is empty. Nothing to remove.")
+            self._emit('warning', "Playlist is empty. Nothing to remove.")
             return False
         
-        current = self.head
-        while current:
-            if current.song_data['title'].lower() == song_title.lower():
-                # Update current_node if we're removing it
-                if self.current_node == current:
-                    if current.next:
-                        self.current_node = current.next
-                    elif current.previous:
-                        self.current_node = current.previous
-                    else:
-                        self.current_node = None
-                
-                # Remove the node
-                if current.previous:
-                    current.previous.next = current.next
-                else:
-                    # Removing head
-                    self.head = current.next
-                
-                if current.next:
-                    current.next.previous = current.previous
-                else:
-                    # Removing tail
-                    self.tail = current.previous
-                
-                self.size -= 1
-                print(f"Removed: {current}")
-                return True
-            
-            current = current.next
+        current = self.find_node_by_title(song_title)
+        if current is None:
+            self._emit('warning', f"Song '{song_title}' not found in playlist.")
+            return False
+        
+        self._unlink(current)
+        self._emit('song_removed', f"Removed: {current}")
+        return True
+    
+    @_synchronized
+    def get_at(self, position: int) -> Optional[Dict]:
+        """Return the song at a 0-based position without moving the current song."""
+        if not 0 <= position < self.size:
+            self._emit('warning', f"Position {position} is out of range (playlist has {self.size} songs).")
+            return None
+        
+        return self._positions.node_at(position).song_data
+    
+    @_synchronized
+    def seek(self, position: int) -> Optional[Dict]:
+        """Jump to the song at a 0-based position and return its data."""
+        if not 0 <= position < self.size:
+            self._emit('warning', f"Position {position} is out of range (playlist has {self.size} songs).")
+            return None
+        
+        self.current_node = self._positions.node_at(position)
+        self._emit('current_changed', f"Now playing: {self.current_node}")
+        return self.current_node.song_data
+    
+    @_synchronized
+    def insert_at(self, position: int, song_data: Dict) -> bool:
+        """Insert a song so that it ends up at a 0-based position."""
+        if not 0 <= position <= self.size:
+            self._emit('warning', f"Position {position} is out of range (playlist has {self.size} songs).")
+            return False
+        
+        if position == self.size:
+            self.add_song_at_end(song_data)
+            return True
+        
+        new_node = self._link_before(self._positions.node_at(position), song_data)
+        self._emit('song_inserted', f"Inserted at position {position}: {new_node}")
+        return True
+    
+    @_synchronized
+    def remove_at(self, position: int) -> Optional[Dict]:
+        """Remove the song at a 0-based position and return its data."""
+        if not 0 <= position < self.size:
+            self._emit('warning', f"Position {position} is out of range (playlist has {self.size} songs).")
+            return None
+        
+        node = self._positions.node_at(position)
+        self._unlink(node)
+        self._emit('song_removed', f"Removed: {node}")
+        return node.song_data
+    
+    @_synchronized
+    def get_position(self, node: Optional[SongNode] = None) -> Optional[int]:
+        """Return the 0-based position of a node (the current song by default)."""
+        node = node if node is not None else self.current_node
+        if node is None:
+            return None
+        return self._positions.rank(node)
+    
+    def _link_after(self, current: SongNode, song_data: Dict) -> SongNode:
+        """Create a node for song_data right after current and return it."""
+        new_node = SongNode(song_data)
+        position = self._positions.rank(current) + 1
+        
+        # Insert after current node
+        new_node.next = current.next
+        new_node.previous = current
+        
+        if current.next:
+            current.next.previous = new_node
+        else:
+            # Inserting at end
+            self.tail = new_node
+        
+        current.next = new_node
+        self.size += 1
+        self._index_node(new_node, position)
+        return new_node
+    
+    def _link_before(self, current: SongNode, song_data: Dict) -> SongNode:
+        """Create a node for song_data right before current and return it."""
+        new_node = SongNode(song_data)
+        position = self._positions.rank(current)
+        
+        # Insert before current node
+        new_node.next = current
+        new_node.previous = current.previous
+        
+        if current.previous:
+            current.previous.next = new_node
+        else:
+            # Inserting at beginning
+            self.head = new_node
+        
+        current.previous = new_node
+        self.size += 1
+        self._index_node(new_node, position)
+        return new_node
+    
+    def _unlink(self, current: SongNode) -> None:
+        """Detach a node from the playlist."""
+        # Update current_node if we're removing it
+        if self.current_node == current:
+            if current.next:
+                self.current_node = current.next
+            elif current.previous:
+                self.current_node = current.previous
+            else:
+                self.current_node = None
+        
+        # Remove the node
+        if current.previous:
+            current.previous.next = current.next
+        else:
+            # Removing head
+            self.head = current.next
         
-        print(f"Song '{song_title}' not found in playlist.")
-        return False
+        if current.next:
+            current.next.previous = current.previous
+        else:
+            # Removing tail
+            self.tail = current.previous
+        
+        self.size -= 1
+        self._unindex_node(current)
     
+    @_synchronized
     def next_song(self) -> Optional[Dict]:
         """Move to the next song and return its data."""
         if not self.current_node or not self.current_node.next:
-            print("No next song available.")
+            self._emit('warning', "No next song available.")
             return None
         
         self.current_node = self.current_node.next
-        print(f"Now playing: {self.current_node}")
+        self._emit('current_changed', f"Now playing: {self.current_node}")
         return self.current_node.song_data
     
+    @_synchronized
     def previous_song(self) -> Optional[Dict]:
         """Move to the previous song and return its data."""
         if not self.current_node or not self.current_node.previous:
-            print("No previous song available.")
+            self._emit('warning', "No previous song available.")
             return None
         
         self.current_node = self.current_node.previous
-        print(f"Now playing: {self.current_node}")
+        self._emit('current_changed', f"Now playing: {self.current_node}")
         return self.current_node.song_data
     
+    @_synchronized
     def get_current_song(self) -> Optional[Dict]:
         """Get the current song data."""
         if not self.current_node:
-            print("No song is currently selected.")
+            self._emit('warning', "No song is currently selected.")
             return None
         
         return self.current_node.song_data
     
+    @_synchronized
     def go_to_first_song(self) -> Optional[Dict]:
         """Go to the first song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty.")
+            self._emit('warning', "Playlist is empty.")
             return None
         
         self.current_node = self.head
-        print(f"Now at first song: {self.current_node}")
+        self._emit('current_changed', f"Now at first song: {self.current_node}")
         return self.current_node.song_data
     
+    @_synchronized
     def go_to_last_song(self) -> Optional[Dict]:
         """Go to the last song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty.")
+            self._emit('warning', "Playlist is empty.")
             return None
         
         self.current_node = self.tail
-        print(f"Now at last song: {self.current_node}")
+        self._emit('current_changed', f"Now at last song: {self.current_node}")
         return self.current_node.song_data
     
+    @_synchronized
     def display_playlist(self) -> None:
         """Display the entire playlist."""
         if self.is_empty():
@@ -241,20 +390,126 @@ class LinkedListPlaylist:
             current = current.next
             position += 1
     
+    @_synchronized
     def search_song(self, query: str) -> Optional[SongNode]:
-        """Search for a song by title or artist."""
+        """Search for a song by title or artist, returning the first match in playlist order."""
         if self.is_empty():
             return None
         
+        matches = self._get_search_index().candidates(query)
+        if len(matches) <= 1:
+            return next(iter(matches), None)
+        
+        # Several matches: the lowest position wins
+        return min(matches, key=self._positions.rank)
+    
+    def contains_node(self, node: SongNode) -> bool:
+        """Check whether a node is still linked into this playlist (False once it was removed)."""
+        return node in self._nodes_by_path.get(node.song_data['file_path'], ())
+    
+    def find_node_by_title(self, title: str) -> Optional[SongNode]:
+        """Return the first node (in playlist order) whose title matches, ignoring case."""
+        return self._first_in_order(self._nodes_by_title.get(title.lower()))
+    
+    def find_node_by_path(self, file_path: str) -> Optional[SongNode]:
+        """Return the first node (in playlist order) holding the song at file_path."""
+        return self._first_in_order(self._nodes_by_path.get(file_path))
+    
+    def _first_in_order(self, nodes: Optional[Dict[SongNode, None]]) -> Optional[SongNode]:
+        """Pick the node closest to the head from a set of candidates."""
+        if not nodes:
+            return None
+        if len(nodes) == 1:
+            return next(iter(nodes))
+        
+        # Duplicate titles: the lowest position wins
+        return min(nodes, key=self._positions.rank)
+    
+    def _get_search_index(self) -> SubstringIndex:
+        """Return the search index, building it on first use."""
+        if self._search_index is None:
+            self._search_index = SubstringIndex()
+            current = self.head
+            while current:
+                self._search_index.add(current, current.song_data['title'], current.song_data['artist'])
+                current = current.next
+        return self._search_index
+    
+    def _index_node(self, node: SongNode, position: int) -> None:
+        """Add a node at a position to the order statistic tree, search index and lookup maps."""
+        song = node.song_data
+        self._positions.insert_at(position, node)
+        if self._search_index is not None:
+            self._search_index.add(node, song['title'], song['artist'])
+        self._nodes_by_title.setdefault(song['title'].lower(), {})[node] = None
+        self._nodes_by_path.setdefault(song['file_path'], {})[node] = None
+    
+    @_synchronized
+    def extend(self, songs: Iterable[Dict]) -> int:
+        """Append songs in bulk and return how many were added.
+        
+        The chain is linked in a single pass and observers get one 'songs_added'
+        event for the whole batch instead of one per song.
+        """
+        added = self._append_songs(songs)
+        if added:
+            self._emit('songs_added', f"Added {added} songs")
+        return added
+    
+    def _append_songs(self, songs: Iterable[Dict]) -> int:
+        """Link songs onto the end and merge them into the positions tree in O(k + log n); returns the count."""
+        nodes = []
+        nodes_by_title = self._nodes_by_title
+        nodes_by_path = self._nodes_by_path
+        search_index = self._search_index
+        previous = self.tail
+        
+        for song in songs:
+            node = SongNode(song)
+            node.previous = previous
+            if previous is not None:
+                previous.next = node
+            else:
+                self.head = node
+            previous = node
+            nodes.append(node)
+            title = song['title']
+            nodes_by_title.setdefault(title.lower(), {})[node] = None
+            nodes_by_path.setdefault(song['file_path'], {})[node] = None
+            if search_index is not None:
+                search_index.add(node, title, song['artist'])
+        
+        if not nodes:
+            return 0
+        self.tail = previous
+        self.size += len(nodes)
+        if self.current_node is None:
+            self.current_node = self.head
+        self._positions.extend(nodes)
+        return len(nodes)
+    
+    def iter_songs(self):
+        """Yield the songs in playlist order."""
         current = self.head
         while current:
-            if (query.lower() in current.song_data['title'].lower() or 
-                query.lower() in current.song_data['artist'].lower()):
-                return current
+            yield current.song_data
             current = current.next
-        
-        return None
     
+    def _unindex_node(self, node: SongNode) -> None:
+        """Remove a node from the order statistic tree, search index and lookup maps."""
+        song = node.song_data
+        self._positions.remove(node)
+        if self._search_index is not None:
+            self._search_index.remove(node)
+        for lookup, key in ((self._nodes_by_title, song['title'].lower()),
+                            (self._nodes_by_path, song['file_path'])):
+            nodes = lookup.get(key)
+            if nodes is not None:
+                nodes.pop(node, None)
+                if not nodes:
+                    del lookup[key]
+    
+    @_synchronized
     def reverse_playlist(self) -> None:
         """Reverse the order of songs in the playlist."""
         if self.size <= 1:
@@ -263,63 +518,86 @@ class LinkedListPlaylist:
         # Swap head and tail
         self.head, self.tail = self.tail, self.head
         
-        # Reverse all links
-        current = self.head
+        # Reverse all links, starting from the old head (now the tail)
+        current = self.tail
         while current:
             # Swap next and previous pointers
             current.next, current.previous = current.previous, current.next
             current = current.previous
         
-        # Update current_node if it exists
-        if self.current_node:
-            # Find the new position of the current song
-            temp = self.head
-            while temp:
-                if temp.song_data == self.current_node.song_data:
-                    self.current_node = temp
-                    break
-                temp = temp.next
+        # The nodes themselves are reused, so current_node and the lookup maps stay valid;
+        # only the positions need rebuilding
+        nodes = []
+        current = self.head
+        while current:
+            nodes.append(current)
+            current = current.next
+        self._positions.build(nodes)
         
-        print("Playlist reversed!")
+        self._emit('reversed', "Playlist reversed!")
     
-    def shuffle_playlist(self) -> None:
-        """Shuffle the playlist using a simple algorithm."""
+    @_synchronized
+    def shuffle_playlist(self, seed: Optional[int] = None) -> None:
+        """Shuffle the playlist uniformly (Fisher-Yates), relinking the existing nodes.
+        
+        The current song stays selected. Pass a seed for a reproducible order.
+        """
         if self.size <= 1:
             return
         
-        # Convert to list for shuffling
-        songs = []
+        nodes = []
         current = self.head
         while current:
-            songs.append(current.song_data)
+            nodes.append(current)
             current = current.next
         
-        # Simple shuffle: swap random pairs
-        import random
-        for _ in range(self.size * 2):  # Multiple swaps for better randomization
-            i = random.randint(0, self.size - 1)
-            j = random.randint(0, self.size - 1)
-            if i != j:
-                songs[i], songs[j] = songs[j], songs[i]
-        
-        # Rebuild the linked list
-        self.head = None
-        self.tail = None
-        self.size = 0
-        
-        for song in songs:
-            self.add_song_at_end(song)
-        
-        # Reset current node to first song
-        self.current_node = self.head
-        print("Playlist shuffled!")
+        # Fisher-Yates: every permutation is equally likely
+        rng = random.Random(seed)
+        for i in range(len(nodes) - 1, 0, -1):
+            j = rng.randrange(i + 1)
+            nodes[i], nodes[j] = nodes[j], nodes[i]
+        
+        # Relink the same nodes in their new order
+        previous = None
+        for node in nodes:
+            node.previous = previous
+            if previous is not None:
+                previous.next = node
+            previous = node
+        nodes[-1].next = None
+        self.head = nodes[0]
+        self.tail = nodes[-1]
+        
+        # Lookup maps and the search index hold the same nodes; only positions changed
+        self._positions.build(nodes)
+        self._emit('shuffled', "Playlist shuffled!")
 
 class PlaylistManager:
-    """Manager class for creating and managing multiple playlists."""
+    """Manager class for creating and managing multiple playlists.
+    
+    With a playlist_directory, playlists are saved there as lists of library file
+    paths. Saved playlists are only listed at startup; a playlist's songs are read
+    when switch_playlist() first selects it.
+    """
     
-    def __init__(self):
-        self.playlists: Dict[str, LinkedListPlaylist] = {}
+    def __init__(self, playlist_directory: Optional[str] = None, music_manager: Optional[MusicPlaylistManager] = None,
+                 playlist_format: str = 'json'):
+        if playlist_format not in PLAYLIST_FORMATS:
+            raise ValueError(f"Unknown playlist format: {playlist_format}")
+        
+        # None marks a playlist that is saved on disk but not loaded yet
+        self.playlists: Dict[str, Optional[LinkedListPlaylist]] = {}
+        self.descriptions: Dict[str, str] = {}
         self.current_playlist_name: Optional[str] = None
+        self.playlist_directory = playlist_directory
+        self.music_manager = music_manager
+        self.playlist_format = playlist_format
+        self._playlist_files: Dict[str, str] = {}
+        
+        if playlist_directory:
+            self._playlist_files = list_playlist_files(playlist_directory)
+            for name in self._playlist_files:
+                self.playlists[name] = None
     
     def create_playlist(self, name: str, description: str = "") -> bool:
         """Create a new empty playlist."""
@@ -329,12 +607,14 @@ class PlaylistManager:
         
         new_playlist = LinkedListPlaylist()
         self.playlists[name] = new_playlist
+        self.descriptions[name] = description
         self.current_playlist_name = name
         
         print(f"✅ Created new playlist: '{name}'")
         if description:
             print(f"   Description: {description}")
         
+        self.save_playlist(name)
         return True
     
     def delete_playlist(self, name: str) -> bool:
@@ -347,6 +627,13 @@ class PlaylistManager:
             self.current_playlist_name = None
         
         del self.playlists[name]
+        self.descriptions.pop(name, None)
+        playlist_file = self._playlist_files.pop(name, None)
+        if playlist_file:
+            try:
+                os.remove(playlist_file)
+            except OSError as e:
+                print(f"⚠️  Could not delete playlist file: {e}")
         print(f"🗑️  Deleted playlist: '{name}'")
         return True
     
@@ -356,6 +643,9 @@ class PlaylistManager:
             print(f"Playlist '{name}' not found.")
             return False
         
+        if self.playlists[name] is None and not self.load_playlist(name):
+            return False
+        
         self.current_playlist_name = name
         print(f"🔄 Switched to playlist: '{name}'")
         return True
@@ -378,7 +668,8 @@ class PlaylistManager:
         
         for i, (name, playlist) in enumerate(self.playlists.items(), 1):
             current_marker = " ▶️" if name == self.current_playlist_name else ""
-            print(f"{i:2d}. {name} ({playlist.get_size()} songs){current_marker}")
+            size = f"{playlist.get_size()} songs" if playlist is not None else "saved"
+            print(f"{i:2d}. {name} ({size}){current_marker}")
     
     def add_song_to_current_playlist(self, song_data: Dict) -> bool:
         """Add a song to the current playlist."""
@@ -403,13 +694,91 @@ class PlaylistManager:
         
         # Add songs to the new playlist
         songs_to_add = song_library[:max_songs]
-        current_playlist = self.playlists[name]
-        
-        for song in songs_to_add:
-            current_playlist.add_song_at_end(song)
+        self.playlists[name].extend(songs_to_add)
         
         print(f"📚 Populated playlist '{name}' with {len(songs_to_add)} songs from library.")
+        self.save_playlist(name)
         return True
+    
+    def load_playlist(self, name: str) -> bool:
+        """Read a saved playlist's songs from disk."""
+        playlist_file = self._playlist_files.get(name)
+        if playlist_file is None:
+            print(f"Playlist '{name}' has no saved file.")
+            return False
+        
+        try:
+            _, description, entries = read_playlist_file(playlist_file)
+            songs = [self._resolve_song(entry) for entry in entries]
+        except (OSError, ValueError) as e:
+            print(f"❌ Error loading playlist '{name}': {e}")
+            return False
+        
+        self.playlists[name] = LinkedListPlaylist.from_iterable(songs)
+        self.descriptions[name] = description
+        return True
+    
+    def save_playlist(self, name: str) -> bool:
+        """Write one loaded playlist to the playlist directory."""
+        playlist = self.playlists.get(name)
+        if not self.playlist_directory or playlist is None:
+            return False
+        
+        path = os.path.join(self.playlist_directory, playlist_filename(name, self.playlist_format))
+        try:
+            os.makedirs(self.playlist_directory, exist_ok=True)
+            write_playlist_file(path, name, self.descriptions.get(name, ""),
+                                (song['file_path'] for song in playlist.iter_songs()))
+        except OSError as e:
+            print(f"❌ Error saving playlist '{name}': {e}")
+            return False
+        
+        # Switching formats leaves the old file behind; remove it
+        old_path = self._playlist_files.get(name)
+        if old_path and old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+        self._playlist_files[name] = path
+        return True
+    
+    def save_all_playlists(self) -> int:
+        """Save every loaded playlist; playlists never loaded are already on disk unchanged."""
+        return sum(1 for name, playlist in self.playlists.items()
+                   if playlist is not None and self.save_playlist(name))
+    
+    def _resolve_song(self, entry) -> Dict:
+        """Turn a saved entry (a file path, or a whole song dictionary) into a song.
+        
+        Raises ValueError for an entry of the wrong shape, e.g. in a hand-edited file.
+        """
+        if isinstance(entry, dict):
+            file_path = entry.get('file_path')
+            if not (isinstance(entry.get('title'), str) and isinstance(entry.get('artist'), str) and
+                    isinstance(file_path, (str, type(None)))):
+                raise ValueError(f"Invalid song in playlist file: {entry!r}")
+            if file_path is None:
+                return dict(entry, file_path=None)
+        elif isinstance(entry, str):
+            file_path = entry
+        else:
+            raise ValueError(f"Invalid song in playlist file: {entry!r}")
+        
+        if self.music_manager is not None:
+            song = self.music_manager.get_song_by_path(file_path)
+            if song is not None:
+                return song
+        if isinstance(entry, dict):
+            return entry
+        
+        # Not in the library (moved, or on a drive that isn't mounted); keep a placeholder
+        # parsed from the "Artist Name - Song Name" file name like the library does
+        filename, file_type = os.path.splitext(os.path.basename(file_path))
+        artist, separator, title = filename.partition(' - ')
+        if not separator:
+            artist, title = "Unknown Artist", filename
+        return SongRecord(title.strip(), artist.strip(), file_type.lower(), file_path, 0)
 
 def load_playlist_from_library(music_manager: MusicPlaylistManager, max_songs: int = 10) -> LinkedListPlaylist:
     """Load songs from the music library into a linked list playlist."""
@@ -420,11 +789,9 @@ def load_playlist_from_library(music_manager: MusicPlaylistManager, max_songs: i
         print("No songs found in library.")
         return playlist
     
-    # Add songs to playlist (limit to max_songs)
+    # Add songs to playlist (limit to max_songs) in one pass
     songs_to_add = song_library[:max_songs]
-    
-    for song in songs_to_add:
-        playlist.add_song_at_end(song)
+    playlist = LinkedListPlaylist.from_iterable(songs_to_add)
     
     print(f"Loaded {len(songs_to_add)} songs into playlist.")
     return playlist
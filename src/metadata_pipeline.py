@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Metadata Pipeline
+Reads tags for many files at once on a process pool, caching results by (path, size, mtime)
+"""
+
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from tag_reader import read_tags
+
+DEFAULT_METADATA_WORKERS = min(8, os.cpu_count() or 1)
+
+# Below this many uncached files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 256
+
+# Paths handed to a worker per task; large enough that pickling overhead stays small
+CHUNK_SIZE = 64
+
+def read_tags_batch(file_paths: Sequence[str]) -> List[Dict]:
+    """Read the tags of several files; runs inside the worker processes."""
+    return [read_tags(file_path) for file_path in file_paths]
+
+class MetadataPipeline:
+    """Batch tag reader with an in-memory cache keyed by (path, size, mtime).
+
+    read() returns one tag dictionary per file, in input order. Files whose size
+    and mtime match the cached entry are not opened again. Large batches are
+    split into chunks and read on a process pool, since parsing headers is
+    CPU-bound Python that threads cannot run in parallel; small batches, and
+    systems where worker processes cannot be started, are read in-process.
+    Missing tags are simply absent, so callers fall back to the filename.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_METADATA_WORKERS, min_parallel_files: int = MIN_PARALLEL_FILES,
+                 chunk_size: int = CHUNK_SIZE):
+        self.max_workers = max(1, max_workers)
+        self.min_parallel_files = min_parallel_files
+        self.chunk_size = max(1, chunk_size)
+
+        self._cache: Dict[str, Tuple[int, float, Dict]] = {}
+        self.cache_hits = 0
+        self.files_read = 0
+        self.elapsed = 0.0
+        self.used_processes = False
+
+    def read(self, files: Iterable[Tuple[str, os.stat_result]]) -> List[Dict]:
+        """Return the tags for each (file_path, stat_result), reading only uncached files."""
+        start = time.perf_counter()
+        files = list(files)
+        results: List[Optional[Dict]] = [None] * len(files)
+        to_read: List[int] = []
+
+        for position, (file_path, stat_result) in enumerate(files):
+            cached = self._cache.get(file_path)
+            if cached is not None and cached[0] == stat_result.st_size and cached[1] == stat_result.st_mtime:
+                results[position] = cached[2]
+                self.cache_hits += 1
+            else:
+                to_read.append(position)
+
+        paths = [files[position][0] for position in to_read]
+        self.used_processes = False
+        if len(paths) >= self.min_parallel_files and self.max_workers > 1:
+            tags_list = self._read_parallel(paths)
+        else:
+            tags_list = read_tags_batch(paths)
+
+        for position, tags in zip(to_read, tags_list):
+            file_path, stat_result = files[position]
+            self._cache[file_path] = (stat_result.st_size, stat_result.st_mtime, tags)
+            results[position] = tags
+
+        self.files_read += len(paths)
+        self.elapsed += time.perf_counter() - start
+        return results
+
+    def forget(self, file_path: str) -> None:
+        """Drop a file's cached tags."""
+        self._cache.pop(file_path, None)
+
+    def get_files_per_second(self) -> float:
+        """Return the tag reading throughput so far, counting cache hits."""
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.files_read + self.cache_hits) / self.elapsed
+
+    def _read_parallel(self, paths: List[str]) -> List[Dict]:
+        """Read tags on a process pool, falling back to this process if workers cannot start."""
+        # concurrent.futures is slow to import, so it is only loaded for large batches
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        chunks = [paths[i:i + self.chunk_size] for i in range(0, len(paths), self.chunk_size)]
+        workers = min(self.max_workers, len(chunks))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                tags_list = [tags for batch in executor.map(read_tags_batch, chunks) for tags in batch]
+        except (OSError, BrokenProcessPool, NotImplementedError):
+            return read_tags_batch(paths)
+        self.used_processes = True
+        return tags_list
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Order Statistic Tree
+Implicit treap over playlist nodes giving O(log n) positional lookups
+"""
+
+import random
+from typing import List, Optional
+
+class OrderStatisticTree:
+    """Balanced tree ordered by position rather than by key.
+
+    The tree is threaded through the nodes it stores: every node needs the
+    attributes tree_left, tree_right, tree_parent, tree_priority and tree_count
+    (SongNode provides them). Random priorities keep the expected depth at
+    O(log n), so positional lookup, rank, insert and remove are all O(log n).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.root = None
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.root.tree_count if self.root else 0
+
+    def clear(self) -> None:
+        """Forget every node."""
+        self.root = None
+
+    def node_at(self, position: int):
+        """Return the node at a 0-based position."""
+        if not 0 <= position < len(self):
+            raise IndexError(f"position {position} out of range")
+
+        node = self.root
+        while True:
+            left_count = _count(node.tree_left)
+            if position < left_count:
+                node = node.tree_left
+            elif position == left_count:
+                return node
+            else:
+                position -= left_count + 1
+                node = node.tree_right
+
+    def rank(self, node) -> int:
+        """Return the 0-based position of a node stored in the tree."""
+        position = _count(node.tree_left)
+        while node.tree_parent is not None:
+            parent = node.tree_parent
+            if parent.tree_right is node:
+                position += _count(parent.tree_left) + 1
+            node = parent
+        return position
+
+    def insert_at(self, position: int, node) -> None:
+        """Insert a node so that it ends up at the given position."""
+        if not 0 <= position <= len(self):
+            raise IndexError(f"position {position} out of range")
+
+        self._reset_node(node)
+        left, right = _split(self.root, position)
+        self.root = _merge(_merge(left, node), right)
+        self.root.tree_parent = None
+
+    def remove(self, node) -> None:
+        """Remove a node from the tree."""
+        replacement = _merge(node.tree_left, node.tree_right)
+        parent = node.tree_parent
+        if replacement is not None:
+            replacement.tree_parent = parent
+
+        if parent is None:
+            self.root = replacement
+        else:
+            if parent.tree_left is node:
+                parent.tree_left = replacement
+            else:
+                parent.tree_right = replacement
+            # Subtree sizes shrink by one along the path to the root
+            while parent is not None:
+                parent.tree_count -= 1
+                parent = parent.tree_parent
+
+        node.tree_left = node.tree_right = node.tree_parent = None
+        node.tree_count = 1
+
+    def build(self, nodes: List) -> None:
+        """Replace the tree with the given nodes, in order, in O(n)."""
+        self.root = self._build_subtree(nodes)
+
+    def extend(self, nodes: List) -> None:
+        """Append nodes at the end in O(k + log n), without touching the nodes already stored."""
+        self.root = _merge(self.root, self._build_subtree(nodes))
+        if self.root is not None:
+            self.root.tree_parent = None
+
+    def _build_subtree(self, nodes: List):
+        """Build a treap over the given nodes, in order, in O(n) and return its root."""
+        random_priority = self._random.random
+        spine = []
+        # In-order index of the first node in each spine node's subtree
+        spine_starts = []
+        for index, node in enumerate(nodes):
+            node.tree_right = node.tree_parent = None
+            priority = node.tree_priority = random_priority()
+            # Standard Cartesian-tree construction: pop lower-priority nodes off the right spine
+            last = None
+            while spine and spine[-1].tree_priority < priority:
+                last = spine.pop()
+                # A popped subtree is complete: it covers its start up to the node before this one
+                last.tree_count = index - spine_starts.pop()
+            node.tree_left = last
+            if last is not None:
+                last.tree_parent = node
+            if spine:
+                spine[-1].tree_right = node
+                node.tree_parent = spine[-1]
+            spine.append(node)
+            spine_starts.append(index if last is None else index - last.tree_count)
+
+        # Whatever is left on the spine extends to the last node
+        for node, start in zip(spine, spine_starts):
+            node.tree_count = len(nodes) - start
+        return spine[0] if spine else None
+
+    def _reset_node(self, node) -> None:
+        """Detach a node and give it a fresh random priority."""
+        node.tree_left = node.tree_right = node.tree_parent = None
+        node.tree_priority = self._random.random()
+        node.tree_count = 1
+
+def _count(node) -> int:
+    """Size of the subtree rooted at node."""
+    return node.tree_count if node is not None else 0
+
+def _update(node) -> None:
+    """Refresh a node's subtree size and its children's parent links."""
+    node.tree_count = 1 + _count(node.tree_left) + _count(node.tree_right)
+    if node.tree_left is not None:
+        node.tree_left.tree_parent = node
+    if node.tree_right is not None:
+        node.tree_right.tree_parent = node
+
+def _split(node, position: int):
+    """Split a subtree into its first `position` nodes and the rest."""
+    if node is None:
+        return None, None
+
+    if _count(node.tree_left) < position:
+        left, right = _split(node.tree_right, position - _count(node.tree_left) - 1)
+        node.tree_right = left
+        _update(node)
+        if right is not None:
+            right.tree_parent = None
+        return node, right
+
+    left, right = _split(node.tree_left, position)
+    node.tree_left = right
+    _update(node)
+    if left is not None:
+        left.tree_parent = None
+    return left, node
+
+def _merge(left, right):
+    """Concatenate two subtrees, keeping heap order on priorities."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.tree_priority > right.tree_priority:
+        left.tree_right = _merge(left.tree_right, right)
+        _update(left)
+        return left
+
+    right.tree_left = _merge(left, right.tree_left)
+    _update(right)
+    return right
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Playback Engine
+Background thread that plays a playlist or queue track after track without blocking the CLI
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from .audio_backend import AudioBackendError
+
+class PlaylistSource:
+    """Feed the songs of a LinkedListPlaylist to the engine, starting at its current song.
+
+    The engine thread reads the playlist while the menu may edit it, so every
+    access holds the playlist's lock, and nodes removed since they were handed
+    out are re-resolved instead of being followed or made current.
+    """
+
+    def __init__(self, playlist, repeat: bool = True):
+        self.playlist = playlist
+        self.repeat = repeat
+        self._cursor = None
+        self._handed_out: deque = deque()
+
+    def next_track(self) -> Optional[Dict]:
+        """Return the song after the last one handed out, or None at the end."""
+        with self.playlist.lock:
+            node = self._after(self._cursor)
+            if node is None:
+                return None
+            self._cursor = node
+            self._handed_out.append(node)
+            return node.song_data
+
+    def upcoming(self, count: int) -> List[Dict]:
+        """Return up to `count` songs that next_track() will hand out next, without advancing."""
+        songs = []
+        with self.playlist.lock:
+            node = self._cursor
+            for _ in range(count):
+                node = self._after(node)
+                if node is None:
+                    break
+                songs.append(node.song_data)
+        return songs
+
+    def _after(self, node):
+        """Node that follows `node` in play order (None means nothing handed out yet); call with the lock held."""
+        if node is None:
+            return self.playlist.current_node or self.playlist.head
+        following = node.next
+        if not self.playlist.contains_node(node):
+            # Removed since it was handed out: its links still lead to the songs that followed it
+            while following is not None and not self.playlist.contains_node(following):
+                following = following.next
+        if following is None and self.repeat:
+            return self.playlist.head
+        return following
+
+    def track_started(self, song: Dict) -> None:
+        """Move the playlist's current position to the song that just started."""
+        with self.playlist.lock:
+            while self._handed_out:
+                node = self._handed_out.popleft()
+                if node.song_data is not song:
+                    continue
+                if not self.playlist.contains_node(node):
+                    # The song was removed (or moved) after it was queued; use its current node, if any
+                    node = self.playlist.find_node_by_path(song['file_path'])
+                if node is not None:
+                    self.playlist.current_node = node
+                return
+
+class QueueSource:
+    """Feed songs from a SongQueue or PrioritySongQueue, removing each one as it is handed out."""
+
+    def __init__(self, song_queue):
+        self.song_queue = song_queue
+
+    def next_track(self) -> Optional[Dict]:
+        """Dequeue the next song, or None when the queue is empty."""
+        return self.song_queue.dequeue()
+
+    def upcoming(self, count: int) -> List[Dict]:
+        """Return up to `count` songs at the front of the queue without removing them."""
+        return self.song_queue.peek_many(count)
+
+    def track_started(self, song: Dict) -> None:
+        pass
+
+class PlaybackEngine:
+    """Play songs from a source one after another on a background thread.
+
+    The thread polls the backend for finished tracks. When the backend can queue
+    a track (pygame and the stub backend), the next song is queued while the
+    current one plays so there is no gap between them; otherwise the next song
+    is loaded as soon as the current one ends.
+    """
+
+    # Give up after this many songs in a row fail to load (e.g. a repeating playlist of missing files)
+    MAX_CONSECUTIVE_FAILURES = 20
+
+    def __init__(self, backend, source, on_track_start: Optional[Callable[[Dict], None]] = None,
+                 on_error: Optional[Callable[[Dict, Exception], None]] = None,
+                 open_track: Optional[Callable[[Dict], object]] = None,
+                 poll_interval: float = 0.05):
+        self.backend = backend
+        self.source = source
+        # Turns a song into what the backend loads: its path by default, or e.g. a cached in-memory file
+        self.open_track = open_track or (lambda song: song['file_path'])
+        self.on_track_start = on_track_start
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self.current_song: Optional[Dict] = None
+        self.tracks_played = 0
+
+        self._queued_song: Optional[Dict] = None
+        self._consecutive_failures = 0
+        self._stop_event = threading.Event()
+        self._skip_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start playing in the background."""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._skip_event.clear()
+        self._thread = threading.Thread(target=self._run, name="playback-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop playback and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def skip(self) -> None:
+        """Jump to the next song."""
+        self._skip_event.set()
+
+    def is_running(self) -> bool:
+        """Check whether the engine thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the source to run out; returns False on timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def _run(self) -> None:
+        """Engine loop: start the first song, then advance whenever a track ends."""
+        try:
+            self._play_next()
+            while self.current_song is not None and not self._stop_event.is_set():
+                if self._skip_event.is_set():
+                    self._skip_event.clear()
+                    self._play_next()
+                    continue
+
+                for _ in range(self.backend.poll_track_ends()):
+                    if self._queued_song is not None:
+                        # The backend already switched to the queued song without a gap
+                        song, self._queued_song = self._queued_song, None
+                        self._started(song)
+                        self._queue_next()
+                    else:
+                        self._play_next()
+                        break
+
+                self._stop_event.wait(self.poll_interval)
+        finally:
+            self.backend.stop()
+            self.current_song = None
+            self._queued_song = None
+
+    def _play_next(self) -> None:
+        """Load and start the next playable song, skipping ones that fail to load."""
+        # A song already queued (e.g. when skipping) is played next rather than dropped
+        song, self._queued_song = self._queued_song, None
+        while not self._stop_event.is_set():
+            if song is None and self._consecutive_failures < self.MAX_CONSECUTIVE_FAILURES:
+                song = self.source.next_track()
+            if song is None:
+                self.current_song = None
+                return
+            try:
+                self.backend.load(self.open_track(song))
+                self.backend.play()
+            except AudioBackendError as e:
+                self._failed(song, e)
+                song = None
+                continue
+            self._started(song)
+            self._queue_next()
+            return
+
+    def _queue_next(self) -> None:
+        """Queue the following song so the backend can switch to it gaplessly."""
+        if not self.backend.supports_queue:
+            return
+        while self._queued_song is None:
+            if self._consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                return
+            song = self.source.next_track()
+            if song is None:
+                return
+            try:
+                self.backend.queue(self.open_track(song))
+            except AudioBackendError as e:
+                self._failed(song, e)
+                continue
+            self._queued_song = song
+
+    def _started(self, song: Dict) -> None:
+        """Record a song that has started playing and notify listeners."""
+        self.current_song = song
+        self.tracks_played += 1
+        self._consecutive_failures = 0
+        self.source.track_started(song)
+        if self.on_track_start is not None:
+            self.on_track_start(song)
+
+    def _failed(self, song: Dict, error: Exception) -> None:
+        """Report a song that could not be played."""
+        self._consecutive_failures += 1
+        if self.on_error is not None:
+            self.on_error(song, error)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Playlist Store
+Saves playlists as lists of library file paths, in JSON or a compact binary format
+"""
+
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Tuple, Union
+
+JSON_SUFFIX = '.json'
+BINARY_SUFFIX = '.plb'
+PLAYLIST_FORMATS = {'json': JSON_SUFFIX, 'binary': BINARY_SUFFIX}
+
+# Binary layout: header, then the UTF-8 name, description and NUL-separated file paths
+BINARY_MAGIC = b'PLB1'
+_BINARY_HEADER = struct.Struct('<4sIII')
+
+# Characters that cannot appear in file names on common filesystems, plus the escape character itself
+_UNSAFE_FILENAME_CHARS = frozenset('<>:"/\\|?*%')
+
+def playlist_filename(name: str, playlist_format: str = 'json') -> str:
+    """Build a file name for a playlist, percent-escaping characters filesystems reject."""
+    escaped = []
+    for char in name:
+        if char in _UNSAFE_FILENAME_CHARS or not char.isprintable():
+            escaped.append(''.join(f'%{byte:02X}' for byte in char.encode('utf-8')))
+        else:
+            escaped.append(char)
+    return ''.join(escaped) + PLAYLIST_FORMATS[playlist_format]
+
+def playlist_name_from_filename(filename: str) -> str:
+    """Recover the playlist name from a file name built by playlist_filename()."""
+    stem = os.path.splitext(filename)[0]
+    if '%' not in stem:
+        return stem
+
+    data = bytearray()
+    i = 0
+    while i < len(stem):
+        if stem[i] == '%' and _is_hex(stem[i + 1:i + 3]):
+            data.append(int(stem[i + 1:i + 3], 16))
+            i += 3
+        else:
+            data.extend(stem[i].encode('utf-8'))
+            i += 1
+    return data.decode('utf-8', errors='replace')
+
+def _is_hex(text: str) -> bool:
+    """Check for exactly two hexadecimal digits."""
+    return len(text) == 2 and all(char in '0123456789abcdefABCDEF' for char in text)
+
+def list_playlist_files(directory: str) -> Dict[str, str]:
+    """Map playlist names to their files without reading any of them."""
+    playlist_files: Dict[str, str] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return playlist_files
+
+    for entry in sorted(entries, key=lambda e: e.name):
+        extension = os.path.splitext(entry.name)[1]
+        if extension in (JSON_SUFFIX, BINARY_SUFFIX) and entry.is_file():
+            # If a playlist exists in both formats, the binary file wins
+            name = playlist_name_from_filename(entry.name)
+            if name not in playlist_files or extension == BINARY_SUFFIX:
+                playlist_files[name] = entry.path
+    return playlist_files
+
+def write_playlist_file(path: str, name: str, description: str, file_paths: Iterable[str]) -> None:
+    """Write a playlist atomically; the format follows the file extension."""
+    file_paths = list(file_paths)
+    if path.endswith(BINARY_SUFFIX):
+        name_bytes = name.encode('utf-8')
+        description_bytes = description.encode('utf-8')
+        data = b''.join((
+            _BINARY_HEADER.pack(BINARY_MAGIC, len(name_bytes), len(description_bytes), len(file_paths)),
+            name_bytes,
+            description_bytes,
+            '\0'.join(file_paths).encode('utf-8')
+        ))
+    else:
+        document = {'name': name, 'description': description, 'songs': file_paths}
+        data = json.dumps(document, indent=4, ensure_ascii=False).encode('utf-8')
+    _atomic_write(path, data)
+
+def read_playlist_file(path: str) -> Tuple[str, str, List[Union[str, Dict]]]:
+    """Read a playlist file and return (name, description, songs).
+
+    Songs are file paths; JSON files may also hold whole song dictionaries.
+    Raises ValueError if the file is not a valid playlist.
+    """
+    with open(path, 'rb') as playlist_file:
+        data = playlist_file.read()
+
+    if data.startswith(BINARY_MAGIC):
+        if len(data) < _BINARY_HEADER.size:
+            raise ValueError(f"Truncated playlist file: {path}")
+        _, name_length, description_length, song_count = _BINARY_HEADER.unpack_from(data)
+        offset = _BINARY_HEADER.size
+        name = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+        description = data[offset:offset + description_length].decode('utf-8')
+        offset += description_length
+        songs = data[offset:].decode('utf-8').split('\0') if song_count else []
+        if len(songs) != song_count:
+            raise ValueError(f"Corrupt playlist file: {path}")
+        return name, description, songs
+
+    document = json.loads(data)
+    if not isinstance(document, dict):
+        raise ValueError(f"Not a playlist file: {path}")
+    name = document.get('name') or playlist_name_from_filename(os.path.basename(path))
+    description = document.get('description', '')
+    songs = document.get('songs', [])
+    if not isinstance(name, str) or not isinstance(description, str) or not isinstance(songs, list):
+        raise ValueError(f"Not a playlist file: {path}")
+    return name, description, songs
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write to a temporary file in the same directory, fsync it, then rename it over the target."""
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as temporary_file:
+        temporary_file.write(data)
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_path, path)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Prefetch Cache
+Reads upcoming tracks into memory on a background thread pool so track changes do not wait on disk
+"""
+
+import io
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_PREFETCH_WORKERS = 2
+
+class CachedTrack(io.BytesIO):
+    """In-memory file handed to the audio backend; `name` keeps the original path for type hints."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+class PrefetchCache:
+    """LRU cache of whole audio files bounded by a byte budget.
+
+    prefetch() schedules reads on a small thread pool and returns at once.
+    open() hands back an in-memory file for a cached track. It never reads on
+    the caller's thread: on a miss, or while a read is still in flight, it
+    returns the path so the backend streams the file as before, counts a miss
+    and leaves the cache to be filled in the background for the next play.
+    Least recently used tracks are evicted once the cache exceeds max_bytes;
+    files larger than the whole budget are never cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, max_workers: int = DEFAULT_PREFETCH_WORKERS):
+        if max_bytes < 0:
+            raise ValueError("Cache budget cannot be negative")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.cached_bytes = 0
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.max_workers = max_workers
+        self._pending: Dict[str, "Future"] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def prefetch(self, file_paths: Iterable[str]) -> int:
+        """Schedule background reads for tracks not yet cached; returns how many were scheduled."""
+        scheduled = 0
+        with self._lock:
+            for file_path in file_paths:
+                if file_path is None or file_path in self._entries or file_path in self._pending:
+                    continue
+                self._pending[file_path] = self._get_executor().submit(self._read_into_cache, file_path)
+                scheduled += 1
+        return scheduled
+
+    def open(self, file_path: str) -> Union[CachedTrack, str]:
+        """Return an in-memory file for a cached track, otherwise the path itself (without blocking)."""
+        with self._lock:
+            data = self._entries.get(file_path)
+            if data is not None:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return CachedTrack(data, file_path)
+            self.misses += 1
+
+        # Fill the cache off this thread (prefetch skips a read already in flight) and stream from disk meanwhile
+        self.prefetch((file_path,))
+        return file_path
+
+    def contains(self, file_path: str) -> bool:
+        """Check whether a track is fully cached."""
+        with self._lock:
+            return file_path in self._entries
+
+    def clear(self) -> None:
+        """Drop every cached track."""
+        with self._lock:
+            self._entries.clear()
+            self.cached_bytes = 0
+
+    def get_statistics(self) -> Dict:
+        """Return hit/miss counters and current memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'cached_tracks': len(self._entries),
+                'cached_bytes': self.cached_bytes,
+                'max_bytes': self.max_bytes,
+                'pending_reads': len(self._pending)
+            }
+
+    def close(self) -> None:
+        """Stop the read threads and release the cached data."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.clear()
+
+    def _get_executor(self):
+        """Start the read threads on first use; concurrent.futures is slow to import."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        return self._executor
+
+    def _read_into_cache(self, file_path: str):
+        """Read a whole file and store it, evicting older tracks to stay within budget."""
+        try:
+            with open(file_path, 'rb') as audio_file:
+                data = audio_file.read()
+        except OSError:
+            data = None
+
+        with self._lock:
+            self._pending.pop(file_path, None)
+            if data is None or len(data) > self.max_bytes or file_path in self._entries:
+                return data
+
+            self._entries[file_path] = data
+            self.cached_bytes += len(data)
+            while self.cached_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.cached_bytes -= len(evicted)
+                self.evictions += 1
+        return data
@@ -1,84 +1,75 @@
 #!/usr/bin/env python3
 """
 Simple Recursive Playlist Shuffle
-Demonstrates recursion for shuffling playlist song order
+Uniform playlist shuffle (linear Fisher-Yates behind the original entry point)
 """
 
 import random
 import os
 import sys
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # Add the src directory to the path so we can import Lists_and_Tuples
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from Lists_and_Tuples import MusicPlaylistManager
 
-def recursive_shuffle_playlist(playlist: List[Dict], depth: int = 0) -> List[Dict]:
+def recursive_shuffle_playlist(playlist: List[Dict], depth: int = 0,
+                               rng: Optional[random.Random] = None) -> List[Dict]:
     """
-    Recursively shuffle a playlist using divide-and-conquer approach.
+    Shuffle a playlist uniformly at random.
+    
+    Returns a new shuffled list and leaves the input unchanged, as the
+    divide-and-conquer version did. The copy is shuffled with Fisher-Yates in
+    O(n) time; use shuffle_in_place() to avoid the copy.
     
     Args:
-        playlist: List of song dictionaries
-        depth: Current recursion depth (for safety)
+        playlist: List (or other iterable) of song dictionaries
+        depth: Kept for compatibility with the old divide-and-conquer version; ignored
+        rng: Optional random.Random instance, e.g. seeded for reproducible results
     
     Returns:
-        Shuffled list of songs
+        A new list with the songs in random order
     """
-    # Safety check to prevent infinite recursion
-    if depth > 50:
-        print("Warning: Max recursion depth reached, using simple shuffle")
-        return random.sample(playlist, len(playlist))
-    
-    # Base cases
-    if len(playlist) <= 1:
-        return playlist
-    
-    if len(playlist) == 2:
-        # Randomly swap or keep order
-        return playlist if random.random() < 0.5 else playlist[::-1]
-    
-    # Divide: split playlist in half
-    mid = len(playlist) // 2
-    left_half = playlist[:mid]
-    right_half = playlist[mid:]
+    return shuffle_in_place(list(playlist), rng)
+
+def shuffle_in_place(playlist: List[Dict], rng: Optional[random.Random] = None) -> List[Dict]:
+    """
+    Shuffle a list in place with Fisher-Yates: O(n) time, O(1) extra memory.
     
-    # Recursively shuffle each half
-    shuffled_left = recursive_shuffle_playlist(left_half, depth + 1)
-    shuffled_right = recursive_shuffle_playlist(right_half, depth + 1)
+    Every order is equally likely. Returns the same list for convenience.
+    """
+    randrange = (rng or random).randrange
+    for i in range(len(playlist) - 1, 0, -1):
+        j = randrange(i + 1)
+        playlist[i], playlist[j] = playlist[j], playlist[i]
     
-    # Conquer: merge halves with random interleaving
-    return merge_with_random_order(shuffled_left, shuffled_right, depth + 1)
+    return playlist
 
-def merge_with_random_order(left: List[Dict], right: List[Dict], depth: int) -> List[Dict]:
-    """Recursively merge two lists with random ordering decisions."""
-    if depth > 50:
-        # Fallback to simple merge if recursion too deep
-        result = []
-        left_idx = right_idx = 0
-        
-        while left_idx < len(left) and right_idx < len(right):
-            if random.random() < 0.5:
-                result.append(left[left_idx])
-                left_idx += 1
-            else:
-                result.append(right[right_idx])
-                right_idx += 1
-        
-        result.extend(left[left_idx:])
-        result.extend(right[right_idx:])
-        return result
+def merge_with_random_order(left: List[Dict], right: List[Dict], depth: int = 0,
+                            rng: Optional[random.Random] = None) -> List[Dict]:
+    """
+    Interleave two lists at random, keeping the relative order within each.
+    
+    Each step takes from a side with probability proportional to how many songs
+    it has left, so every interleaving is equally likely. Runs in O(n).
+    """
+    rand = (rng or random).random
+    result = []
+    left_idx = right_idx = 0
     
-    # Recursive merge
-    if not left:
-        return right
-    if not right:
-        return left
+    while left_idx < len(left) and right_idx < len(right):
+        left_remaining = len(left) - left_idx
+        right_remaining = len(right) - right_idx
+        if rand() * (left_remaining + right_remaining) < left_remaining:
+            result.append(left[left_idx])
+            left_idx += 1
+        else:
+            result.append(right[right_idx])
+            right_idx += 1
     
-    # Randomly choose which list to take from next
-    if random.random() < 0.5:
-        return [left[0]] + merge_with_random_order(left[1:], right, depth + 1)
-    else:
-        return [right[0]] + merge_with_random_order(left, right, depth + 1)
+    result.extend(left[left_idx:])
+    result.extend(right[right_idx:])
+    return result
 
 def main():
     """Demonstrate the recursive shuffle function."""
@@ -124,15 +115,15 @@ def main():
         for i, song in enumerate(playlist, 1):
             print(f"{i:2d}. {song['title']} - {song['artist']}")
         
-        # Shuffle recursively
-        print("\nShuffling playlist recursively...")
+        # Shuffle the playlist
+        print("\nShuffling playlist...")
         shuffled_playlist = recursive_shuffle_playlist(playlist)
         
         print("\nShuffled playlist order:")
         for i, song in enumerate(shuffled_playlist, 1):
             print(f"{i:2d}. {song['title']} - {song['artist']}")
         
-        print("\nRecursive shuffle completed! 🎵")
+        print("\nShuffle completed! 🎵")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Report Writer
+Buffered line output and row pagination for long library reports
+"""
+
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, Optional, TextIO, TypeVar
+
+# Characters collected before a write to the terminal; one print per row is far slower
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+Row = TypeVar('Row')
+
+def paginate(rows: Iterable[Row], offset: int = 0, limit: Optional[int] = None) -> Iterator[Row]:
+    """Lazily skip offset rows and stop after limit rows (None means no limit)."""
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset and limit cannot be negative")
+    return islice(rows, offset, None if limit is None else offset + limit)
+
+def page_offset(page: int, page_size: int) -> int:
+    """Return the row offset of a 1-based page number."""
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be at least 1")
+    return (page - 1) * page_size
+
+class ReportWriter:
+    """Collects report lines and writes them to a stream in large chunks.
+
+    The buffer is flushed whenever it reaches buffer_size characters and when
+    the writer is closed (or its with-block ends), so a long report appears
+    a chunk at a time instead of costing one write per line.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.lines_written = 0
+        self._lines = []
+        self._buffered = 0
+
+    def write_line(self, line: str = '') -> None:
+        """Queue one line of output."""
+        self._lines.append(line)
+        self._buffered += len(line) + 1
+        self.lines_written += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Queue several lines of output."""
+        for line in lines:
+            self.write_line(line)
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        if self._lines:
+            self._lines.append('')
+            self.stream.write('\n'.join(self._lines))
+            self._lines = []
+            self._buffered = 0
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush the remaining lines; the stream itself is left open."""
+        self.flush()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Search Index
+Trigram inverted index for substring search, and a token index for typo-tolerant ranked search
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Length of the n-grams stored in the inverted index
+NGRAM_SIZE = 3
+
+def _ngrams(text: str) -> Set[str]:
+    """Return every n-gram of an already lowercased string."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+class SubstringIndex:
+    """Answer "query in title or query in artist" without scanning every entry.
+
+    Each entry is stored under a caller-chosen key together with its lowercased
+    title and artist. Queries of NGRAM_SIZE characters or more intersect the
+    posting sets of their n-grams and only verify the surviving candidates;
+    shorter queries fall back to a scan over the prelowered strings.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[int, str, str]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._next_sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def add(self, key: Hashable, title: str, artist: str) -> None:
+        """Index an entry, replacing any previous entry with the same key."""
+        if key in self._entries:
+            self.remove(key)
+
+        title_lower = title.lower()
+        artist_lower = artist.lower()
+        self._entries[key] = (self._next_sequence, title_lower, artist_lower)
+        self._next_sequence += 1
+
+        # N-grams are taken per field so none of them span title and artist
+        for gram in _ngrams(title_lower) | _ngrams(artist_lower):
+            postings = self._postings.get(gram)
+            if postings is None:
+                self._postings[gram] = {key}
+            else:
+                postings.add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove an entry from the index."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        _, title_lower, artist_lower = entry
+        for gram in _ngrams(title_lower) | _ngrams(artist_lower):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[gram]
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._postings.clear()
+
+    def candidates(self, query: str) -> Set[Hashable]:
+        """Return the keys whose title or artist contains query (in no particular order)."""
+        query_lower = query.lower()
+
+        if len(query_lower) < NGRAM_SIZE:
+            return {key for key, (_, title, artist) in self._entries.items()
+                    if query_lower in title or query_lower in artist}
+
+        # Intersect the smallest posting sets first so the candidate set shrinks quickly
+        posting_sets = []
+        for gram in _ngrams(query_lower):
+            postings = self._postings.get(gram)
+            if not postings:
+                return set()
+            posting_sets.append(postings)
+        posting_sets.sort(key=len)
+
+        found = set(posting_sets[0])
+        for postings in posting_sets[1:]:
+            found &= postings
+            if not found:
+                return found
+
+        # N-gram overlap is necessary but not sufficient; confirm the real substring
+        entries = self._entries
+        return {key for key in found
+                if query_lower in entries[key][1] or query_lower in entries[key][2]}
+
+    def search(self, query: str) -> List[Hashable]:
+        """Return the matching keys in the order they were added."""
+        entries = self._entries
+        return sorted(self.candidates(query), key=lambda key: entries[key][0])
+
+# Words are runs of letters and digits; punctuation never has to match
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+DEFAULT_RESULT_LIMIT = 20
+
+# Query words at least this long also match longer words they start ("osb" finds "osbourne")
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 64
+
+# When no song matches every query word, partial matches are ranked from at most this many songs
+MAX_RELAXED_CANDIDATES = 50000
+
+def _tokens(text: str) -> Tuple[str, ...]:
+    """Split text into distinct lowercase words, keeping their order."""
+    return tuple(dict.fromkeys(_TOKEN_PATTERN.findall(text.lower())))
+
+def _token_ngrams(token: str) -> Set[str]:
+    """Return the n-grams of a word padded with a space on each side (one per character)."""
+    padded = f" {token} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+def max_typos(length: int) -> int:
+    """Edits allowed for a query word: none for 1-2 characters, one up to 7, then two.
+
+    Allowing two edits in shorter words lets almost any word through the n-gram filter.
+    """
+    if length <= 2:
+        return 0
+    return 1 if length <= 7 else 2
+
+def bounded_edit_distance(first: str, second: str, limit: int) -> int:
+    """Edit distance counting adjacent transpositions as one edit; returns limit + 1 once it is exceeded."""
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        current = [i] + [0] * len(second)
+        row_minimum = i
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_minimum = min(row_minimum, value)
+        if row_minimum > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+class FuzzyIndex:
+    """Ranked, typo-tolerant search over title and artist words.
+
+    Songs are indexed by their words. A query word is first expanded against
+    the much smaller vocabulary: exact word, words it is a prefix of, and words
+    within max_typos() edits, found through a trigram index over the vocabulary
+    and confirmed with bounded_edit_distance(). Each expansion has a similarity
+    in (0, 1]. A song's score is the mean, over query words, of its best
+    matching word's similarity. Songs must match every query word; if none do,
+    songs matching some of them are ranked instead. The top results are picked
+    with a heap rather than by sorting every candidate.
+    """
+
+    def __init__(self):
+        # Words of each entry, and the order entries were added in (used to break score ties)
+        self._entries: Dict[Hashable, Tuple[str, ...]] = {}
+        self._sequence: Dict[Hashable, int] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._vocabulary_grams: Dict[str, Set[str]] = {}
+        self._sorted_vocabulary: Optional[List[str]] = None
+        self._artist_tokens: Dict[str, Tuple[str, ...]] = {}
+        self._next_sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def add(self, key: Hashable, title: str, artist: str) -> None:
+        """Index an entry, replacing any previous entry with the same key."""
+        if key in self._entries:
+            self.remove(key)
+
+        # Artists repeat across many songs, so their words are split once
+        artist_tokens = self._artist_tokens.get(artist)
+        if artist_tokens is None:
+            artist_tokens = self._artist_tokens[artist] = _tokens(artist)
+        tokens = tuple(dict.fromkeys(_tokens(title) + artist_tokens))
+        self._entries[key] = tokens
+        self._sequence[key] = self._next_sequence
+        self._next_sequence += 1
+
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {key}
+                self._add_to_vocabulary(token)
+            else:
+                postings.add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove an entry from the index."""
+        tokens = self._entries.pop(key, None)
+        if tokens is None:
+            return False
+        del self._sequence[key]
+
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[token]
+                    self._remove_from_vocabulary(token)
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._sequence.clear()
+        self._postings.clear()
+        self._vocabulary_grams.clear()
+        self._sorted_vocabulary = None
+        self._artist_tokens.clear()
+
+    def search(self, query: str, limit: int = DEFAULT_RESULT_LIMIT) -> List[Tuple[Hashable, float]]:
+        """Return up to limit (key, score) pairs, best first; ties keep the order entries were added."""
+        query_tokens = _tokens(query)
+        if not query_tokens or limit <= 0:
+            return []
+
+        # For each query word: every matching song and its best similarity for that word
+        similarities: List[Dict[Hashable, float]] = []
+        for query_token in query_tokens:
+            best: Dict[Hashable, float] = {}
+            # Ascending similarity, so a song's best matching word is written last
+            for token, similarity in sorted(self._expand(query_token).items(), key=lambda item: item[1]):
+                best.update(dict.fromkeys(self._postings[token], similarity))
+            similarities.append(best)
+        similarities.sort(key=len)
+
+        candidates = set(similarities[0])
+        for best in similarities[1:]:
+            candidates = {key for key in candidates if key in best}
+            if not candidates:
+                break
+
+        if not candidates:
+            # No song has every word: rank songs matching some of them, rarest words first
+            for best in similarities:
+                if candidates and len(candidates) + len(best) > MAX_RELAXED_CANDIDATES:
+                    break
+                candidates.update(best)
+
+        word_count = len(similarities)
+        if word_count == 1:
+            scores = similarities[0]
+        else:
+            scores = {key: sum(best.get(key, 0.0) for best in similarities) / word_count for key in candidates}
+
+        # The heap only compares scores (through a C-level key); ties at the cut-off are then
+        # settled by the order entries were added, without building a tuple per candidate
+        top = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        if not top:
+            return []
+        threshold = scores[top[-1]]
+        sequence = self._sequence
+        above = sorted((key for key in top if scores[key] > threshold), key=lambda key: (-scores[key], sequence[key]))
+        tied = [key for key, score in scores.items() if score == threshold]
+        ranked = above + heapq.nsmallest(limit - len(above), tied, key=sequence.__getitem__)
+        return [(key, scores[key]) for key in ranked]
+
+    def _expand(self, query_token: str) -> Dict[str, float]:
+        """Map vocabulary words matching a query word to their similarity."""
+        matches: Dict[str, float] = {}
+        if query_token in self._postings:
+            matches[query_token] = 1.0
+
+        if len(query_token) >= MIN_PREFIX_LENGTH:
+            vocabulary = self._get_sorted_vocabulary()
+            position = bisect_left(vocabulary, query_token)
+            for token in vocabulary[position:position + MAX_PREFIX_EXPANSIONS]:
+                if not token.startswith(query_token):
+                    break
+                if token not in matches:
+                    # A longer completion is a weaker match
+                    matches[token] = 0.8 + 0.2 * len(query_token) / len(token)
+
+        limit = max_typos(len(query_token))
+        if limit:
+            shared = Counter()
+            for gram in _token_ngrams(query_token):
+                shared.update(self._vocabulary_grams.get(gram, ()))
+            # A substitution changes at most NGRAM_SIZE padded n-grams, an adjacent transposition one more
+            needed = max(1, len(query_token) - (NGRAM_SIZE + 1) * limit)
+            for token, count in shared.items():
+                if count < needed or token in matches or abs(len(token) - len(query_token)) > limit:
+                    continue
+                distance = bounded_edit_distance(query_token, token, limit)
+                if distance <= limit:
+                    matches[token] = 1.0 - distance / max(len(token), len(query_token))
+        return matches
+
+    def _get_sorted_vocabulary(self) -> List[str]:
+        """Return every indexed word in sorted order, sorting only on the first prefix query."""
+        if self._sorted_vocabulary is None:
+            self._sorted_vocabulary = sorted(self._postings)
+        return self._sorted_vocabulary
+
+    def _add_to_vocabulary(self, token: str) -> None:
+        """Index a word that no song used before."""
+        for gram in _token_ngrams(token):
+            tokens = self._vocabulary_grams.get(gram)
+            if tokens is None:
+                self._vocabulary_grams[gram] = {token}
+            else:
+                tokens.add(token)
+        if self._sorted_vocabulary is not None:
+            insort(self._sorted_vocabulary, token)
+
+    def _remove_from_vocabulary(self, token: str) -> None:
+        """Forget a word that no song uses any more."""
+        for gram in _token_ngrams(token):
+            tokens = self._vocabulary_grams.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._vocabulary_grams[gram]
+        if self._sorted_vocabulary is not None:
+            del self._sorted_vocabulary[bisect_left(self._sorted_vocabulary, token)]
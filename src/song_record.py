@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Song Record
+Compact song entry used by the music library instead of a per-song dictionary
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+class SongRecord:
+    """Read-only song entry with __slots__ storage and dictionary-style access.
+
+    Artist and file type strings are interned so every track by the same artist
+    (or of the same type) shares one string object, and filename is derived from
+    file_path instead of being stored. song['title'] keeps working everywhere a
+    song dictionary was used before. Album, track number, duration (seconds) and
+    bitrate (kbps) come from the file's tags and are None when unknown.
+    """
+
+    __slots__ = ('title', 'artist', 'file_type', 'file_path', 'file_size',
+                 'album', 'track_number', 'duration', 'bitrate')
+
+    # The six keys of the song dictionaries the library used before tags were read
+    BASE_FIELDS: Tuple[str, ...] = ('filename', 'title', 'artist', 'file_type', 'file_path', 'file_size')
+    TAG_FIELDS: Tuple[str, ...] = ('album', 'track_number', 'duration', 'bitrate')
+    FIELDS: Tuple[str, ...] = BASE_FIELDS + TAG_FIELDS
+
+    def __init__(self, title: str, artist: str, file_type: str, file_path: str, file_size: int,
+                 album: Optional[str] = None, track_number: Optional[int] = None,
+                 duration: Optional[float] = None, bitrate: Optional[int] = None):
+        self.title = title
+        self.artist = sys.intern(artist)
+        self.file_type = sys.intern(file_type)
+        self.file_path = file_path
+        self.file_size = file_size
+        self.album = sys.intern(album) if album else album
+        self.track_number = track_number
+        self.duration = duration
+        self.bitrate = bitrate
+
+    @property
+    def filename(self) -> str:
+        """File name without directory or extension."""
+        return os.path.splitext(os.path.basename(self.file_path))[0]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field value, or default for unknown keys."""
+        if key not in _FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Return the field names, like dict.keys()."""
+        return self.FIELDS
+
+    def items(self):
+        """Return (field, value) pairs, like dict.items()."""
+        return [(key, getattr(self, key)) for key in self.FIELDS]
+
+    def to_dict(self) -> Dict:
+        """Return the song as a plain dictionary: the six base keys plus any tag fields that are known."""
+        song = {key: getattr(self, key) for key in self.BASE_FIELDS}
+        song.update((key, getattr(self, key)) for key in self.TAG_FIELDS if getattr(self, key) is not None)
+        return song
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SongRecord):
+            return (self.file_path == other.file_path and self.title == other.title and
+                    self.artist == other.artist and self.file_type == other.file_type and
+                    self.file_size == other.file_size and self.album == other.album and
+                    self.track_number == other.track_number and self.duration == other.duration and
+                    self.bitrate == other.bitrate)
+        if isinstance(other, dict):
+            # A song dictionary needs every base field; tag fields it leaves out count as unknown (None)
+            if not _BASE_FIELD_SET <= other.keys() <= _FIELD_SET:
+                return False
+            return all(getattr(self, key) == other.get(key) for key in self.FIELDS)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.file_path)
+
+    def __repr__(self) -> str:
+        return (f"SongRecord(title={self.title!r}, artist={self.artist!r}, file_type={self.file_type!r}, "
+                f"file_path={self.file_path!r}, file_size={self.file_size!r}, album={self.album!r}, "
+                f"track_number={self.track_number!r}, duration={self.duration!r}, bitrate={self.bitrate!r})")
+
+_FIELD_SET = frozenset(SongRecord.FIELDS)
+_BASE_FIELD_SET = frozenset(SongRecord.BASE_FIELDS)
@@ -1,18 +1,65 @@
-import pygame
+import heapq
+import json
+import time
+from collections import deque
+from itertools import islice
+
 from .Lists_and_Tuples import MusicPlaylistManager
+from .search_index import SubstringIndex
+from .history_log import HistoryLog
+from .audio_backend import AudioBackendError, create_audio_backend
+from .playback_engine import PlaybackEngine, PlaylistSource, QueueSource
+from .prefetch_cache import PrefetchCache
 
 class SongQueue:
-    def __init__(self):
-        self.queue = []
+    # What to do when a bounded queue is full: refuse the new song, or evict the oldest one
+    OVERFLOW_POLICIES = ('reject', 'drop_oldest')
+
+    def __init__(self, capacity=None, overflow_policy='reject'):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if capacity is not None and capacity < 1:
+            raise ValueError("Queue capacity must be at least 1")
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        # A deque with maxlen already evicts from the left when full
+        maxlen = capacity if overflow_policy == 'drop_oldest' else None
+        self.queue = deque(maxlen=maxlen)
 
     def enqueue(self, song):
+        if self._is_full() and self.overflow_policy == 'reject':
+            return False
         self.queue.append(song)
+        return True
+
+    def enqueue_many(self, songs):
+        if self.capacity is not None and self.overflow_policy == 'reject':
+            songs = islice(songs, max(0, self.capacity - len(self.queue)))
+        songs = list(songs)
+        self.queue.extend(songs)
+        return len(songs)
 
     def dequeue(self):
         if self.queue:
-            return self.queue.pop(0)
+            return self.queue.popleft()
+        return None
+
+    def dequeue_many(self, count):
+        count = min(count, len(self.queue))
+        popleft = self.queue.popleft
+        return [popleft() for _ in range(count)]
+
+    def peek(self):
+        if self.queue:
+            return self.queue[0]
         return None
 
+    def peek_many(self, count):
+        return list(islice(self.queue, count))
+
+    def _is_full(self):
+        return self.capacity is not None and len(self.queue) >= self.capacity
+
     def get_size(self):
         return len(self.queue)
 
@@ -24,84 +71,361 @@ class SongQueue:
             print(f"{i}. {song['title']} - {song['artist']}")
 
 class PrioritySongQueue:
+    # Heap entries are [-priority, sequence, song, heap_position]; the sequence
+    # number keeps songs of equal priority in FIFO order
     def __init__(self):
-        self.queue = []
+        self.heap = []
+        self._sequence = 0
+        self._entries_by_title = {}
+        self._entries_by_path = {}
 
     def enqueue(self, song, priority=0):
-        self.queue.append((song, priority))
-        self.queue.sort(key=lambda x: x[1], reverse=True)
+        entry = [-priority, self._sequence, song, len(self.heap)]
+        self._sequence += 1
+        self.heap.append(entry)
+        self._sift_up(entry[3])
+        self._add_handle(self._entries_by_title, song['title'].lower(), entry)
+        self._add_handle(self._entries_by_path, song.get('file_path'), entry)
 
     def dequeue(self):
-        if self.queue:
-            return self.queue.pop(0)[0]
+        if self.heap:
+            entry = self.heap[0]
+            self._remove_entry(entry)
+            return entry[2]
         return None
 
+    def peek(self):
+        if self.heap:
+            return self.heap[0][2]
+        return None
+
+    def peek_many(self, count):
+        # The next `count` songs in dequeue order, without touching the heap
+        return [entry[2] for entry in heapq.nsmallest(count, self.heap, key=lambda e: (e[0], e[1]))]
+
     def get_size(self):
-        return len(self.queue)
+        return len(self.heap)
 
     def clear_queue(self):
-        self.queue.clear()
+        self.heap.clear()
+        self._entries_by_title.clear()
+        self._entries_by_path.clear()
 
     def display_queue(self):
-        for i, (song, priority) in enumerate(self.queue, 1):
-            print(f"{i}. {song['title']} - {song['artist']} (Priority: {priority})")
+        # Highest priority first; only the display pays for a full sort
+        for i, (neg_priority, _, song, _) in enumerate(sorted(self.heap, key=lambda e: (e[0], e[1])), 1):
+            print(f"{i}. {song['title']} - {song['artist']} (Priority: {-neg_priority})")
+
+    def upvote(self, song_key):
+        return self._change_priority(song_key, 1)
+
+    def downvote(self, song_key):
+        return self._change_priority(song_key, -1)
+
+    def remove(self, song_key):
+        entry = self._find_entry(song_key)
+        if entry is None:
+            return False
+        self._remove_entry(entry)
+        return True
+
+    def _change_priority(self, song_key, delta):
+        entry = self._find_entry(song_key)
+        if entry is None:
+            return False
+        entry[0] -= delta
+        self._sift_up(entry[3])
+        self._sift_down(entry[3])
+        return True
+
+    def _find_entry(self, song_key):
+        # song_key is a title (case-insensitive) or a file path; like the old
+        # sorted-list scan, the highest-priority match wins
+        entries = self._entries_by_title.get(song_key.lower()) or self._entries_by_path.get(song_key)
+        if not entries:
+            return None
+        return min(entries.values(), key=lambda e: (e[0], e[1]))
+
+    def _remove_entry(self, entry):
+        position = entry[3]
+        last = self.heap.pop()
+        if last is not entry:
+            self.heap[position] = last
+            last[3] = position
+            self._sift_up(position)
+            self._sift_down(last[3])
+        song = entry[2]
+        self._remove_handle(self._entries_by_title, song['title'].lower(), entry)
+        self._remove_handle(self._entries_by_path, song.get('file_path'), entry)
 
-    def upvote(self, song_title):
-        for i, (song, priority) in enumerate(self.queue):
-            if song['title'].lower() == song_title.lower():
-                self.queue[i] = (song, priority + 1)
-                self.queue.sort(key=lambda x: x[1], reverse=True)
-                return True
-        return False
+    def _sift_up(self, position):
+        heap = self.heap
+        entry = heap[position]
+        while position > 0:
+            parent_position = (position - 1) // 2
+            parent = heap[parent_position]
+            if not self._before(entry, parent):
+                break
+            heap[position] = parent
+            parent[3] = position
+            position = parent_position
+        heap[position] = entry
+        entry[3] = position
+
+    def _sift_down(self, position):
+        heap = self.heap
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child_position = 2 * position + 1
+            if child_position >= size:
+                break
+            right_position = child_position + 1
+            if right_position < size and self._before(heap[right_position], heap[child_position]):
+                child_position = right_position
+            child = heap[child_position]
+            if not self._before(child, entry):
+                break
+            heap[position] = child
+            child[3] = position
+            position = child_position
+        heap[position] = entry
+        entry[3] = position
+
+    @staticmethod
+    def _before(a, b):
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    @staticmethod
+    def _add_handle(handles, key, entry):
+        if key is not None:
+            handles.setdefault(key, {})[entry[1]] = entry
+
+    @staticmethod
+    def _remove_handle(handles, key, entry):
+        entries = handles.get(key)
+        if entries is not None:
+            entries.pop(entry[1], None)
+            if not entries:
+                del handles[key]
 
 class ListeningHistoryStack:
-    def __init__(self):
-        self.stack = []
+    # Entries are (sequence, timestamp, song) tuples kept in a fixed-size ring
+    # buffer; the oldest entry is evicted (and optionally spilled to disk) when full
+    def __init__(self, capacity=1000, spill_path=None):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._buffer = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self._next_sequence = 0
+        self._spill_file = None
+        self.search_index = SubstringIndex()
+        self._sequences_by_artist = {}
+        self._sequences_by_title = {}
+
+    def push(self, song, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        if self._count:
+            # Keep timestamps non-decreasing so time-window queries can binary search
+            timestamp = max(timestamp, self._entry_at(self._count - 1)[1])
+        if self._count == self.capacity:
+            self._evict_oldest()
+
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._buffer[(self._start + self._count) % self.capacity] = (sequence, timestamp, song)
+        self._count += 1
 
-    def push(self, song):
-        self.stack.append(song)
+        self.search_index.add(sequence, song['title'], song['artist'])
+        self._sequences_by_artist.setdefault(song['artist'].lower(), deque()).append(sequence)
+        self._sequences_by_title.setdefault(song['title'].lower(), deque()).append(sequence)
 
     def get_size(self):
-        return len(self.stack)
+        return self._count
+
+    def get_recent(self, limit=10):
+        limit = min(limit, self._count)
+        return [self._entry_at(i)[2] for i in range(self._count - limit, self._count)]
 
     def display_history(self, limit=10):
-        for i, song in enumerate(self.stack[-limit:], 1):
+        for i, song in enumerate(self.get_recent(limit), 1):
             print(f"{i}. {song['title']} - {song['artist']}")
 
     def search_history(self, query):
-        return [song for song in self.stack if query.lower() in song['title'].lower() or query.lower() in song['artist'].lower()]
+        return [self._entry_for_sequence(sequence)[2]
+                for sequence in sorted(self.search_index.candidates(query))]
+
+    def played_since(self, timestamp):
+        # Binary search for the first entry at or after timestamp
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._entry_at(middle)[1] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return [self._entry_at(i)[2] for i in range(low, self._count)]
+
+    def played_within(self, seconds):
+        return self.played_since(time.time() - seconds)
+
+    def plays_by_artist(self, artist, since=None):
+        return self._plays(self._sequences_by_artist.get(artist.lower(), ()), since)
+
+    def plays_of_title(self, title, since=None):
+        return self._plays(self._sequences_by_title.get(title.lower(), ()), since)
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _plays(self, sequences, since):
+        entries = [self._entry_for_sequence(sequence) for sequence in sequences]
+        return [song for _, timestamp, song in entries if since is None or timestamp >= since]
+
+    def _entry_at(self, index):
+        return self._buffer[(self._start + index) % self.capacity]
+
+    def _entry_for_sequence(self, sequence):
+        oldest_sequence = self._entry_at(0)[0]
+        return self._entry_at(sequence - oldest_sequence)
+
+    def _evict_oldest(self):
+        sequence, timestamp, song = self._buffer[self._start]
+        self._buffer[self._start] = None
+        self._start = (self._start + 1) % self.capacity
+        self._count -= 1
+
+        # The evicted entry is the oldest overall, so it is also first in its artist/title lists
+        self.search_index.remove(sequence)
+        for lookup, key in ((self._sequences_by_artist, song['artist'].lower()),
+                            (self._sequences_by_title, song['title'].lower())):
+            sequences = lookup[key]
+            sequences.popleft()
+            if not sequences:
+                del lookup[key]
+
+        if self.spill_path:
+            self._spill(timestamp, song)
+
+    def _spill(self, timestamp, song):
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+        record = {'timestamp': timestamp, 'title': song['title'], 'artist': song['artist'],
+                  'file_path': song.get('file_path')}
+        self._spill_file.write(json.dumps(record) + "\n")
 
 class MusicPlayerStacksQueues:
-    def __init__(self, music_manager):
-        pygame.mixer.init()
+    def __init__(self, music_manager, history_log_dir=None, backend=None, prefetch_cache=None, prefetch_count=3):
+        # The default backend only imports pygame and starts the mixer when the first song plays
+        self.backend = backend if backend is not None else create_audio_backend()
+        # Upcoming tracks are read into memory ahead of time so track changes don't wait on disk
+        self.prefetch_cache = prefetch_cache if prefetch_cache is not None else PrefetchCache()
+        self.prefetch_count = prefetch_count
         self.music_manager = music_manager
         self.play_next_queue = SongQueue()
         self.party_queue = PrioritySongQueue()
         self.listening_history = ListeningHistoryStack()
         self.currently_playing = None
+        self.engine = None
+        self.history_log = None
+        if history_log_dir:
+            # Opening the log first finishes or discards a compaction a crash left behind
+            self.history_log = HistoryLog(history_log_dir)
+            self._restore_history(self.history_log)
+
+    def _restore_history(self, history_log):
+        for event in history_log.load(history_log.log_directory, limit=self.listening_history.capacity):
+            song = self.music_manager.get_song_by_path(event.get('file_path'))
+            if song is None:
+                song = {'title': event['title'], 'artist': event['artist'],
+                        'file_path': event.get('file_path')}
+            self.listening_history.push(song, timestamp=event.get('timestamp'))
+
+    def close(self):
+        self._stop_engine()
+        if self.history_log is not None:
+            self.history_log.close()
+            self.history_log = None
+        self.listening_history.close()
+        self.prefetch_cache.close()
 
     def play_song(self, song):
+        self._stop_engine()
         try:
-            pygame.mixer.music.load(song['file_path'])
-            pygame.mixer.music.play()
-            self.currently_playing = song
-            self.listening_history.push(song)
-            print(f"🎵 Playing: {song['title']} - {song['artist']}")
-        except pygame.error as e:
+            self.backend.load(self._open_track(song))
+            self.backend.play()
+            self._record_play(song)
+        except AudioBackendError as e:
             print(f"❌ Error playing song: {e}")
             self.currently_playing = None
 
+    def play_in_background(self, source):
+        # Plays songs from source one after another on the engine thread and returns immediately
+        self._stop_engine()
+        self.engine = PlaybackEngine(self.backend, source, on_track_start=self._engine_track_started,
+                                     on_error=self._report_error, open_track=self._open_track)
+        self.engine.start()
+        return self.engine
+
+    def play_playlist_in_background(self, playlist, repeat=True):
+        return self.play_in_background(PlaylistSource(playlist, repeat))
+
+    def play_queue_in_background(self, song_queue):
+        return self.play_in_background(QueueSource(song_queue))
+
+    def skip_song(self):
+        if self.engine is not None and self.engine.is_running():
+            self.engine.skip()
+
     def stop_song(self):
-        pygame.mixer.music.stop()
+        self._stop_engine()
+        self.backend.stop()
         self.currently_playing = None
 
+    def _stop_engine(self):
+        if self.engine is not None:
+            self.engine.stop()
+            self.engine = None
+
+    def _engine_track_started(self, song):
+        self._record_play(song)
+        engine = self.engine
+        if engine is not None:
+            self.prefetch(engine.source.upcoming(self.prefetch_count))
+
+    def prefetch(self, songs):
+        self.prefetch_cache.prefetch(song.get('file_path') for song in songs)
+
+    def _open_track(self, song):
+        return self.prefetch_cache.open(song['file_path'])
+
+    def _record_play(self, song):
+        self.currently_playing = song
+        self.listening_history.push(song)
+        if self.history_log is not None:
+            self.history_log.record_play(song)
+        print(f"🎵 Playing: {song['title']} - {song['artist']}")
+
+    def _report_error(self, song, error):
+        print(f"❌ Error playing {song['title']}: {error}")
+
     def add_to_play_next(self, song):
-        self.play_next_queue.enqueue(song)
+        if not self.play_next_queue.enqueue(song):
+            print(f"Play next queue is full ({self.play_next_queue.capacity} songs).")
+        elif self.play_next_queue.get_size() <= self.prefetch_count:
+            self.prefetch([song])
 
     def play_next_song(self):
         song = self.play_next_queue.dequeue()
         if song:
             self.play_song(song)
+            self.prefetch(self.play_next_queue.peek_many(self.prefetch_count))
         else:
             print("No songs in play next queue.")
 
@@ -112,6 +436,7 @@ class MusicPlayerStacksQueues:
         song = self.party_queue.dequeue()
         if song:
             self.play_song(song)
+            self.prefetch(self.party_queue.peek_many(self.prefetch_count))
         else:
             print("No songs in party queue.")
 
@@ -121,6 +446,12 @@ class MusicPlayerStacksQueues:
         else:
             print(f"Song not found in party queue: {song_title}")
 
+    def downvote_song_in_party_queue(self, song_title):
+        if self.party_queue.downvote(song_title):
+            print(f"Downvoted: {song_title}")
+        else:
+            print(f"Song not found in party queue: {song_title}")
+
     def display_all_queues(self):
         print("\nPlay Next Queue:")
         self.play_next_queue.display_queue()
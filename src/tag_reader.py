@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Tag Reader
+Stdlib-only readers for ID3v2/MPEG, FLAC, Ogg Vorbis/Opus, MP4 and WAV headers
+"""
+
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+# Keys read_tags() may return; anything a file doesn't provide is simply missing
+TAG_FIELDS = ('title', 'artist', 'album', 'track_number', 'duration', 'bitrate')
+
+# Frames larger than this are never text we care about (usually cover art), so they are skipped
+MAX_TEXT_FIELD_BYTES = 64 * 1024
+
+# How far past the ID3 tag to look for the first MPEG frame
+MPEG_SYNC_SEARCH_BYTES = 64 * 1024
+
+# Ogg header packets are read from at most this many bytes at the start of the file
+OGG_HEADER_BYTES = 256 * 1024
+OGG_TAIL_BYTES = 64 * 1024
+
+ID3_FRAMES = {
+    'TIT2': 'title', 'TPE1': 'artist', 'TALB': 'album', 'TRCK': 'track_number', 'TLEN': 'duration',
+    # ID3v2.2 uses three-character frame ids
+    'TT2': 'title', 'TP1': 'artist', 'TAL': 'album', 'TRK': 'track_number', 'TLE': 'duration'
+}
+VORBIS_FIELDS = {'TITLE': 'title', 'ARTIST': 'artist', 'ALBUM': 'album', 'TRACKNUMBER': 'track_number'}
+MP4_FIELDS = {b'\xa9nam': 'title', b'\xa9ART': 'artist', b'\xa9alb': 'album', b'trkn': 'track_number'}
+RIFF_INFO_FIELDS = {b'INAM': 'title', b'IART': 'artist', b'IPRD': 'album', b'ITRK': 'track_number'}
+
+# MPEG audio: bitrates in kbps indexed by [MPEG-1?][layer][bitrate_index]
+_MPEG_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def read_tags(file_path: str) -> Dict:
+    """Read title/artist/album/track number and duration/bitrate from a file's headers.
+
+    Only header bytes are read (plus the last page of Ogg files). Returns an
+    empty dictionary for unknown or unreadable files; never raises for bad data.
+    """
+    tags: Dict = {}
+    try:
+        with open(file_path, 'rb') as audio_file:
+            file_size = os.fstat(audio_file.fileno()).st_size
+            magic = audio_file.read(12)
+            audio_file.seek(0)
+
+            if magic[:3] == b'ID3':
+                audio_start = _read_id3v2(audio_file, tags)
+                audio_file.seek(audio_start)
+                if audio_file.read(4) == b'fLaC':
+                    _read_flac(audio_file, audio_start + 4, file_size, tags)
+                else:
+                    _read_mpeg(audio_file, audio_start, file_size, tags)
+            elif magic[:4] == b'fLaC':
+                _read_flac(audio_file, 4, file_size, tags)
+            elif magic[:4] == b'OggS':
+                _read_ogg(audio_file, file_size, tags)
+            elif magic[:4] == b'RIFF' and magic[8:12] == b'WAVE':
+                _read_wav(audio_file, file_size, tags)
+            elif magic[4:8] == b'ftyp':
+                _read_mp4(audio_file, file_size, tags)
+            elif file_path.lower().endswith('.mp3'):
+                _read_mpeg(audio_file, 0, file_size, tags)
+    except (OSError, ValueError, IndexError, struct.error):
+        # Whatever was read before the damaged part is still useful
+        pass
+
+    return {key: value for key, value in tags.items() if value not in (None, '')}
+
+# --- ID3v2 / MPEG -----------------------------------------------------------
+
+def _syncsafe(data: bytes) -> int:
+    """Decode a 28-bit ID3 synchsafe integer."""
+    return (data[0] & 0x7f) << 21 | (data[1] & 0x7f) << 14 | (data[2] & 0x7f) << 7 | (data[3] & 0x7f)
+
+def _read_id3v2(audio_file: BinaryIO, tags: Dict) -> int:
+    """Read text frames from an ID3v2 tag and return the offset where the audio starts."""
+    header = audio_file.read(10)
+    major_version, flags = header[3], header[5]
+    tag_end = 10 + _syncsafe(header[6:10])
+    audio_start = tag_end + (10 if flags & 0x10 else 0)
+
+    position = 10
+    if flags & 0x40:
+        # Extended header: v2.4 stores its full size, v2.3 the size excluding the length field
+        extended = audio_file.read(4)
+        position += _syncsafe(extended) if major_version == 4 else 4 + struct.unpack('>I', extended)[0]
+
+    if major_version == 2:
+        id_length, header_length = 3, 6
+    else:
+        id_length, header_length = 4, 10
+
+    while position + header_length <= tag_end:
+        audio_file.seek(position)
+        frame_header = audio_file.read(header_length)
+        if len(frame_header) < header_length or frame_header[0] == 0:
+            break  # padding
+
+        if major_version == 2:
+            frame_size = int.from_bytes(frame_header[3:6], 'big')
+        elif major_version == 4:
+            frame_size = _syncsafe(frame_header[4:8])
+        else:
+            frame_size = struct.unpack('>I', frame_header[4:8])[0]
+        if frame_size <= 0:
+            break
+
+        field = ID3_FRAMES.get(frame_header[:id_length].decode('latin-1'))
+        if field and frame_size <= MAX_TEXT_FIELD_BYTES:
+            text = _decode_id3_text(audio_file.read(frame_size))
+            if field == 'duration':
+                milliseconds = _parse_int(text)
+                tags[field] = milliseconds / 1000 if milliseconds else None
+            elif field == 'track_number':
+                tags[field] = _parse_int(text)
+            else:
+                tags[field] = text
+        position += header_length + frame_size
+
+    return audio_start
+
+def _decode_id3_text(data: bytes) -> str:
+    """Decode an ID3 text frame, keeping only the first value."""
+    if not data:
+        return ''
+    encoding, payload = data[0], data[1:]
+    if encoding == 1:
+        text = payload.decode('utf-16', errors='replace')
+    elif encoding == 2:
+        text = payload.decode('utf-16-be', errors='replace')
+    elif encoding == 3:
+        text = payload.decode('utf-8', errors='replace')
+    else:
+        text = payload.decode('latin-1')
+    return text.split('\x00', 1)[0].strip()
+
+def _read_mpeg(audio_file: BinaryIO, audio_start: int, file_size: int, tags: Dict) -> None:
+    """Find the first MPEG frame for bitrate/duration, and fall back to an ID3v1 tag for text."""
+    audio_end = file_size
+    if 'title' not in tags and file_size >= 128:
+        audio_file.seek(file_size - 128)
+        id3v1 = audio_file.read(128)
+        if id3v1[:3] == b'TAG':
+            audio_end -= 128
+            for field, start, end in (('title', 3, 33), ('artist', 33, 63), ('album', 63, 93)):
+                tags.setdefault(field, id3v1[start:end].split(b'\x00', 1)[0].decode('latin-1').strip())
+            if id3v1[125] == 0 and id3v1[126]:
+                tags.setdefault('track_number', id3v1[126])
+
+    audio_file.seek(audio_start)
+    data = audio_file.read(MPEG_SYNC_SEARCH_BYTES)
+    offset = data.find(b'\xff')
+    while 0 <= offset <= len(data) - 4:
+        frame = _parse_mpeg_header(data[offset:offset + 4])
+        if frame is not None:
+            break
+        offset = data.find(b'\xff', offset + 1)
+    else:
+        return
+
+    is_mpeg1, layer, bitrate, sample_rate, mono = frame
+    samples_per_frame = 384 if layer == 1 else (1152 if is_mpeg1 or layer == 2 else 576)
+    audio_bytes = audio_end - audio_start - offset
+
+    # A Xing/Info header in the first frame gives the exact frame count of VBR files
+    side_info = (17 if mono else 32) if is_mpeg1 else (9 if mono else 17)
+    xing = data[offset + 4 + side_info:offset + 4 + side_info + 12]
+    if layer == 3 and xing[:4] in (b'Xing', b'Info'):
+        flags = struct.unpack('>I', xing[4:8])[0]
+        if flags & 1:
+            frame_count = struct.unpack('>I', xing[8:12])[0]
+            duration = frame_count * samples_per_frame / sample_rate
+            if duration > 0:
+                tags.setdefault('duration', duration)
+                tags['bitrate'] = round(audio_bytes * 8 / duration / 1000)
+                return
+
+    tags['bitrate'] = bitrate
+    if bitrate:
+        tags.setdefault('duration', audio_bytes * 8 / (bitrate * 1000))
+
+def _parse_mpeg_header(header: bytes) -> Optional[Tuple[bool, int, int, int, bool]]:
+    """Parse a 4-byte MPEG audio frame header into (is_mpeg1, layer, kbps, sample_rate, mono)."""
+    if len(header) < 4 or header[0] != 0xff or header[1] & 0xe0 != 0xe0:
+        return None
+    version_bits = (header[1] >> 3) & 3
+    layer_bits = (header[1] >> 1) & 3
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    is_mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = _MPEG_BITRATES[(is_mpeg1, layer)][bitrate_index]
+    sample_rate = _MPEG_SAMPLE_RATES[version_bits][sample_rate_index]
+    return is_mpeg1, layer, bitrate, sample_rate, (header[3] >> 6) == 3
+
+# --- FLAC / Vorbis comments ---------------------------------------------------
+
+def _read_flac(audio_file: BinaryIO, position: int, file_size: int, tags: Dict) -> None:
+    """Walk the FLAC metadata blocks for STREAMINFO and VORBIS_COMMENT."""
+    while position + 4 <= file_size:
+        audio_file.seek(position)
+        block_header = audio_file.read(4)
+        if len(block_header) < 4:
+            break
+        is_last = block_header[0] & 0x80
+        block_type = block_header[0] & 0x7f
+        block_length = int.from_bytes(block_header[1:4], 'big')
+
+        if block_type == 0:
+            info = audio_file.read(34)
+            sample_rate = info[10] << 12 | info[11] << 4 | info[12] >> 4
+            total_samples = (info[13] & 0x0f) << 32 | struct.unpack('>I', info[14:18])[0]
+            if sample_rate and total_samples:
+                duration = total_samples / sample_rate
+                tags['duration'] = duration
+                tags['bitrate'] = round(file_size * 8 / duration / 1000)
+        elif block_type == 4:
+            _parse_vorbis_comment(audio_file.read(min(block_length, MAX_TEXT_FIELD_BYTES * 4)), tags)
+
+        if is_last:
+            break
+        position += 4 + block_length
+
+def _parse_vorbis_comment(data: bytes, tags: Dict) -> None:
+    """Parse a little-endian Vorbis comment block, stopping quietly at truncated data."""
+    if len(data) < 8:
+        return
+    vendor_length = struct.unpack_from('<I', data)[0]
+    position = 4 + vendor_length
+    if position + 4 > len(data):
+        return
+    count = struct.unpack_from('<I', data, position)[0]
+    position += 4
+
+    for _ in range(count):
+        if position + 4 > len(data):
+            break
+        length = struct.unpack_from('<I', data, position)[0]
+        position += 4
+        comment = data[position:position + length]
+        position += length
+        key, separator, value = comment.partition(b'=')
+        field = VORBIS_FIELDS.get(key.decode('ascii', errors='replace').upper()) if separator else None
+        if field and field not in tags:
+            text = value.decode('utf-8', errors='replace').strip()
+            tags[field] = _parse_int(text) if field == 'track_number' else text
+
+# --- Ogg ----------------------------------------------------------------------
+
+def _iter_ogg_packets(data: bytes) -> Iterator[bytes]:
+    """Yield complete packets from the Ogg pages at the start of data."""
+    packet = b''
+    position = 0
+    while data[position:position + 4] == b'OggS' and position + 27 <= len(data):
+        segment_count = data[position + 26]
+        table = data[position + 27:position + 27 + segment_count]
+        body = position + 27 + segment_count
+        for lacing in table:
+            packet += data[body:body + lacing]
+            body += lacing
+            if lacing < 255:
+                yield packet
+                packet = b''
+        position = body
+
+def _read_ogg(audio_file: BinaryIO, file_size: int, tags: Dict) -> None:
+    """Read the Vorbis/Opus identification and comment headers, and the final granule position."""
+    packets = _iter_ogg_packets(audio_file.read(OGG_HEADER_BYTES))
+    first = next(packets, b'')
+    second = next(packets, b'')
+
+    if first.startswith(b'\x01vorbis'):
+        sample_rate = struct.unpack_from('<I', first, 12)[0]
+        nominal_bitrate = struct.unpack_from('<i', first, 20)[0]
+        pre_skip = 0
+        if nominal_bitrate > 0:
+            tags['bitrate'] = round(nominal_bitrate / 1000)
+        if second.startswith(b'\x03vorbis'):
+            _parse_vorbis_comment(second[7:], tags)
+    elif first.startswith(b'OpusHead'):
+        # Opus granule positions always count 48 kHz samples
+        sample_rate = 48000
+        pre_skip = struct.unpack_from('<H', first, 10)[0]
+        if second.startswith(b'OpusTags'):
+            _parse_vorbis_comment(second[8:], tags)
+    else:
+        return
+
+    # The granule position of the last page is the total sample count
+    tail_start = max(0, file_size - OGG_TAIL_BYTES)
+    audio_file.seek(tail_start)
+    tail = audio_file.read()
+    last_page = tail.rfind(b'OggS')
+    if last_page >= 0 and last_page + 14 <= len(tail) and sample_rate:
+        granule = struct.unpack_from('<q', tail, last_page + 6)[0]
+        if granule > pre_skip:
+            duration = (granule - pre_skip) / sample_rate
+            tags['duration'] = duration
+            tags.setdefault('bitrate', round(file_size * 8 / duration / 1000))
+
+# --- MP4 ----------------------------------------------------------------------
+
+def _iter_atoms(audio_file: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, data_start, atom_end) for the atoms between start and end."""
+    position = start
+    while position + 8 <= end:
+        audio_file.seek(position)
+        header = audio_file.read(8)
+        if len(header) < 8:
+            return
+        size, atom_type = struct.unpack('>I4s', header)
+        header_length = 8
+        if size == 1:
+            size = struct.unpack('>Q', audio_file.read(8))[0]
+            header_length = 16
+        elif size == 0:
+            size = end - position
+        if size < header_length:
+            return
+        yield atom_type, position + header_length, position + size
+        position += size
+
+def _find_atom(audio_file: BinaryIO, start: int, end: int, path: Tuple[bytes, ...]) -> Optional[Tuple[int, int]]:
+    """Follow a path of nested atom types and return the (data_start, end) of the last one."""
+    for atom_type in path:
+        for found_type, data_start, atom_end in _iter_atoms(audio_file, start, end):
+            if found_type == atom_type:
+                start, end = data_start, atom_end
+                break
+        else:
+            return None
+    return start, end
+
+def _read_mp4(audio_file: BinaryIO, file_size: int, tags: Dict) -> None:
+    """Read the duration from mvhd and the iTunes-style tags from moov/udta/meta/ilst."""
+    moov = _find_atom(audio_file, 0, file_size, (b'moov',))
+    if moov is None:
+        return
+
+    mvhd = _find_atom(audio_file, moov[0], moov[1], (b'mvhd',))
+    if mvhd is not None:
+        audio_file.seek(mvhd[0])
+        data = audio_file.read(32)
+        if data[0] == 1:
+            timescale, duration_units = struct.unpack_from('>IQ', data, 20)
+        else:
+            timescale, duration_units = struct.unpack_from('>II', data, 12)
+        if timescale and duration_units:
+            duration = duration_units / timescale
+            tags['duration'] = duration
+            tags['bitrate'] = round(file_size * 8 / duration / 1000)
+
+    meta = _find_atom(audio_file, moov[0], moov[1], (b'udta', b'meta'))
+    if meta is None:
+        return
+    # meta is normally a full box with four bytes of version/flags before its children,
+    # but QuickTime writes it as a plain container that starts straight with hdlr
+    audio_file.seek(meta[0])
+    meta_start = meta[0] if audio_file.read(8)[4:8] == b'hdlr' else meta[0] + 4
+    ilst = _find_atom(audio_file, meta_start, meta[1], (b'ilst',))
+    if ilst is None:
+        return
+
+    for item_type, item_start, item_end in _iter_atoms(audio_file, ilst[0], ilst[1]):
+        field = MP4_FIELDS.get(item_type)
+        if field is None or item_end - item_start > MAX_TEXT_FIELD_BYTES:
+            continue
+        for data_type, data_start, data_end in _iter_atoms(audio_file, item_start, item_end):
+            if data_type != b'data':
+                continue
+            audio_file.seek(data_start)
+            # Skip the 4-byte type indicator and 4-byte locale
+            value = audio_file.read(data_end - data_start)[8:]
+            if field == 'track_number':
+                tags[field] = struct.unpack('>H', value[2:4])[0] if len(value) >= 4 else None
+            else:
+                tags[field] = value.decode('utf-8', errors='replace').strip()
+            break
+
+# --- WAV ----------------------------------------------------------------------
+
+def _read_wav(audio_file: BinaryIO, file_size: int, tags: Dict) -> None:
+    """Read the fmt and data chunks for duration/bitrate, and LIST/INFO for text tags."""
+    byte_rate = 0
+    data_size = 0
+    position = 12
+    while position + 8 <= file_size:
+        audio_file.seek(position)
+        chunk_id, chunk_size = struct.unpack('<4sI', audio_file.read(8))
+        if chunk_id == b'fmt ':
+            byte_rate = struct.unpack('<I', audio_file.read(12)[8:12])[0]
+        elif chunk_id == b'data':
+            data_size = min(chunk_size, file_size - position - 8)
+        elif chunk_id == b'LIST' and chunk_size <= MAX_TEXT_FIELD_BYTES:
+            _parse_riff_info(audio_file.read(chunk_size), tags)
+        # Chunks are padded to an even length
+        position += 8 + chunk_size + (chunk_size & 1)
+
+    if byte_rate:
+        tags['bitrate'] = round(byte_rate * 8 / 1000)
+        if data_size:
+            tags['duration'] = data_size / byte_rate
+
+def _parse_riff_info(data: bytes, tags: Dict) -> None:
+    """Parse the sub-chunks of a LIST/INFO chunk."""
+    if data[:4] != b'INFO':
+        return
+    position = 4
+    while position + 8 <= len(data):
+        sub_id, sub_size = struct.unpack_from('<4sI', data, position)
+        value = data[position + 8:position + 8 + sub_size].split(b'\x00', 1)[0]
+        field = RIFF_INFO_FIELDS.get(sub_id)
+        if field:
+            text = value.decode('utf-8', errors='replace').strip()
+            tags[field] = _parse_int(text) if field == 'track_number' else text
+        position += 8 + sub_size + (sub_size & 1)
+
+def _parse_int(text: str) -> Optional[int]:
+    """Parse the leading number of values like '3' or '3/12'."""
+    digits = text.split('/', 1)[0].strip()
+    return int(digits) if digits.isdigit() else None
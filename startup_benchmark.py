@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures how long main.py takes to reach the main menu, plus the slowest imports (python -X importtime)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT = os.path.join(PROJECT_DIR, 'main.py')
+MENU_MARKER = 'MAIN MUSIC PLAYER MENU'
+
+# Cold start to the main menu, without audio, should stay under this
+TARGET_SECONDS = 0.100
+
+def time_to_menu(music_dir: str, extra_args: Tuple[str, ...] = ('--no-audio',)) -> float:
+    """Run main.py once and return the seconds until the main menu is printed."""
+    env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN_SCRIPT, *extra_args], cwd=PROJECT_DIR, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding='utf-8')
+    # Answer the music directory prompt, then choose "Exit" at the menu
+    process.stdin.write(f"{music_dir}\n6\n")
+    process.stdin.flush()
+
+    elapsed = None
+    for line in process.stdout:
+        if MENU_MARKER in line:
+            elapsed = time.perf_counter() - started
+            break
+    process.communicate()
+    if elapsed is None:
+        raise RuntimeError("main.py exited without showing the main menu")
+    return elapsed
+
+def slowest_imports(limit: int = 10) -> List[Tuple[int, str]]:
+    """Return (cumulative microseconds, module) for the slowest imports of main.py."""
+    code = "import sys; sys.argv = ['main.py']; import main"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_DIR,
+                            capture_output=True, text=True)
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        timings.append((int(cumulative), module.rstrip()))
+    timings.sort(reverse=True)
+    return timings[:limit]
+
+def main():
+    """Print startup timings for main.py."""
+    music_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(PROJECT_DIR, 'music')
+    runs = 5
+
+    # The first run builds the library index; later runs are the normal startup path
+    time_to_menu(music_dir)
+    samples = [time_to_menu(music_dir) for _ in range(runs)]
+    median = statistics.median(samples)
+
+    print(f"⏱️  Startup to main menu (no audio, {runs} runs): "
+          f"median {median * 1000:.1f} ms, best {min(samples) * 1000:.1f} ms")
+    status = "✅ within" if median <= TARGET_SECONDS else "❌ over"
+    print(f"{status} the {TARGET_SECONDS * 1000:.0f} ms target")
+
+    print("\nSlowest imports (cumulative):")
+    for microseconds, module in slowest_imports():
+        print(f"  {microseconds / 1000:7.1f} ms  {module}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Substring Benchmark
+Times Search Songs through the trigram substring index against the linear scan it replaced
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
+
+from search_index import SubstringIndex
+from search_benchmark import create_library
+
+# From two characters (below the n-gram size, so the index scans too) up to a full name
+QUERIES = ('oz', 'the', 'love', 'train', 'osbourne', 'night river', 'crazy train', 'zzzzqx')
+
+def linear_scan(songs: List[Tuple[str, str]], query: str) -> List[int]:
+    """The original search: lowercase and test every title and artist."""
+    query_lower = query.lower()
+    return [key for key, (title, artist) in enumerate(songs)
+            if query_lower in title.lower() or query_lower in artist.lower()]
+
+def median_ms(search: Callable[[], List], runs: int = 5) -> float:
+    """Median wall time of one search in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        search()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    """Build the index and print per-query latency for both approaches (200k tracks by default)."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    songs = create_library(count)
+
+    start = time.perf_counter()
+    index = SubstringIndex()
+    for key, (title, artist) in enumerate(songs):
+        index.add(key, title, artist)
+    print(f"📁 Indexed {len(songs):,} synthetic tracks in {time.perf_counter() - start:.1f}s")
+
+    print(f"  {'Query':<16} {'Results':>8} {'Linear scan':>13} {'Index':>11} {'Speedup':>9}")
+    for query in QUERIES:
+        expected = linear_scan(songs, query)
+        if index.search(query) != expected:
+            raise RuntimeError(f"Index and linear scan disagree for {query!r}")
+        scan_ms = median_ms(lambda: linear_scan(songs, query))
+        index_ms = median_ms(lambda: index.search(query))
+        print(f"  {query!r:<16} {len(expected):>8,} {scan_ms:>10.2f} ms {index_ms:>8.2f} ms "
+              f"{scan_ms / max(index_ms, 1e-6):>8.1f}x")
+
+if __name__ == "__main__":
+    main()
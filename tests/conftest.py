@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Same layout main.py uses: the project root for `src.` imports, src/ for the modules' own imports
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.append(os.path.join(PROJECT_DIR, 'src'))
@@ -0,0 +1,57 @@
+"""Audio backend selection, the null backend and lazy pygame initialisation."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.audio_backend import (AudioBackendError, NullAudioBackend, PygameMixerBackend, StubMixerBackend,
+                               create_audio_backend)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_backend_is_chosen_by_name_then_environment(monkeypatch):
+    monkeypatch.delenv('MUSIC_PLAYER_AUDIO', raising=False)
+    assert isinstance(create_audio_backend(), PygameMixerBackend)
+    assert isinstance(create_audio_backend('NULL'), NullAudioBackend)
+    monkeypatch.setenv('MUSIC_PLAYER_AUDIO', 'null')
+    assert isinstance(create_audio_backend(), NullAudioBackend)
+    assert isinstance(create_audio_backend('pygame'), PygameMixerBackend)
+
+def test_unknown_backend_name_is_rejected():
+    with pytest.raises(ValueError, match="pygame, null"):
+        create_audio_backend('alsa')
+
+def test_null_backend_accepts_everything_and_never_finishes():
+    backend = NullAudioBackend()
+    backend.load('/music/song.mp3')
+    backend.play()
+    backend.queue('/music/next.mp3')
+    assert not backend.is_busy()
+    assert backend.poll_track_ends() == 0
+    backend.stop()
+
+def test_pygame_backend_does_nothing_before_the_first_load():
+    backend = PygameMixerBackend()
+    assert backend._pygame is None
+    assert not backend.is_busy()
+    assert backend.poll_track_ends() == 0
+    backend.stop()
+    assert backend._pygame is None
+
+def test_missing_pygame_is_reported_as_a_backend_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pygame', None)
+    with pytest.raises(AudioBackendError, match="pygame is not available"):
+        PygameMixerBackend().load('/music/song.mp3')
+
+def test_stub_backend_requires_a_loaded_track():
+    with pytest.raises(AudioBackendError):
+        StubMixerBackend().play()
+
+def test_starting_the_player_does_not_import_pygame():
+    code = ("import sys; sys.argv = ['main.py']; import main; "
+            "main.create_audio_backend('pygame'); print('pygame' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,115 @@
+"""The NumPy columnar backend against the pure-Python statistics and group indexes."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.columnar_library import MIN_COMPACT_ROWS, ColumnarLibrary
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.library_statistics import LibraryStatistics
+
+FILE_TYPES = ('.mp3', '.flac', '.ogg')
+
+def make_song(number, rng):
+    artist = rng.choice(('Band', 'band', 'BAND', 'Other', 'Zed', f'Solo {number % 40}'))
+    return {'title': f'Song {number}', 'artist': artist, 'file_type': rng.choice(FILE_TYPES),
+            'file_path': f'/music/{number:06d}.mp3', 'file_size': rng.randint(1, 10_000),
+            'duration': rng.choice((None, 60.0, 241.5))}
+
+def paths(songs):
+    return [song['file_path'] for song in songs]
+
+def assert_matches(columnar, library):
+    """Compare the columnar table with a plain list of the live songs in library order."""
+    statistics = LibraryStatistics()
+    for song in library:
+        statistics.add_song(song)
+    assert len(columnar) == len(library)
+    assert columnar.get_statistics() == statistics.get_statistics()
+    assert columnar.get_totals() == statistics.get_totals()
+    assert columnar.top_artists(5) == statistics.top_artists(5)
+
+    for artist in ('band', 'Other', 'Solo 3', 'missing'):
+        expected = [song for song in library if song['artist'].lower() == artist.lower()]
+        assert paths(columnar.filter_by_artist(artist)) == paths(expected)
+        assert columnar.count_by_artist(artist) == len(expected)
+    assert paths(columnar.songs_by_artist('BAND')) == paths(song for song in library if song['artist'] == 'BAND')
+    for file_type in FILE_TYPES + ('.wav',):
+        expected = [song for song in library if song['file_type'] == file_type]
+        assert paths(columnar.filter_by_file_type(file_type)) == paths(expected)
+        in_artist_order = sorted(expected, key=lambda song: song['artist'])
+        assert paths(columnar.songs_by_file_type_in_artist_order(file_type)) == paths(in_artist_order)
+
+    by_file_type = columnar.group_by_file_type()
+    assert {file_type: paths(songs) for file_type, songs in by_file_type.items()} == \
+        {file_type: paths(song for song in library if song['file_type'] == file_type)
+         for file_type in {song['file_type'] for song in library}}
+    by_artist = columnar.group_by_artist()
+    assert set(by_artist) == {song['artist'] for song in library}
+    assert paths(by_artist.get('Band', [])) == paths(song for song in library if song['artist'].lower() == 'band')
+
+def test_matches_the_python_backend_through_adds_removals_and_compaction():
+    rng = random.Random(25)
+    library = [make_song(number, rng) for number in range(3 * MIN_COMPACT_ROWS)]
+    columnar = ColumnarLibrary(library[:100])
+    for song in library[100:]:
+        columnar.add(song)
+    assert_matches(columnar, library)
+
+    # Remove most rows so the cleared rows outnumber the live ones and get compacted away
+    removed = set(rng.sample(range(len(library)), 2 * MIN_COMPACT_ROWS + 200))
+    for position in removed:
+        assert columnar.remove(library[position]['file_path'])
+    assert not columnar.remove(library[next(iter(removed))]['file_path'])
+    library = [song for position, song in enumerate(library) if position not in removed]
+    assert columnar._row_count < 3 * MIN_COMPACT_ROWS
+    assert_matches(columnar, library)
+
+    more = [make_song(number, rng) for number in range(10_000, 10_050)]
+    columnar.add_many(more)
+    assert_matches(columnar, library + more)
+
+def test_removing_every_song_of_an_artist_drops_it():
+    rng = random.Random(1)
+    songs = [make_song(number, rng) for number in range(20)]
+    columnar = ColumnarLibrary(songs)
+    for song in songs:
+        if song['artist'] == 'Zed':
+            columnar.remove(song['file_path'])
+    assert 'Zed' not in columnar.get_statistics()['artist_counts']
+    assert columnar.filter_by_artist('zed') == []
+    assert columnar.count_by_artist('Zed') == 0
+    assert columnar.get_statistics()['unique_artists'] == columnar.get_totals()['unique_artists']
+
+def test_statistics_are_returned_as_copies():
+    columnar = ColumnarLibrary([make_song(1, random.Random(2))])
+    statistics = columnar.get_statistics()
+    statistics['artist_counts'].clear()
+    statistics['total_songs'] = 99
+    assert columnar.get_statistics()['total_songs'] == 1
+    assert columnar.get_statistics()['artist_counts']
+
+def test_manager_gives_the_same_results_in_both_modes(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    for name in ("Band - One.mp3", "band - Two.flac", "Other - Three.mp3", "No Separator.ogg"):
+        (music / name).write_bytes(b'\0' * 256)
+    managers = [MusicPlaylistManager(str(music), read_tags=False, scan_workers=1, columnar=columnar)
+                for columnar in (False, True)]
+    assert managers[1].columnar
+
+    (music / "Other - Three.mp3").unlink()
+    (music / "Zed - Four.mp3").write_bytes(b'\0' * 512)
+    for manager in managers:
+        manager.apply_path_changes([str(music / "Other - Three.mp3"), str(music / "Zed - Four.mp3")])
+
+    def results(manager):
+        return (manager.get_library_statistics(), manager.get_library_totals(),
+                paths(manager.filter_songs_by_artist('BAND')), paths(manager.filter_songs_by_file_type('.mp3')),
+                manager.count_songs_by_artist('zed'),
+                [(group, count, song['file_path']) for group, count, song in manager.iter_artist_report_rows()],
+                [(group, count, song['file_path']) for group, count, song in manager.iter_file_type_report_rows()])
+
+    assert results(managers[0]) == results(managers[1])
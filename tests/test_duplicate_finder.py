@@ -0,0 +1,68 @@
+"""Duplicate detection by size, partial hash and full hash."""
+
+import os
+
+import pytest
+
+from src.duplicate_finder import PARTIAL_HASH_BYTES, DuplicateFinder
+from src.Lists_and_Tuples import MusicPlaylistManager
+
+def write(directory, name, data):
+    path = directory / name
+    path.write_bytes(data)
+    return str(path)
+
+def find(files, workers=1):
+    finder = DuplicateFinder(workers)
+    groups = finder.find((path, os.path.getsize(path)) for path in files)
+    return groups, finder.get_statistics()
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_small_duplicates_need_only_the_partial_hash(tmp_path, workers):
+    files = [write(tmp_path, "a.mp3", b'x' * 1000), write(tmp_path, "b.mp3", b'x' * 1000),
+             write(tmp_path, "c.mp3", b'y' * 1000), write(tmp_path, "unique.mp3", b'x' * 10)]
+    groups, stats = find(files, workers)
+    assert groups == [[files[0], files[1]]]
+    # The file with a unique size is never opened
+    assert (stats['partial_hashes'], stats['full_hashes']) == (3, 0)
+    assert stats['bytes_hashed'] == 3000
+    assert stats['files_considered'] == 4
+
+def test_large_files_differing_only_in_the_middle_are_told_apart(tmp_path):
+    size = 4 * PARTIAL_HASH_BYTES
+    middle = bytearray(size)
+    middle[size // 2] = 1
+    files = [write(tmp_path, "a.flac", bytes(size)), write(tmp_path, "b.flac", bytes(size)),
+             write(tmp_path, "c.flac", bytes(middle))]
+    groups, stats = find(files)
+    assert groups == [[files[0], files[1]]]
+    # All three share their ends, so all three needed a full hash
+    assert (stats['partial_hashes'], stats['full_hashes']) == (3, 3)
+    assert stats['bytes_hashed'] == 3 * 2 * PARTIAL_HASH_BYTES + 3 * size
+
+def test_groups_are_ordered_largest_files_first_and_paths_sorted(tmp_path):
+    small = [write(tmp_path, name, b's' * 10) for name in ("z.mp3", "m.mp3")]
+    large = [write(tmp_path, name, b'l' * 100) for name in ("b.mp3", "a.mp3", "c.mp3")]
+    groups, _ = find(small + large)
+    assert groups == [sorted(large), sorted(small)]
+
+def test_empty_and_unreadable_files_are_skipped(tmp_path):
+    empty = [write(tmp_path, "e1.mp3", b''), write(tmp_path, "e2.mp3", b'')]
+    finder = DuplicateFinder(1)
+    groups = finder.find([(path, 0) for path in empty] +
+                         [(str(tmp_path / "gone1.mp3"), 5), (str(tmp_path / "gone2.mp3"), 5)])
+    assert groups == []
+    assert finder.get_statistics()['partial_hashes'] == 0
+    assert DuplicateFinder().find([]) == []
+    assert DuplicateFinder().get_statistics()['io_saved_percent'] == 0.0
+
+def test_library_groups_duplicate_songs(tmp_path):
+    music = tmp_path / "music"
+    (music / "Copy").mkdir(parents=True)
+    write(music, "Band - One.mp3", b'1' * 500)
+    write(music / "Copy", "Band - One.mp3", b'1' * 500)
+    write(music, "Band - Two.mp3", b'2' * 500)
+    manager = MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+    groups = manager.find_duplicates(max_workers=1)
+    assert [[song['file_path'] for song in group] for group in groups] == \
+        [[str(music / "Band - One.mp3"), str(music / "Copy" / "Band - One.mp3")]]
@@ -0,0 +1,73 @@
+"""Typo-tolerant ranked search: edit distance, word expansion, ranking and index updates."""
+
+import pytest
+
+from src.search_index import FuzzyIndex, bounded_edit_distance, max_typos
+
+def make_index(*entries):
+    index = FuzzyIndex()
+    for key, title, artist in entries:
+        index.add(key, title, artist)
+    return index
+
+def keys(results):
+    return [key for key, _ in results]
+
+@pytest.mark.parametrize('length, typos', [(1, 0), (2, 0), (3, 1), (7, 1), (8, 2), (20, 2)])
+def test_max_typos(length, typos):
+    assert max_typos(length) == typos
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("osbourne", "osbourne", 2) == 0
+    assert bounded_edit_distance("osborne", "osbourne", 2) == 1
+    # An adjacent transposition is a single edit
+    assert bounded_edit_distance("paranoid", "paranodi", 2) == 1
+    assert bounded_edit_distance("train", "brawn", 2) == 2
+    # Past the limit the result is capped at limit + 1
+    assert bounded_edit_distance("train", "brawn", 1) == 2
+    assert bounded_edit_distance("a", "abcdef", 2) == 3
+
+def test_misspelled_artist_finds_the_song():
+    index = make_index(('crazy', "Crazy Train", "Ozzy Osbourne"), ('paranoid', "Paranoid", "Black Sabbath"),
+                       ('train', "Train in Vain", "The Clash"))
+    (key, score), = index.search("ozy osborne")
+    assert key == 'crazy'
+    assert 0 < score < 1
+
+def test_exact_words_rank_above_prefixes_and_typos():
+    index = make_index(('typo', "Lave Song", "Band"), ('prefix', "Lovely Day", "Band"), ('exact', "Love", "Band"))
+    results = index.search("love")
+    assert keys(results) == ['exact', 'prefix', 'typo']
+    assert results[0][1] == 1.0
+    assert results[0][1] > results[1][1] > results[2][1]
+
+def test_ties_keep_insertion_order_and_limit_applies():
+    index = make_index(*((number, f"Night {number}", "Band") for number in range(10)))
+    assert keys(index.search("night", limit=3)) == [0, 1, 2]
+    assert index.search("night", limit=0) == []
+    assert index.search("!!!") == []
+
+def test_short_words_must_match_exactly():
+    index = make_index(('ab', "Ab", "Band"), ('ac', "Ac", "Band"))
+    assert keys(index.search("ab")) == ['ab']
+
+def test_songs_matching_only_some_words_are_ranked_when_none_match_all():
+    index = make_index(('both', "River Night", "Band"), ('river', "River", "Other"), ('none', "Ocean", "Other"))
+    assert keys(index.search("river night")) == ['both']
+    results = index.search("river zebra")
+    assert keys(results) == ['both', 'river']
+    assert results[0][1] == 0.5
+
+def test_remove_and_replace_update_the_vocabulary():
+    index = make_index(('a', "Osbourne", "Band"), ('b', "Other", "Band"))
+    assert keys(index.search("osborne")) == ['a']
+    assert index.remove('a')
+    assert not index.remove('a')
+    assert index.search("osborne") == []
+    assert index.search("osb") == []
+    index.add('b', "Replaced", "Band")
+    assert len(index) == 1
+    assert index.search("other") == []
+    assert keys(index.search("replaced")) == ['b']
+    index.clear()
+    assert index.search("band") == []
@@ -0,0 +1,115 @@
+"""Crash safety of the play history log's compaction and torn writes."""
+
+import errno
+import json
+import os
+import time
+
+from src.audio_backend import StubMixerBackend
+from src.history_log import ACTIVE_LOG_NAME, COMPACTING_LOG_NAME, HistoryLog
+from src.stacks_queues_music import MusicPlayerStacksQueues
+
+# Noon on one day, so every event lands in the same local-time segment
+DAY = time.mktime((2024, 5, 1, 12, 0, 0, 0, 0, -1))
+
+def event(number):
+    return {'timestamp': DAY + number, 'title': f'Song {number}', 'artist': 'Band', 'file_path': None}
+
+def write_lines(path, events, tail=b''):
+    with open(path, 'wb') as log_file:
+        log_file.write(b''.join(json.dumps(item).encode() + b'\n' for item in events) + tail)
+
+def segment_name():
+    return time.strftime('%Y-%m-%d', time.localtime(DAY)) + '.jsonl'
+
+def titles(directory):
+    return [item['title'] for item in HistoryLog.load(str(directory))]
+
+def test_crash_before_commit_redoes_the_compaction_without_duplicates(tmp_path):
+    write_lines(tmp_path / segment_name(), [event(0)])
+    write_lines(tmp_path / COMPACTING_LOG_NAME, [event(1), event(2)])
+    # A merged segment that was still being written when the process died
+    (tmp_path / (segment_name() + '.tmp')).write_bytes(b'{"timestamp": 1')
+
+    HistoryLog(str(tmp_path)).close()
+    assert titles(tmp_path) == ['Song 0', 'Song 1', 'Song 2']
+    assert sorted(os.listdir(tmp_path)) == sorted([ACTIVE_LOG_NAME, segment_name()])
+
+def test_crash_after_commit_installs_the_merged_segment(tmp_path):
+    write_lines(tmp_path / segment_name(), [event(0)])
+    write_lines(tmp_path / (segment_name() + '.tmp'), [event(0), event(1)])
+
+    HistoryLog(str(tmp_path)).close()
+    assert titles(tmp_path) == ['Song 0', 'Song 1']
+
+def test_torn_active_line_does_not_corrupt_the_next_event(tmp_path):
+    write_lines(tmp_path / ACTIVE_LOG_NAME, [event(0)], tail=b'{"timestamp": ')
+
+    log = HistoryLog(str(tmp_path), compact_interval=3600)
+    log.append(event(1))
+    assert log.flush(timeout=5)
+    assert titles(tmp_path) == ['Song 0', 'Song 1']
+    log.close()
+    assert titles(tmp_path) == ['Song 0', 'Song 1']
+
+def test_loader_skips_malformed_interior_lines(tmp_path):
+    write_lines(tmp_path / segment_name(), [event(0)], tail=b'not json\n7\n' + json.dumps(event(1)).encode() + b'\n')
+    assert titles(tmp_path) == ['Song 0', 'Song 1']
+
+class NoLibrary:
+    """Music manager stand-in that knows no songs, so restored entries are rebuilt from the log."""
+
+    def get_song_by_path(self, file_path):
+        return None
+
+def test_player_restores_history_after_recovering_a_crashed_compaction(tmp_path):
+    write_lines(tmp_path / segment_name(), [event(0)])
+    # Committed compaction: the merged segment is complete but was never renamed into place
+    write_lines(tmp_path / (segment_name() + '.tmp'), [event(0), event(1)])
+
+    player = MusicPlayerStacksQueues(NoLibrary(), history_log_dir=str(tmp_path), backend=StubMixerBackend())
+    try:
+        assert [song['title'] for song in player.listening_history.get_recent(10)] == ['Song 0', 'Song 1']
+    finally:
+        player.close()
+
+def test_failing_fsync_does_not_hang_flush_or_close(tmp_path, monkeypatch):
+    real_fsync = os.fsync
+    failing = {'on': True}
+
+    def fsync(fd):
+        if failing['on']:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return real_fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', fsync)
+    log = HistoryLog(str(tmp_path), compact_interval=3600)
+    log.append(event(0))
+    assert log.flush(timeout=5) is False
+    assert log.events_dropped == 1
+    assert isinstance(log.last_error, OSError)
+
+    # Once the disk recovers, later events are written and the failed batch left no partial line behind
+    failing['on'] = False
+    log.append(event(1))
+    assert log.flush(timeout=5) is True
+
+    # A failed compaction keeps its events and is finished by the next one
+    failing['on'] = True
+    assert log.compact(timeout=5) is False
+    failing['on'] = False
+    log.append(event(2))
+    assert log.compact(timeout=5) is True
+    log.close()
+    assert not log._writer.is_alive()
+    assert titles(tmp_path) == ['Song 1', 'Song 2']
+    assert sorted(os.listdir(tmp_path)) == sorted([ACTIVE_LOG_NAME, segment_name()])
+
+def test_unencodable_event_is_dropped_without_stopping_the_writer(tmp_path):
+    log = HistoryLog(str(tmp_path), compact_interval=3600)
+    log.append({'timestamp': DAY, 'title': object()})
+    assert log.flush(timeout=5) is False
+    log.append(event(2))
+    assert log.flush(timeout=5) is True
+    log.close()
+    assert titles(tmp_path) == ['Song 2']
@@ -0,0 +1,61 @@
+"""Artist and file type group indexes behind the filters, counts and reports."""
+
+import pytest
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+
+TRACKS = ("AC-DC - Thunderstruck.mp3", "Band - Zulu.flac", "Band - Alpha.mp3", "band - Lower.mp3",
+          "No Separator.wav")
+
+@pytest.fixture
+def music(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    for name in TRACKS:
+        (music / name).write_bytes(b'\0' * 128)
+    return music
+
+def make_manager(music):
+    return MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+
+def titles(songs):
+    return [song['title'] for song in songs]
+
+def test_filters_are_case_insensitive_and_in_library_order(music):
+    manager = make_manager(music)
+    assert titles(manager.filter_songs_by_artist("BAND")) == ['Alpha', 'Zulu', 'Lower']
+    assert manager.count_songs_by_artist("band") == 3
+    assert titles(manager.filter_songs_by_file_type(".MP3")) == ['Thunderstruck', 'Alpha', 'Lower']
+    assert titles(manager.filter_songs_by_artist("Unknown Artist")) == ['No Separator']
+    assert manager.filter_songs_by_artist("nobody") == []
+    assert manager.count_songs_by_artist("nobody") == 0
+    assert manager.filter_songs_by_file_type(".ogg") == []
+
+def test_artist_and_file_type_lists(music):
+    manager = make_manager(music)
+    assert manager.get_artists_list() == ['AC-DC', 'Band', 'Unknown Artist', 'band']
+    assert manager.get_file_types_list() == ['.flac', '.mp3', '.wav']
+
+def test_reports_group_every_song(music):
+    manager = make_manager(music)
+    artist_report = manager.generate_artist_report()
+    assert set(artist_report) == {'AC-DC', 'Band', 'band', 'Unknown Artist'}
+    assert titles(artist_report['AC-DC']) == ['Thunderstruck']
+    file_type_report = manager.generate_file_type_report()
+    assert {file_type: len(songs) for file_type, songs in file_type_report.items()} == \
+        {'.mp3': 3, '.flac': 1, '.wav': 1}
+
+def test_groups_follow_added_and_removed_songs(music):
+    manager = make_manager(music)
+    manager.get_artists_list()
+
+    (music / "AC-DC - Thunderstruck.mp3").unlink()
+    (music / "No Separator.wav").rename(music / "Zed - Renamed.ogg")
+    assert manager.apply_path_changes([str(music / "AC-DC - Thunderstruck.mp3"), str(music / "No Separator.wav"),
+                                       str(music / "Zed - Renamed.ogg")]) == (1, 2)
+
+    assert manager.get_artists_list() == ['Band', 'Zed', 'band']
+    assert manager.get_file_types_list() == ['.flac', '.mp3', '.ogg']
+    assert manager.filter_songs_by_artist("ac-dc") == []
+    assert titles(manager.filter_songs_by_file_type(".ogg")) == ['Renamed']
+    assert manager.get_library_statistics()['unique_artists'] == 3
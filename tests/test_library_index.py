@@ -0,0 +1,82 @@
+"""SQLite library index: rebuild, incremental changes, schema versions and startup from the index."""
+
+import sqlite3
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.library_index import LibraryIndex
+from src.song_record import SongRecord
+
+def song(path, **tags):
+    return SongRecord("Title", "Band", ".mp3", path, 100, **tags)
+
+def loaded(index):
+    """Indexed songs as (dictionary, mtime) pairs; the index builds records from its own import of song_record."""
+    return [(record.to_dict(), mtime) for record, mtime in index.load_songs()]
+
+def test_rebuild_round_trips_songs_and_directories(tmp_path):
+    index = LibraryIndex(tmp_path / "index" / "library.db")
+    try:
+        tagged = song('/music/b.mp3', album="Album", track_number=3, duration=181.5, bitrate=320)
+        index.rebuild('/music', [(tagged, 2.0), (song('/music/a.mp3'), 1.0)], {'/music': 5.0})
+        assert index.is_valid_for('/music')
+        assert not index.is_valid_for('/elsewhere')
+        assert loaded(index) == [(song('/music/a.mp3').to_dict(), 1.0), (tagged.to_dict(), 2.0)]
+        assert index.load_directories() == {'/music': 5.0}
+
+        # A second rebuild replaces everything
+        index.rebuild('/music', [(song('/music/c.mp3'), 3.0)], {})
+        assert [record.file_path for record, _ in index.load_songs()] == ['/music/c.mp3']
+        assert index.load_directories() == {}
+    finally:
+        index.close()
+
+def test_apply_changes_upserts_and_removes(tmp_path):
+    index = LibraryIndex(tmp_path / "library.db")
+    try:
+        index.rebuild('/music', [(song('/music/a.mp3'), 1.0), (song('/music/b.mp3'), 1.0)],
+                      {'/music': 1.0, '/music/old': 1.0})
+        index.apply_changes([(song('/music/a.mp3', album="New"), 2.0), (song('/music/c.mp3'), 2.0)],
+                            ['/music/b.mp3'], {'/music': 2.0, '/music/new': 2.0}, ['/music/old'])
+        assert loaded(index) == [(song('/music/a.mp3', album="New").to_dict(), 2.0),
+                                 (song('/music/c.mp3').to_dict(), 2.0)]
+        assert index.load_directories() == {'/music': 2.0, '/music/new': 2.0}
+    finally:
+        index.close()
+
+def test_index_from_another_schema_version_is_dropped(tmp_path):
+    path = str(tmp_path / "library.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        INSERT INTO meta VALUES ('root', '/music'), ('schema_version', '1');
+        CREATE TABLE songs (file_path TEXT PRIMARY KEY, title TEXT);
+        INSERT INTO songs VALUES ('/music/a.mp3', 'Old');
+    """)
+    connection.close()
+
+    index = LibraryIndex(path)
+    try:
+        assert not index.is_valid_for('/music')
+        assert index.load_songs() == []
+    finally:
+        index.close()
+
+def test_manager_loads_from_the_index_and_picks_up_changes(tmp_path):
+    music = tmp_path / "music"
+    album = music / "Album"
+    album.mkdir(parents=True)
+    (album / "Band - One.mp3").write_bytes(b'\0' * 128)
+    index_path = str(tmp_path / "library.db")
+    MusicPlaylistManager(str(music), index_path=index_path, read_tags=False, scan_workers=1)
+
+    (album / "Band - Two.mp3").write_bytes(b'\0' * 64)
+    (album / "Band - One.mp3").unlink()
+    manager = MusicPlaylistManager(str(music), index_path=index_path, read_tags=False, scan_workers=1)
+    assert [(song['title'], song['file_size']) for song in manager.song_library] == [('Two', 64)]
+
+    # The index itself was updated, not just the loaded library
+    index = LibraryIndex(index_path)
+    try:
+        assert [record['title'] for record, _ in index.load_songs()] == ['Two']
+    finally:
+        index.close()
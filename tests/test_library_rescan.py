@@ -0,0 +1,75 @@
+"""Rescans only drop songs from directories that are really gone, and the index root is absolute."""
+
+import errno
+import os
+import shutil
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.library_index import LibraryIndex
+
+def write_track(path):
+    with open(path, 'wb') as audio_file:
+        audio_file.write(b'\0' * 128)
+
+def make_library(tmp_path):
+    album = tmp_path / "music" / "Album"
+    album.mkdir(parents=True)
+    write_track(album / "Band - One.mp3")
+    write_track(album / "Band - Two.mp3")
+    return tmp_path / "music", album
+
+def titles(manager):
+    return sorted(song['title'] for song in manager.song_library)
+
+def test_unreadable_directory_keeps_its_songs(tmp_path, monkeypatch):
+    music, album = make_library(tmp_path)
+    manager = MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if os.fspath(path) == str(album):
+            raise PermissionError(errno.EACCES, "Permission denied", str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'stat', stat)
+    manager._directory_mtimes[str(album)] -= 1
+    assert manager.refresh_changed_directories() == (0, 0)
+    assert manager.apply_path_changes([str(album)]) == (0, 0)
+    assert titles(manager) == ['One', 'Two']
+    assert str(album) in manager.get_directory_mtimes()
+
+def test_deleted_directory_drops_its_songs(tmp_path):
+    music, album = make_library(tmp_path)
+    manager = MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+    shutil.rmtree(album)
+    assert manager.refresh_changed_directories() == (0, 2)
+    assert titles(manager) == []
+    assert str(album) not in manager.get_directory_mtimes()
+
+def test_index_built_from_a_relative_path_is_valid_for_the_absolute_one(tmp_path, monkeypatch):
+    music, _ = make_library(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    index_path = str(tmp_path / "library.db")
+    MusicPlaylistManager("music", read_tags=False, index_path=index_path)
+
+    index = LibraryIndex(index_path)
+    try:
+        assert index.is_valid_for(str(music))
+        assert index.is_valid_for("music")
+        assert not index.is_valid_for(str(tmp_path))
+    finally:
+        index.close()
+
+def test_new_directory_and_its_file_in_one_batch_are_added_once(tmp_path):
+    music, _ = make_library(tmp_path)
+    manager = MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+    new_album = music / "New"
+    nested = new_album / "Disc 1"
+    nested.mkdir(parents=True)
+    write_track(new_album / "Band - Three.mp3")
+    write_track(nested / "Band - Four.mp3")
+
+    changes = [str(new_album), str(new_album / "Band - Three.mp3"), str(nested), str(nested / "Band - Four.mp3")]
+    assert manager.apply_path_changes(changes) == (2, 0)
+    assert titles(manager) == ['Four', 'One', 'Three', 'Two']
+    assert len(manager.song_library) == 4
@@ -0,0 +1,78 @@
+"""Recursive scans, single-directory scans and directory stats of the library scanner."""
+
+import os
+
+import pytest
+
+from src.library_scanner import LibraryScanner
+
+EXTENSIONS = {'.mp3', '.flac'}
+
+def make_tree(root):
+    """root/a.mp3, root/skip.txt, root/Rock/B.FLAC, root/Rock/Live/c.mp3, root/Empty/"""
+    (root / "Rock" / "Live").mkdir(parents=True)
+    (root / "Empty").mkdir()
+    (root / "a.mp3").write_bytes(b'a' * 10)
+    (root / "skip.txt").write_bytes(b'x')
+    (root / "Rock" / "B.FLAC").write_bytes(b'b' * 20)
+    (root / "Rock" / "Live" / "c.mp3").write_bytes(b'c' * 30)
+    return [str(root / "Rock" / "B.FLAC"), str(root / "Rock" / "Live" / "c.mp3"), str(root / "a.mp3")]
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_scan_finds_audio_files_recursively_sorted_by_path(tmp_path, workers):
+    expected = sorted(make_tree(tmp_path))
+    scanner = LibraryScanner(EXTENSIONS, max_workers=workers)
+    found = scanner.scan(tmp_path)
+
+    assert [path for path, _ in found] == expected
+    assert [stat_result.st_size for _, stat_result in found] == [20, 30, 10]
+    assert scanner.files_scanned == 3
+    assert set(scanner.directory_mtimes) == {str(tmp_path), str(tmp_path / "Rock"),
+                                             str(tmp_path / "Rock" / "Live"), str(tmp_path / "Empty")}
+    assert scanner.directories_scanned == 4
+    assert scanner.get_files_per_second() > 0
+
+def test_rescanning_resets_the_previous_results(tmp_path):
+    make_tree(tmp_path)
+    scanner = LibraryScanner(EXTENSIONS, max_workers=1)
+    scanner.scan(tmp_path)
+    assert scanner.scan(tmp_path / "Empty") == []
+    assert scanner.directory_mtimes == {str(tmp_path / "Empty"): os.stat(tmp_path / "Empty").st_mtime}
+    assert scanner.files_scanned == 0
+
+def test_missing_root_scans_nothing(tmp_path):
+    scanner = LibraryScanner(EXTENSIONS)
+    assert scanner.scan(tmp_path / "gone") == []
+    assert scanner.directory_mtimes == {}
+    assert scanner.get_files_per_second() == 0.0
+
+def test_scan_directory_does_not_recurse(tmp_path):
+    make_tree(tmp_path)
+    files, subdirs, mtime = LibraryScanner(EXTENSIONS).scan_directory(tmp_path / "Rock")
+    assert [path for path, _ in files] == [str(tmp_path / "Rock" / "B.FLAC")]
+    assert subdirs == [str(tmp_path / "Rock" / "Live")]
+    assert mtime == os.stat(tmp_path / "Rock").st_mtime
+
+def test_scan_directory_of_a_missing_directory_reports_no_mtime(tmp_path):
+    assert LibraryScanner(EXTENSIONS).scan_directory(tmp_path / "gone") == ([], [], None)
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_stat_directories(tmp_path, workers):
+    make_tree(tmp_path)
+    (tmp_path / "file.mp3").write_bytes(b'')
+    paths = [str(tmp_path / "Rock"), str(tmp_path / "Empty"), str(tmp_path / "gone"), str(tmp_path / "file.mp3")]
+    mtimes = LibraryScanner(EXTENSIONS, max_workers=workers).stat_directories(paths)
+    assert mtimes == {str(tmp_path / "Rock"): os.stat(tmp_path / "Rock").st_mtime,
+                      str(tmp_path / "Empty"): os.stat(tmp_path / "Empty").st_mtime,
+                      str(tmp_path / "gone"): None, str(tmp_path / "file.mp3"): None}
+
+def test_stat_directories_leaves_out_unreadable_directories(tmp_path, monkeypatch):
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if os.fspath(path) == str(tmp_path):
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'stat', stat)
+    assert LibraryScanner(EXTENSIONS, max_workers=1).stat_directories([str(tmp_path)]) == {}
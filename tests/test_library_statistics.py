@@ -0,0 +1,56 @@
+"""Running library statistics against a recount from scratch."""
+
+import random
+
+from src.library_statistics import LibraryStatistics
+
+def song(number, artist):
+    return {'title': f'Song {number}', 'artist': artist, 'file_type': '.mp3', 'file_size': 100, 'duration': 1.0}
+
+def expected_ranking(songs):
+    counts = {}
+    for item in songs:
+        counts[item['artist']] = counts.get(item['artist'], 0) + 1
+    return sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))
+
+def test_ranking_matches_a_recount_after_random_changes():
+    rng = random.Random(5)
+    statistics = LibraryStatistics()
+    library = []
+    for number in range(3000):
+        if library and rng.random() < 0.3:
+            statistics.remove_song(library.pop(rng.randrange(len(library))))
+        else:
+            library.append(song(number, f'Artist {int(rng.paretovariate(1.2)) % 200:03d}'))
+            statistics.add_song(library[-1])
+
+    ranking = expected_ranking(library)
+    assert list(statistics.get_statistics()['artist_counts'].items()) == ranking
+    assert statistics.top_artists(10) == ranking[:10]
+    assert statistics.top_artists(len(ranking) + 5) == ranking
+    assert statistics.get_statistics()['total_songs'] == len(library)
+
+def test_get_statistics_returns_a_copy():
+    statistics = LibraryStatistics()
+    statistics.add_song(song(1, 'Band'))
+    snapshot = statistics.get_statistics()
+    snapshot['total_songs'] = 99
+    snapshot['artist_counts']['Band'] = 99
+    snapshot['file_type_counts'].clear()
+    assert statistics.get_statistics()['total_songs'] == 1
+    assert statistics.get_statistics()['artist_counts'] == {'Band': 1}
+    assert statistics.get_statistics()['file_type_counts'] == {'.mp3': 1}
+
+def test_totals_match_the_full_statistics_without_the_ranking():
+    statistics = LibraryStatistics()
+    songs = [song(number, f'Artist {number % 7}') for number in range(50)]
+    for item in songs:
+        statistics.add_song(item)
+    statistics.remove_song(songs[0])
+
+    totals = statistics.get_totals()
+    full = statistics.get_statistics()
+    assert 'artist_counts' not in totals
+    assert totals == {key: value for key, value in full.items() if key != 'artist_counts'}
+    assert totals['total_songs'] == 49
+    assert totals['unique_artists'] == 7
@@ -0,0 +1,69 @@
+"""Live library updates from a real temporary music directory, with both watcher backends."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.library_watcher import LibraryWatcher
+
+BACKENDS = [
+    pytest.param('inotify', marks=pytest.mark.skipif(not sys.platform.startswith('linux'),
+                                                      reason="inotify is Linux only")),
+    'polling',
+]
+
+def write_track(path):
+    with open(path, 'wb') as audio_file:
+        audio_file.write(b'\0' * 128)
+
+def titles(manager):
+    return sorted(song['title'] for song in manager.song_library)
+
+def sync_until(watcher, manager, expected, timeout=5.0):
+    """Apply settled changes until the library holds exactly the expected titles."""
+    deadline = time.monotonic() + timeout
+    while titles(manager) != expected and time.monotonic() < deadline:
+        if watcher.wait_for_changes(timeout=0.1):
+            watcher.apply_pending()
+    assert titles(manager) == expected
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_add_rename_and_remove_are_applied(tmp_path, backend):
+    album = tmp_path / "Album"
+    album.mkdir()
+    write_track(tmp_path / "Band - One.mp3")
+    write_track(album / "Band - Two.mp3")
+    manager = MusicPlaylistManager(str(tmp_path), read_tags=False)
+    assert titles(manager) == ['One', 'Two']
+
+    watcher = LibraryWatcher(manager, backend=backend, debounce=0.05, poll_interval=0.05)
+    assert watcher.start() == backend
+    try:
+        write_track(album / "Band - Three.mp3")
+        sync_until(watcher, manager, ['One', 'Three', 'Two'])
+
+        os.rename(album / "Band - Two.mp3", album / "Band - Renamed.mp3")
+        sync_until(watcher, manager, ['One', 'Renamed', 'Three'])
+
+        os.remove(tmp_path / "Band - One.mp3")
+        sync_until(watcher, manager, ['Renamed', 'Three'])
+
+        assert set(manager.get_directory_mtimes()) == {str(tmp_path), str(album)}
+    finally:
+        watcher.stop()
+
+def test_refresh_only_rescans_the_given_directories(tmp_path):
+    first, second = tmp_path / "First", tmp_path / "Second"
+    first.mkdir()
+    second.mkdir()
+    manager = MusicPlaylistManager(str(tmp_path), read_tags=False)
+    write_track(first / "Band - One.mp3")
+    write_track(second / "Band - Two.mp3")
+
+    assert manager.refresh_changed_directories([str(first)]) == (1, 0)
+    assert titles(manager) == ['One']
+    assert manager.refresh_changed_directories() == (1, 0)
+    assert titles(manager) == ['One', 'Two']
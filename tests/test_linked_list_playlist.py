@@ -0,0 +1,90 @@
+"""Indexed access, seek and positional consistency of LinkedListPlaylist."""
+
+from src.linked_list_playlist import LinkedListPlaylist
+
+def songs(start, count):
+    return [{'title': f'Song {number}', 'artist': 'Band', 'file_path': f'/music/{number}.mp3'}
+            for number in range(start, start + count)]
+
+def assert_positions_match_chain(playlist):
+    titles = [song['title'] for song in playlist.iter_songs()]
+    assert len(titles) == playlist.size
+    assert [playlist.get_at(position)['title'] for position in range(playlist.size)] == titles
+    node = playlist.head
+    for position in range(playlist.size):
+        assert playlist.get_position(node) == position
+        node = node.next
+
+def test_extend_appends_after_existing_songs_and_edits():
+    playlist = LinkedListPlaylist.from_iterable(songs(0, 50), observers=[])
+    playlist.insert_at(10, songs(1000, 1)[0])
+    playlist.remove_at(3)
+    assert playlist.extend(songs(50, 40)) == 40
+    assert playlist.extend([]) == 0
+    playlist.insert_at(70, songs(2000, 1)[0])
+    assert playlist.extend(songs(90, 1)) == 1
+    assert playlist.size == 92
+    assert playlist.get_at(playlist.size - 1)['title'] == 'Song 90'
+    assert_positions_match_chain(playlist)
+
+def test_extend_leaves_existing_nodes_in_place():
+    playlist = LinkedListPlaylist(observers=[])
+    playlist.extend(songs(0, 5))
+    first_nodes = []
+    node = playlist.head
+    while node:
+        first_nodes.append(node)
+        node = node.next
+    playlist.extend(songs(5, 5))
+    assert [playlist.get_position(node) for node in first_nodes] == list(range(5))
+    assert playlist.current_node is first_nodes[0]
+    assert_positions_match_chain(playlist)
+
+def test_get_at_and_seek():
+    playlist = LinkedListPlaylist.from_iterable(songs(0, 5), observers=[])
+    assert playlist.get_at(3)['title'] == 'Song 3'
+    assert playlist.get_position() == 0
+    assert playlist.seek(4)['title'] == 'Song 4'
+    assert playlist.get_current_song()['title'] == 'Song 4'
+    assert playlist.get_position() == 4
+    assert playlist.previous_song()['title'] == 'Song 3'
+
+def test_out_of_range_positions_warn_and_change_nothing():
+    events = []
+    playlist = LinkedListPlaylist.from_iterable(songs(0, 3), observers=[lambda event, message: events.append(event)])
+    assert playlist.get_at(3) is None
+    assert playlist.get_at(-1) is None
+    assert playlist.seek(3) is None
+    assert playlist.insert_at(4, songs(10, 1)[0]) is False
+    assert playlist.remove_at(-1) is None
+    assert events == ['warning'] * 5
+    assert playlist.get_position() == 0
+    assert_positions_match_chain(playlist)
+    assert LinkedListPlaylist(observers=[]).get_position() is None
+
+def test_insert_at_and_remove_at_every_position():
+    playlist = LinkedListPlaylist(observers=[])
+    assert playlist.insert_at(0, songs(1, 1)[0])
+    assert playlist.insert_at(0, songs(0, 1)[0])
+    assert playlist.insert_at(2, songs(3, 1)[0])
+    assert playlist.insert_at(2, songs(2, 1)[0])
+    assert [song['title'] for song in playlist.iter_songs()] == ['Song 0', 'Song 1', 'Song 2', 'Song 3']
+    assert_positions_match_chain(playlist)
+
+    playlist.seek(3)
+    assert playlist.remove_at(3)['title'] == 'Song 3'
+    # Removing the current (last) song selects the one before it
+    assert playlist.get_current_song()['title'] == 'Song 2'
+    assert playlist.tail.song_data['title'] == 'Song 2'
+    assert playlist.remove_at(0)['title'] == 'Song 0'
+    assert playlist.head.song_data['title'] == 'Song 1'
+    assert playlist.get_position() == 1
+    assert_positions_match_chain(playlist)
+
+def test_positions_survive_reversal():
+    playlist = LinkedListPlaylist.from_iterable(songs(0, 6), observers=[])
+    playlist.seek(1)
+    playlist.reverse_playlist()
+    assert [song['title'] for song in playlist.iter_songs()] == [f'Song {number}' for number in range(5, -1, -1)]
+    assert playlist.get_position() == 4
+    assert_positions_match_chain(playlist)
@@ -0,0 +1,73 @@
+"""ListeningHistoryStack ring buffer, eviction and spill, and its indexed queries."""
+
+import json
+
+import pytest
+
+from src.stacks_queues_music import ListeningHistoryStack
+
+def song(title, artist='Band'):
+    return {'title': title, 'artist': artist, 'file_path': f'/music/{title}.mp3'}
+
+def titles(songs):
+    return [entry['title'] for entry in songs]
+
+def test_recent_plays_oldest_first():
+    history = ListeningHistoryStack(capacity=5)
+    assert history.get_recent() == []
+    for title in ('A', 'B', 'C'):
+        history.push(song(title))
+    assert history.get_size() == 3
+    assert titles(history.get_recent(2)) == ['B', 'C']
+    assert titles(history.get_recent(10)) == ['A', 'B', 'C']
+
+def test_full_buffer_evicts_and_spills_the_oldest_plays(tmp_path):
+    spill_path = tmp_path / "spill.jsonl"
+    history = ListeningHistoryStack(capacity=3, spill_path=str(spill_path))
+    for number, title in enumerate(('A', 'B', 'C', 'D', 'E')):
+        history.push(song(title, artist='Old' if title in 'AB' else 'New'), timestamp=100.0 + number)
+    history.close()
+
+    assert history.get_size() == 3
+    assert titles(history.get_recent(10)) == ['C', 'D', 'E']
+    # Evicted plays are gone from every index
+    assert history.search_history('old') == []
+    assert history.plays_by_artist('old') == []
+    assert history.plays_of_title('a') == []
+    spilled = [json.loads(line) for line in spill_path.read_text(encoding='utf-8').splitlines()]
+    assert spilled == [{'timestamp': 100.0, 'title': 'A', 'artist': 'Old', 'file_path': '/music/A.mp3'},
+                       {'timestamp': 101.0, 'title': 'B', 'artist': 'Old', 'file_path': '/music/B.mp3'}]
+
+def test_time_window_queries():
+    history = ListeningHistoryStack(capacity=4)
+    for number, title in enumerate(('A', 'B', 'C', 'D', 'E')):
+        history.push(song(title), timestamp=10.0 * number)
+    assert titles(history.played_since(20.0)) == ['C', 'D', 'E']
+    assert titles(history.played_since(25.0)) == ['D', 'E']
+    assert titles(history.played_since(0.0)) == ['B', 'C', 'D', 'E']
+    assert history.played_since(50.0) == []
+    assert history.played_within(1.0) == []
+
+def test_out_of_order_timestamps_are_clamped():
+    history = ListeningHistoryStack()
+    history.push(song('A'), timestamp=50.0)
+    history.push(song('B'), timestamp=40.0)
+    assert titles(history.played_since(50.0)) == ['A', 'B']
+
+def test_artist_title_and_search_queries_across_wraparound():
+    history = ListeningHistoryStack(capacity=4)
+    plays = [('Crazy Train', 'Ozzy', 1.0), ('Paranoid', 'Sabbath', 2.0), ('Crazy Train', 'Ozzy', 3.0),
+             ('Iron Man', 'Sabbath', 4.0), ('Bark at the Moon', 'Ozzy', 5.0), ('War Pigs', 'Sabbath', 6.0)]
+    for title, artist, timestamp in plays:
+        history.push(song(title, artist), timestamp=timestamp)
+
+    assert titles(history.plays_by_artist('OZZY')) == ['Crazy Train', 'Bark at the Moon']
+    assert titles(history.plays_by_artist('sabbath', since=5.0)) == ['War Pigs']
+    assert titles(history.plays_of_title('crazy train')) == ['Crazy Train']
+    assert titles(history.search_history('a')) == ['Crazy Train', 'Iron Man', 'Bark at the Moon', 'War Pigs']
+    assert titles(history.search_history('moon')) == ['Bark at the Moon']
+    assert history.plays_by_artist('nobody') == []
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ListeningHistoryStack(capacity=0)
@@ -0,0 +1,115 @@
+"""Playback engine tests against the headless stub mixer."""
+
+import time
+import wave
+
+import pytest
+
+from src.audio_backend import AudioBackendError, PygameMixerBackend, StubMixerBackend
+from src.linked_list_playlist import LinkedListPlaylist
+from src.playback_engine import PlaybackEngine, PlaylistSource
+
+def make_playlist(*titles):
+    songs = [{'title': title, 'artist': 'Band', 'file_path': f'/music/{title}.mp3'} for title in titles]
+    return LinkedListPlaylist.from_iterable(songs, observers=[])
+
+def play(playlist, edit, track_seconds=0.2):
+    """Play the playlist once through; edit(playlist) runs on this thread once the second song is queued.
+
+    Returns (title, current node still linked, current position) for every track start.
+    """
+    starts = []
+
+    def on_track_start(song):
+        current = playlist.current_node
+        starts.append((song['title'], current is not None and playlist.contains_node(current),
+                       playlist.get_position()))
+
+    backend = StubMixerBackend(track_seconds=track_seconds)
+    engine = PlaybackEngine(backend, PlaylistSource(playlist, repeat=False), on_track_start=on_track_start,
+                            poll_interval=0.01)
+    engine.start()
+    deadline = time.monotonic() + 5
+    while not any(action == 'queue' for action, _ in backend.events) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    edit(playlist)
+    assert engine.wait(timeout=5)
+    return starts
+
+def test_plays_every_song_in_order():
+    starts = play(make_playlist('A', 'B', 'C'), lambda playlist: None, track_seconds=0.02)
+    assert starts == [('A', True, 0), ('B', True, 1), ('C', True, 2)]
+
+def test_removing_the_queued_song_keeps_current_node_linked():
+    playlist = make_playlist('A', 'B', 'C')
+    # B is already queued in the backend when it is removed, so it still plays
+    starts = play(playlist, lambda playlist: playlist.remove_song('B'))
+    assert [title for title, _, _ in starts] == ['A', 'B', 'C']
+    assert all(linked for _, linked, _ in starts)
+    assert starts[1][2] == 0 and starts[2][2] == 1
+    assert playlist.current_node.song_data['title'] == 'C'
+
+def test_removing_songs_that_were_not_handed_out_skips_them():
+    playlist = make_playlist('A', 'B', 'C', 'D')
+    # Only A (playing) and B (queued) have been handed out
+    starts = play(playlist, lambda playlist: playlist.remove_song('C'))
+    assert [title for title, _, _ in starts] == ['A', 'B', 'D']
+    assert all(linked for _, linked, _ in starts)
+    assert playlist.get_position() == 2
+
+def test_removing_the_playing_song_continues_with_the_rest():
+    playlist = make_playlist('A', 'B', 'C')
+    starts = play(playlist, lambda playlist: playlist.remove_song('A'))
+    assert [title for title, _, _ in starts] == ['A', 'B', 'C']
+    assert all(linked for _, linked, _ in starts[1:])
+    assert playlist.get_position() == 1
+
+def write_silence(path, seconds):
+    with wave.open(str(path), 'wb') as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(22050)
+        output.writeframes(b'\0\0' * int(22050 * seconds))
+
+class CountingMixerBackend(PygameMixerBackend):
+    """pygame backend that records which tracks were loaded and which were queued."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def load(self, source):
+        self.calls.append(('load', source))
+        super().load(source)
+
+    def queue(self, source):
+        self.calls.append(('queue', source))
+        super().queue(source)
+
+def test_pygame_backend_queues_the_next_track_instead_of_reloading(tmp_path, monkeypatch):
+    pytest.importorskip('pygame')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    songs = []
+    for title in ('A', 'B', 'C'):
+        write_silence(tmp_path / f'{title}.wav', 0.3)
+        songs.append({'title': title, 'artist': 'Band', 'file_path': str(tmp_path / f'{title}.wav')})
+    playlist = LinkedListPlaylist.from_iterable(songs, observers=[])
+
+    backend = CountingMixerBackend()
+    try:
+        backend._ensure_mixer()
+    except AudioBackendError as e:
+        pytest.skip(f"No mixer available: {e}")
+    started = []
+    engine = PlaybackEngine(backend, PlaylistSource(playlist, repeat=False),
+                            on_track_start=lambda song: started.append(song['title']), poll_interval=0.01)
+    try:
+        engine.start()
+        assert engine.wait(timeout=5)
+    finally:
+        engine.stop()
+        backend._pygame.mixer.quit()
+
+    assert started == ['A', 'B', 'C']
+    # Only the first track is loaded; the mixer switches to the others from its queue
+    assert [action for action, _ in backend.calls] == ['load', 'queue', 'queue']
@@ -0,0 +1,69 @@
+"""Title and path lookups behind LinkedListPlaylist inserts, removals and search."""
+
+from src.linked_list_playlist import LinkedListPlaylist
+
+def song(title, path=None, artist='Band'):
+    return {'title': title, 'artist': artist, 'file_path': path or f'/music/{title}.mp3'}
+
+def make_playlist(*titles):
+    events = []
+    playlist = LinkedListPlaylist.from_iterable([song(title) for title in titles],
+                                                observers=[lambda event, message: events.append(event)])
+    return playlist, events
+
+def titles(playlist):
+    return [song['title'] for song in playlist.iter_songs()]
+
+def test_inserts_find_their_target_ignoring_case():
+    playlist, events = make_playlist('One', 'Two')
+    assert playlist.insert_song_after('ONE', song('After One'))
+    assert playlist.insert_song_before('two', song('Before Two'))
+    assert titles(playlist) == ['One', 'After One', 'Before Two', 'Two']
+    assert playlist.find_node_by_title('after one').song_data['title'] == 'After One'
+    assert events == ['song_inserted', 'song_inserted']
+
+def test_missing_targets_and_empty_playlists_warn():
+    playlist, events = make_playlist('One')
+    assert not playlist.insert_song_after('Nope', song('X'))
+    assert not playlist.insert_song_before('Nope', song('X'))
+    assert not playlist.remove_song('Nope')
+    empty = LinkedListPlaylist(observers=[])
+    assert not empty.remove_song('One')
+    assert not empty.insert_song_after('One', song('X'))
+    assert titles(playlist) == ['One']
+    assert events == ['warning', 'warning', 'warning']
+
+def test_duplicate_titles_resolve_to_the_first_in_playlist_order():
+    playlist, _ = make_playlist('A', 'Dup', 'B')
+    playlist.add_song_at_beginning(song('dup', '/music/other.mp3'))
+    playlist.add_song_at_end(song('Dup', '/music/third.mp3'))
+    assert playlist.find_node_by_title('DUP').song_data['file_path'] == '/music/other.mp3'
+
+    assert playlist.remove_song('Dup')
+    assert [song['file_path'] for song in playlist.iter_songs()] == \
+        ['/music/A.mp3', '/music/Dup.mp3', '/music/B.mp3', '/music/third.mp3']
+    assert playlist.remove_song('dup')
+    assert playlist.find_node_by_title('Dup').song_data['file_path'] == '/music/third.mp3'
+    assert playlist.remove_song('Dup')
+    assert playlist.find_node_by_title('Dup') is None
+
+def test_path_lookup_and_contains_node_follow_removals():
+    playlist, _ = make_playlist('A', 'B')
+    node = playlist.find_node_by_path('/music/B.mp3')
+    assert node.song_data['title'] == 'B'
+    assert playlist.contains_node(node)
+    playlist.remove_song('B')
+    assert not playlist.contains_node(node)
+    assert playlist.find_node_by_path('/music/B.mp3') is None
+    assert playlist.find_node_by_path('/music/nowhere.mp3') is None
+
+def test_search_returns_the_first_match_and_follows_edits():
+    playlist, _ = make_playlist('Night River', 'Crazy Train', 'Train Song')
+    assert playlist.search_song('train').song_data['title'] == 'Crazy Train'
+    playlist.remove_song('Crazy Train')
+    assert playlist.search_song('TRAIN').song_data['title'] == 'Train Song'
+    playlist.add_song_at_beginning(song('Last Train', artist='Other'))
+    assert playlist.search_song('train').song_data['title'] == 'Last Train'
+    assert playlist.search_song('other').song_data['title'] == 'Last Train'
+    assert playlist.search_song('zzz') is None
+    assert LinkedListPlaylist(observers=[]).search_song('train') is None
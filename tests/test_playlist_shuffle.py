@@ -0,0 +1,77 @@
+"""In-place Fisher-Yates shuffle of LinkedListPlaylist."""
+
+from collections import Counter
+from itertools import permutations
+
+from src.linked_list_playlist import LinkedListPlaylist
+
+# Chi-square critical value at p = 0.001 for 5 degrees of freedom (the six orders of three songs)
+CHI_SQUARE_CRITICAL = 20.515
+
+def make_playlist(count):
+    songs = [{'title': f'Song {number}', 'artist': 'Band', 'file_path': f'/music/{number}.mp3'}
+             for number in range(count)]
+    return LinkedListPlaylist.from_iterable(songs, observers=[])
+
+def titles(playlist):
+    return tuple(song['title'] for song in playlist.iter_songs())
+
+def assert_links_consistent(playlist):
+    previous = None
+    node = playlist.head
+    for position in range(playlist.size):
+        assert node.previous is previous
+        assert playlist.get_position(node) == position
+        previous, node = node, node.next
+    assert node is None
+    assert playlist.tail is previous
+
+def test_shuffle_relinks_the_same_nodes():
+    playlist = make_playlist(50)
+    nodes_before = set()
+    node = playlist.head
+    while node:
+        nodes_before.add(node)
+        node = node.next
+    current = playlist.current_node
+
+    playlist.shuffle_playlist(seed=3)
+    assert sorted(titles(playlist)) == sorted(f'Song {number}' for number in range(50))
+    assert titles(playlist) != tuple(f'Song {number}' for number in range(50))
+    assert playlist.current_node is current
+    assert_links_consistent(playlist)
+    node = playlist.head
+    while node:
+        assert node in nodes_before
+        node = node.next
+
+    # Lookups and search still point at linked nodes
+    assert playlist.contains_node(playlist.find_node_by_title('Song 7'))
+    assert playlist.search_song('song 4') is not None
+
+def test_seeded_shuffles_are_reproducible():
+    first, second = make_playlist(20), make_playlist(20)
+    first.shuffle_playlist(seed=11)
+    second.shuffle_playlist(seed=11)
+    assert titles(first) == titles(second)
+
+def test_tiny_playlists_are_left_alone():
+    events = []
+    playlist = LinkedListPlaylist.from_iterable([{'title': 'Only', 'artist': 'Band', 'file_path': '/music/only.mp3'}],
+                                                observers=[lambda event, message: events.append(event)])
+    playlist.shuffle_playlist()
+    LinkedListPlaylist(observers=[]).shuffle_playlist()
+    assert titles(playlist) == ('Only',)
+    assert events == []
+
+def test_every_order_is_equally_likely():
+    trials = 12_000
+    counts = Counter()
+    for seed in range(trials):
+        playlist = make_playlist(3)
+        playlist.shuffle_playlist(seed=seed)
+        counts[titles(playlist)] += 1
+    orders = list(permutations(('Song 0', 'Song 1', 'Song 2')))
+    assert set(counts) == set(orders)
+    expected = trials / len(orders)
+    assert sum((counts[order] - expected) ** 2 / expected for order in orders) < CHI_SQUARE_CRITICAL
@@ -0,0 +1,72 @@
+"""Playlist files: JSON and binary round trips, and rejection of malformed files."""
+
+import json
+
+import pytest
+
+from src.linked_list_playlist import PlaylistManager
+from src.playlist_store import (list_playlist_files, playlist_filename, playlist_name_from_filename,
+                                read_playlist_file, write_playlist_file)
+
+PATHS = ['/music/Band - One.mp3', '/music/Ünïcode - Twö.flac', '/music/Band - Three.ogg']
+
+@pytest.mark.parametrize('playlist_format', ['json', 'binary'])
+def test_round_trip(tmp_path, playlist_format):
+    path = str(tmp_path / playlist_filename('Road Trip', playlist_format))
+    write_playlist_file(path, 'Road Trip', 'Songs for the car', PATHS)
+    assert read_playlist_file(path) == ('Road Trip', 'Songs for the car', PATHS)
+
+@pytest.mark.parametrize('playlist_format', ['json', 'binary'])
+def test_empty_playlist_round_trip(tmp_path, playlist_format):
+    path = str(tmp_path / playlist_filename('Empty', playlist_format))
+    write_playlist_file(path, 'Empty', '', [])
+    assert read_playlist_file(path) == ('Empty', '', [])
+
+def test_unsafe_names_survive_the_file_name():
+    name = 'AC/DC: "Best" 100%?'
+    filename = playlist_filename(name, 'binary')
+    assert '/' not in filename and ':' not in filename
+    assert playlist_name_from_filename(filename) == name
+
+def test_binary_file_wins_when_both_formats_exist(tmp_path):
+    write_playlist_file(str(tmp_path / 'Mix.json'), 'Mix', '', PATHS)
+    write_playlist_file(str(tmp_path / 'Mix.plb'), 'Mix', '', PATHS[:1])
+    (tmp_path / 'notes.txt').write_text('not a playlist')
+    assert list_playlist_files(str(tmp_path)) == {'Mix': str(tmp_path / 'Mix.plb')}
+
+def test_corrupt_binary_file_is_rejected(tmp_path):
+    path = str(tmp_path / 'Broken.plb')
+    write_playlist_file(path, 'Broken', '', PATHS)
+    with open(path, 'rb') as playlist_file:
+        data = playlist_file.read()
+    with open(path, 'wb') as playlist_file:
+        playlist_file.write(data[:-len(PATHS[-1]) - 1])
+    with pytest.raises(ValueError):
+        read_playlist_file(path)
+
+@pytest.mark.parametrize('document', [[1, 2], {'songs': 'one.mp3'}, {'name': 5, 'songs': []}])
+def test_json_that_is_not_a_playlist_is_rejected(tmp_path, document):
+    path = tmp_path / 'Odd.json'
+    path.write_text(json.dumps(document))
+    with pytest.raises(ValueError):
+        read_playlist_file(str(path))
+
+@pytest.mark.parametrize('entry', [42, None, ['a.mp3'], {'title': 'x', 'artist': 'y', 'file_path': 7},
+                                   {'title': None, 'artist': 'y'}, {'file_path': '/music/a.mp3'}])
+def test_malformed_entry_fails_the_load_instead_of_crashing(tmp_path, capsys, entry):
+    path = tmp_path / 'Hand Edited.json'
+    path.write_text(json.dumps({'name': 'Hand Edited', 'songs': ['/music/Band - One.mp3', entry]}))
+    manager = PlaylistManager(str(tmp_path))
+    assert manager.load_playlist('Hand Edited') is False
+    assert 'Error loading playlist' in capsys.readouterr().out
+    assert manager.playlists['Hand Edited'] is None
+
+def test_saved_playlist_loads_paths_and_song_dictionaries(tmp_path):
+    path = tmp_path / 'Mixed.json'
+    manual = {'title': 'Live Take', 'artist': 'Band'}
+    path.write_text(json.dumps({'name': 'Mixed', 'description': 'd', 'songs': [PATHS[0], manual]}))
+    manager = PlaylistManager(str(tmp_path))
+    assert manager.load_playlist('Mixed') is True
+    songs = list(manager.playlists['Mixed'].iter_songs())
+    assert [(song['title'], song['artist']) for song in songs] == [('One', 'Band'), ('Live Take', 'Band')]
+    assert songs[1]['file_path'] is None
@@ -0,0 +1,55 @@
+"""Tests that a prefetch cache miss never reads on the caller's thread."""
+
+import threading
+
+from src.prefetch_cache import CachedTrack, PrefetchCache
+
+class GatedCache(PrefetchCache):
+    """Prefetch cache whose background reads wait until the test releases them."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.reader_threads = []
+
+    def _read_into_cache(self, file_path):
+        self.reader_threads.append(threading.current_thread())
+        assert self.release.wait(5)
+        return super()._read_into_cache(file_path)
+
+def test_miss_returns_the_path_and_fills_the_cache_in_the_background(tmp_path):
+    track = tmp_path / "song.mp3"
+    track.write_bytes(b"x" * 1000)
+    cache = GatedCache(max_bytes=10_000)
+    try:
+        # Returns while the read is still held back, so it cannot have read the file itself
+        assert cache.open(str(track)) == str(track)
+        assert cache.get_statistics()['misses'] == 1
+        assert cache.get_statistics()['pending_reads'] == 1
+
+        # Opening again while the read is in flight is another miss, not a second read
+        assert cache.open(str(track)) == str(track)
+        assert cache.get_statistics()['misses'] == 2
+
+        cache.release.set()
+        cache._executor.shutdown(wait=True)
+        assert all(thread is not threading.current_thread() for thread in cache.reader_threads)
+        assert len(cache.reader_threads) == 1
+
+        cached = cache.open(str(track))
+        assert isinstance(cached, CachedTrack)
+        assert cached.read() == b"x" * 1000
+        assert cache.get_statistics()['hits'] == 1
+    finally:
+        cache.release.set()
+        cache.close()
+
+def test_unreadable_file_is_handed_to_the_backend(tmp_path):
+    missing = str(tmp_path / "gone.mp3")
+    cache = PrefetchCache()
+    try:
+        assert cache.open(missing) == missing
+        cache._executor.shutdown(wait=True)
+        assert not cache.contains(missing)
+    finally:
+        cache.close()
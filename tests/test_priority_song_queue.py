@@ -0,0 +1,88 @@
+"""PrioritySongQueue heap order, votes and removal."""
+
+import random
+
+from src.stacks_queues_music import PrioritySongQueue
+
+def song(title, path=None):
+    return {'title': title, 'artist': 'Band', 'file_path': path or f'/music/{title}.mp3'}
+
+def drain(queue):
+    titles = []
+    while queue.get_size():
+        titles.append(queue.dequeue()['title'])
+    return titles
+
+def assert_heap_valid(queue):
+    for position, entry in enumerate(queue.heap):
+        assert entry[3] == position
+        if position:
+            parent = queue.heap[(position - 1) // 2]
+            assert (parent[0], parent[1]) < (entry[0], entry[1])
+
+def test_highest_priority_first_and_fifo_within_a_priority():
+    queue = PrioritySongQueue()
+    for title, priority in (('Low', 0), ('High', 5), ('Also Low', 0), ('Mid', 2), ('Also High', 5)):
+        queue.enqueue(song(title), priority)
+    assert queue.peek()['title'] == 'High'
+    assert [entry['title'] for entry in queue.peek_many(3)] == ['High', 'Also High', 'Mid']
+    assert queue.get_size() == 5
+    assert drain(queue) == ['High', 'Also High', 'Mid', 'Low', 'Also Low']
+    assert queue.dequeue() is None
+    assert queue.peek() is None
+
+def test_votes_move_songs_by_title_or_path():
+    queue = PrioritySongQueue()
+    for title in ('A', 'B', 'C'):
+        queue.enqueue(song(title))
+    assert queue.upvote('c')
+    assert queue.upvote('/music/B.mp3')
+    assert queue.upvote('C')
+    assert queue.downvote('a')
+    assert not queue.upvote('Missing')
+    assert_heap_valid(queue)
+    assert drain(queue) == ['C', 'B', 'A']
+
+def test_duplicate_titles_vote_for_the_highest_priority_copy():
+    queue = PrioritySongQueue()
+    queue.enqueue(song('Dup', '/music/one.mp3'), 1)
+    queue.enqueue(song('Dup', '/music/two.mp3'), 3)
+    queue.enqueue(song('Other'), 3)
+    assert queue.upvote('dup')
+    assert [entry['file_path'] for entry in queue.peek_many(3)] == \
+        ['/music/two.mp3', '/music/Other.mp3', '/music/one.mp3']
+
+def test_remove_and_clear_forget_the_song():
+    queue = PrioritySongQueue()
+    for title in ('A', 'B', 'C', 'D'):
+        queue.enqueue(song(title))
+    assert queue.remove('b')
+    assert not queue.remove('B')
+    assert not queue.upvote('/music/B.mp3')
+    assert_heap_valid(queue)
+    assert drain(queue) == ['A', 'C', 'D']
+    queue.enqueue(song('E'))
+    queue.clear_queue()
+    assert queue.get_size() == 0
+    assert not queue.upvote('E')
+
+def test_matches_a_sorted_reference_under_random_operations():
+    rng = random.Random(12)
+    queue = PrioritySongQueue()
+    reference = {}
+    for number in range(300):
+        title = f'Song {number}'
+        priority = rng.randint(-3, 3)
+        queue.enqueue(song(title), priority)
+        reference[title] = [priority, number]
+        if rng.random() < 0.5:
+            target = rng.choice(list(reference))
+            delta = rng.choice((1, -1))
+            assert (queue.upvote if delta > 0 else queue.downvote)(target)
+            reference[target][0] += delta
+        if rng.random() < 0.2:
+            title = queue.dequeue()['title']
+            assert title == min(reference, key=lambda key: (-reference[key][0], reference[key][1]))
+            del reference[title]
+        assert_heap_valid(queue)
+    assert drain(queue) == sorted(reference, key=lambda key: (-reference[key][0], reference[key][1]))
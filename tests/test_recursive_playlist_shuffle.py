@@ -0,0 +1,50 @@
+"""Uniformity (chi-square) and behaviour tests for the playlist shuffle."""
+
+import random
+from collections import Counter
+from itertools import permutations
+
+from src.recursive_playlist_shuffle import merge_with_random_order, recursive_shuffle_playlist, shuffle_in_place
+
+# Chi-square critical values at p = 0.001, by degrees of freedom; a uniform shuffle exceeds them 0.1% of the time
+CHI_SQUARE_CRITICAL = {5: 20.515, 23: 49.728}
+
+def chi_square(counts: Counter, outcomes, trials: int) -> float:
+    """Pearson's chi-square statistic of observed counts against equally likely outcomes."""
+    expected = trials / len(outcomes)
+    return sum((counts[outcome] - expected) ** 2 / expected for outcome in outcomes)
+
+def test_every_order_is_equally_likely():
+    rng = random.Random(2024)
+    songs = ['A', 'B', 'C', 'D']
+    trials = 48_000
+    counts = Counter(tuple(recursive_shuffle_playlist(songs, rng=rng)) for _ in range(trials))
+    orders = list(permutations(songs))
+    assert set(counts) == set(orders)
+    assert chi_square(counts, orders, trials) < CHI_SQUARE_CRITICAL[len(orders) - 1]
+
+def test_every_interleaving_is_equally_likely():
+    rng = random.Random(7)
+    trials = 30_000
+    counts = Counter(tuple(merge_with_random_order(['a1', 'a2'], ['b1', 'b2'], rng=rng)) for _ in range(trials))
+    # Six ways to interleave two pairs while keeping each pair's order
+    interleavings = [order for order in permutations(['a1', 'a2', 'b1', 'b2'])
+                     if order.index('a1') < order.index('a2') and order.index('b1') < order.index('b2')]
+    assert set(counts) == set(interleavings)
+    assert chi_square(counts, interleavings, trials) < CHI_SQUARE_CRITICAL[len(interleavings) - 1]
+
+def test_returns_a_new_list_and_leaves_the_input_alone():
+    songs = [{'title': str(number)} for number in range(50)]
+    original = list(songs)
+    shuffled = recursive_shuffle_playlist(songs, rng=random.Random(1))
+    assert songs == original
+    assert shuffled is not songs
+    assert sorted(shuffled, key=lambda song: int(song['title'])) == original
+
+def test_shuffle_in_place_reorders_the_same_list():
+    songs = list(range(100))
+    assert shuffle_in_place(songs, random.Random(3)) is songs
+    assert sorted(songs) == list(range(100)) and songs != list(range(100))
+
+def test_accepts_any_iterable():
+    assert sorted(recursive_shuffle_playlist(iter(range(10)))) == list(range(10))
@@ -0,0 +1,98 @@
+"""Pagination, buffered report output and the paged library reports."""
+
+import io
+
+import pytest
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.report_writer import ReportWriter, page_offset, paginate
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+def test_paginate_is_lazy():
+    consumed = []
+
+    def rows():
+        for number in range(100):
+            consumed.append(number)
+            yield number
+
+    assert list(paginate(rows(), 10, 3)) == [10, 11, 12]
+    assert consumed == list(range(13))
+    assert list(paginate(range(5), 3)) == [3, 4]
+    assert list(paginate(range(5), 9, 2)) == []
+    assert list(paginate(range(5), 0, 0)) == []
+
+@pytest.mark.parametrize('offset, limit', [(-1, None), (0, -1)])
+def test_paginate_rejects_negative_bounds(offset, limit):
+    with pytest.raises(ValueError):
+        paginate(range(5), offset, limit)
+
+def test_page_offset():
+    assert page_offset(1, 50) == 0
+    assert page_offset(3, 50) == 100
+    with pytest.raises(ValueError):
+        page_offset(0, 50)
+    with pytest.raises(ValueError):
+        page_offset(1, 0)
+
+def test_writer_buffers_lines_until_full_or_closed():
+    stream = CountingStream()
+    with ReportWriter(stream, buffer_size=20) as writer:
+        writer.write_line("123456789")
+        assert stream.getvalue() == ""
+        writer.write_lines(["abcdefghi", "last"])
+        assert stream.getvalue() == "123456789\nabcdefghi\n"
+    assert stream.getvalue() == "123456789\nabcdefghi\nlast\n"
+    assert stream.writes == 2
+    assert writer.lines_written == 3
+
+def make_manager(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    for name in ("Alpha - One.mp3", "Alpha - Two.flac", "Alpha - Three.mp3", "Beta - Four.mp3", "Beta - Five.wav"):
+        (music / name).write_bytes(b'\0' * 128)
+    return MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+
+def song_lines(text):
+    return [line for line in text.splitlines() if line.startswith("  •")]
+
+def report(display, offset=0, limit=None):
+    stream = io.StringIO()
+    rows = display(offset=offset, limit=limit, stream=stream)
+    return rows, stream.getvalue()
+
+def test_report_pages_add_up_to_the_full_report(tmp_path):
+    manager = make_manager(tmp_path)
+    for display in (manager.display_artist_report, manager.display_file_type_report):
+        rows, full = report(display)
+        assert rows == 5
+        pages = [report(display, offset, 2) for offset in (0, 2, 4)]
+        assert [rows for rows, _ in pages] == [2, 2, 1]
+        assert sum((song_lines(text) for _, text in pages), []) == song_lines(full)
+
+def test_artist_report_rows_and_continued_headings(tmp_path):
+    manager = make_manager(tmp_path)
+    _, full = report(manager.display_artist_report)
+    assert song_lines(full) == ["  • One (.mp3)", "  • Three (.mp3)", "  • Two (.flac)",
+                                "  • Five (.wav)", "  • Four (.mp3)"]
+    _, page = report(manager.display_artist_report, 1, 3)
+    assert "ALPHA (3 songs, continued):" in page
+    assert "BETA (2 songs):" in page
+    assert "ARTIST REPORT" not in page
+
+def test_library_display_numbers_rows_from_the_offset(tmp_path):
+    manager = make_manager(tmp_path)
+    stream = io.StringIO()
+    assert manager.display_song_library(offset=3, limit=10, stream=stream) == 2
+    rows = [line.split()[0] for line in stream.getvalue().splitlines() if line[:1].isdigit()]
+    assert rows == ['4', '5']
@@ -0,0 +1,53 @@
+"""Substring index searches and the manager's Search Songs ordering."""
+
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.search_index import SubstringIndex
+
+def make_index(*entries):
+    index = SubstringIndex()
+    for key, title, artist in entries:
+        index.add(key, title, artist)
+    return index
+
+def test_matches_title_or_artist_case_insensitively_in_insertion_order():
+    index = make_index((3, "Crazy Train", "Ozzy Osbourne"), (1, "Paranoid", "Black Sabbath"),
+                       (2, "Train Kept A-Rollin'", "Aerosmith"))
+    assert index.search("TRAIN") == [3, 2]
+    assert index.search("sabb") == [1]
+    assert index.search("zzzzqx") == []
+    assert index.candidates("o") == {3, 1, 2}
+
+def test_short_queries_and_queries_spanning_fields():
+    index = make_index(('a', "Go", "Ab"), ('b', "Going", "Cd"))
+    # Below the n-gram size the index scans its entries
+    assert index.search("go") == ['a', 'b']
+    assert index.search("") == ['a', 'b']
+    # N-grams never span title and artist, so neither does a match
+    assert index.search("goab") == []
+
+def test_add_replaces_and_remove_forgets():
+    index = make_index(('a', "Old Title", "Band"))
+    index.add('a', "New Title", "Band")
+    assert len(index) == 1
+    assert index.search("old") == []
+    assert index.search("new") == ['a']
+    assert index.remove('a') is True
+    assert index.remove('a') is False
+    assert 'a' not in index
+    assert index.search("title") == []
+    assert index._postings == {}
+
+def test_manager_results_are_sorted_by_path_after_watcher_updates(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    for name in ("Band - One Night.mp3", "Band - Two.mp3"):
+        (music / name).write_bytes(b'\0' * 128)
+    manager = MusicPlaylistManager(str(music), read_tags=False, scan_workers=1)
+    assert [song['title'] for song in manager.search_songs("one")] == ['One Night']
+
+    added = music / "Aardvark - One More.mp3"
+    added.write_bytes(b'\0' * 128)
+    assert manager.apply_path_changes([str(added)]) == (1, 0)
+    # The watcher appends the new song to the library, but results stay in path order
+    assert manager.song_library[-1]['title'] == 'One More'
+    assert [song['title'] for song in manager.search_songs("one")] == ['One More', 'One Night']
@@ -0,0 +1,52 @@
+"""SongQueue FIFO order, batch operations and bounded capacity policies."""
+
+import pytest
+
+from src.stacks_queues_music import SongQueue
+
+def songs(count):
+    return [{'title': f'Song {number}', 'artist': 'Band'} for number in range(count)]
+
+def titles(items):
+    return [song['title'] for song in items]
+
+def test_fifo_order_and_empty_queue():
+    queue = SongQueue()
+    assert queue.dequeue() is None
+    assert queue.peek() is None
+    for song in songs(3):
+        assert queue.enqueue(song)
+    assert queue.peek()['title'] == 'Song 0'
+    assert titles(queue.peek_many(5)) == ['Song 0', 'Song 1', 'Song 2']
+    assert queue.dequeue()['title'] == 'Song 0'
+    assert queue.get_size() == 2
+    queue.clear_queue()
+    assert queue.get_size() == 0
+
+def test_batch_operations():
+    queue = SongQueue()
+    assert queue.enqueue_many(iter(songs(5))) == 5
+    assert titles(queue.dequeue_many(2)) == ['Song 0', 'Song 1']
+    assert titles(queue.dequeue_many(10)) == ['Song 2', 'Song 3', 'Song 4']
+    assert queue.dequeue_many(1) == []
+    assert queue.enqueue_many([]) == 0
+
+def test_bounded_queue_rejects_when_full():
+    queue = SongQueue(capacity=3)
+    assert queue.enqueue_many(songs(2)) == 2
+    # A batch only fills the free slots
+    assert queue.enqueue_many(songs(5)[2:]) == 1
+    assert not queue.enqueue({'title': 'Extra', 'artist': 'Band'})
+    assert queue.enqueue_many(songs(1)) == 0
+    assert titles(queue.peek_many(3)) == ['Song 0', 'Song 1', 'Song 2']
+
+def test_bounded_queue_can_drop_the_oldest_song():
+    queue = SongQueue(capacity=3, overflow_policy='drop_oldest')
+    assert queue.enqueue_many(songs(4)) == 4
+    assert queue.enqueue({'title': 'Newest', 'artist': 'Band'})
+    assert titles(queue.dequeue_many(3)) == ['Song 2', 'Song 3', 'Newest']
+
+@pytest.mark.parametrize('kwargs', [{'capacity': 0}, {'overflow_policy': 'block'}])
+def test_invalid_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        SongQueue(**kwargs)
@@ -0,0 +1,39 @@
+"""SongRecord compatibility with the six-key song dictionaries it replaced."""
+
+from src.song_record import SongRecord
+
+def six_key_song():
+    return {'filename': 'Band - Song', 'title': 'Song', 'artist': 'Band', 'file_type': '.mp3',
+            'file_path': '/music/Band - Song.mp3', 'file_size': 1234}
+
+def test_untagged_record_round_trips_to_the_original_dictionary():
+    record = SongRecord('Song', 'Band', '.mp3', '/music/Band - Song.mp3', 1234)
+    assert record.to_dict() == six_key_song()
+    assert record == six_key_song()
+
+def test_tagged_record_equals_a_dictionary_with_the_same_tags():
+    record = SongRecord('Song', 'Band', '.mp3', '/music/Band - Song.mp3', 1234,
+                        album='Album', track_number=3, duration=201.5, bitrate=320)
+    tagged = dict(six_key_song(), album='Album', track_number=3, duration=201.5, bitrate=320)
+    assert record.to_dict() == tagged
+    assert record == tagged
+    # Tags missing from the dictionary count as unknown, so they must be unknown on the record too
+    assert record != six_key_song()
+    assert record != dict(six_key_song(), album='Album')
+    assert record != dict(tagged, album='Other')
+
+def test_differing_or_unknown_keys_are_not_equal():
+    record = SongRecord('Song', 'Band', '.mp3', '/music/Band - Song.mp3', 1234)
+    assert record != dict(six_key_song(), file_size=1)
+    assert record != dict(six_key_song(), rating=5)
+    assert record == dict(six_key_song(), album=None)
+
+def test_empty_or_partial_dictionaries_are_not_equal():
+    record = SongRecord('Song', 'Band', '.mp3', '/music/Band - Song.mp3', 1234)
+    other = SongRecord('Other', 'Band', '.mp3', '/music/Band - Other.mp3', 99)
+    assert record != {}
+    assert record != {'artist': 'Band'}
+    assert record != {key: value for key, value in six_key_song().items() if key != 'filename'}
+    # A list of dictionary songs only finds the entry that really is this song
+    songs = [{'artist': 'Band'}, other.to_dict(), six_key_song()]
+    assert songs.index(record) == 2
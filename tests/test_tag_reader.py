@@ -0,0 +1,98 @@
+"""Tag reading for each supported format, damaged files, and the caching metadata pipeline."""
+
+import os
+
+import pytest
+
+from metadata_benchmark import AUDIO_BYTES, GENERATORS
+from src.Lists_and_Tuples import MusicPlaylistManager
+from src.metadata_pipeline import MetadataPipeline
+from src.tag_reader import read_tags
+
+TAGS = {'title': "Crazy Train", 'artist': "Ozzy Osbourne", 'album': "Blizzard of Ozz", 'track_number': 2}
+
+def write_file(directory, name, data):
+    path = directory / name
+    path.write_bytes(data)
+    return str(path)
+
+@pytest.mark.parametrize('extension', sorted(GENERATORS))
+def test_every_format_reads_text_tags_duration_and_bitrate(tmp_path, extension):
+    tags = read_tags(write_file(tmp_path, f"song{extension}", GENERATORS[extension](TAGS)))
+    assert {field: tags.get(field) for field in TAGS} == TAGS
+    assert tags['duration'] > 0
+    assert tags['bitrate'] > 0
+
+def test_durations_and_bitrates_come_from_the_stream_headers(tmp_path):
+    flac = read_tags(write_file(tmp_path, "song.flac", GENERATORS['.flac'](TAGS)))
+    assert flac['duration'] == 180.0
+    ogg = read_tags(write_file(tmp_path, "song.ogg", GENERATORS['.ogg'](TAGS)))
+    assert ogg['duration'] == 180.0
+    assert ogg['bitrate'] == 160
+    m4a = read_tags(write_file(tmp_path, "song.m4a", GENERATORS['.m4a'](TAGS)))
+    assert m4a['duration'] == 180.0
+    wav = read_tags(write_file(tmp_path, "song.wav", GENERATORS['.wav'](TAGS)))
+    assert wav['bitrate'] == 1411
+    assert wav['duration'] == AUDIO_BYTES / 176400
+    mp3 = read_tags(write_file(tmp_path, "song.mp3", GENERATORS['.mp3'](TAGS)))
+    assert mp3['bitrate'] == 128
+
+@pytest.mark.parametrize('extension', sorted(GENERATORS))
+def test_truncated_files_never_raise(tmp_path, extension):
+    data = GENERATORS[extension](TAGS)
+    for length in (0, 3, 11, 40, 200):
+        tags = read_tags(write_file(tmp_path, f"cut{length}{extension}", data[:length]))
+        assert set(tags) <= {'title', 'artist', 'album', 'track_number', 'duration', 'bitrate'}
+
+def test_unknown_and_missing_files_have_no_tags(tmp_path):
+    # No 0xff byte, so there is no MPEG frame sync to find
+    assert read_tags(write_file(tmp_path, "noise.mp3", bytes(range(1, 255)) * 16)) == {}
+    assert read_tags(write_file(tmp_path, "notes.txt", b"just text")) == {}
+    assert read_tags(str(tmp_path / "gone.flac")) == {}
+
+def make_files(directory, count):
+    extensions = sorted(GENERATORS)
+    files = []
+    for number in range(count):
+        extension = extensions[number % len(extensions)]
+        path = write_file(directory, f"file{number}{extension}",
+                          GENERATORS[extension](dict(TAGS, title=f"Song {number}")))
+        files.append((path, os.stat(path)))
+    return files
+
+def test_pipeline_returns_tags_in_input_order_and_caches_by_size_and_mtime(tmp_path):
+    files = make_files(tmp_path, 5)
+    pipeline = MetadataPipeline(max_workers=1)
+    assert [tags['title'] for tags in pipeline.read(files)] == [f"Song {number}" for number in range(5)]
+    assert (pipeline.files_read, pipeline.cache_hits) == (5, 0)
+
+    assert [tags['title'] for tags in pipeline.read(reversed(files))] == \
+        [f"Song {number}" for number in range(4, -1, -1)]
+    assert (pipeline.files_read, pipeline.cache_hits) == (5, 5)
+
+    # A rewritten file (new size) and a forgotten one are read again
+    path, _ = files[0]
+    with open(path, 'wb') as audio_file:
+        audio_file.write(GENERATORS[os.path.splitext(path)[1]](dict(TAGS, title="Rewritten")))
+    pipeline.forget(files[1][0])
+    changed = [(path, os.stat(path)), files[1], files[2]]
+    assert [tags['title'] for tags in pipeline.read(changed)] == ["Rewritten", "Song 1", "Song 2"]
+    assert (pipeline.files_read, pipeline.cache_hits) == (7, 6)
+    assert pipeline.get_files_per_second() > 0
+
+def test_process_pool_gives_the_same_tags(tmp_path):
+    files = make_files(tmp_path, 8)
+    expected = MetadataPipeline(max_workers=1).read(files)
+    pipeline = MetadataPipeline(max_workers=2, min_parallel_files=1, chunk_size=3)
+    assert pipeline.read(files) == expected
+
+def test_library_prefers_tags_and_falls_back_to_the_file_name(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    write_file(music, "Wrong Artist - Wrong Title.flac", GENERATORS['.flac'](TAGS))
+    write_file(music, "Band - Untagged.mp3", b'\0' * 128)
+    manager = MusicPlaylistManager(str(music), scan_workers=1, metadata_workers=1)
+    untagged, tagged = manager.song_library
+    assert (tagged['title'], tagged['artist'], tagged['album'], tagged['track_number'], tagged['duration']) == \
+        ("Crazy Train", "Ozzy Osbourne", "Blizzard of Ozz", 2, 180.0)
+    assert (untagged['title'], untagged['artist'], untagged['album']) == ("Untagged", "Band", None)